@@ -0,0 +1,215 @@
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from .balloon import Balloon, BalloonPosition
+
+HOURS = 24
+
+# float32 holds ~7 significant digits, so anything past 5 decimals of a
+# coordinate is float32 noise (~1 m) and only bloats the JSON output.
+COORD_DECIMALS = 5
+
+_snapshot_versions = itertools.count(1)
+
+
+def parse_position(data) -> Optional[tuple[float, float, Optional[float]]]:
+    """Parse a single raw Windborne [lat, lng, alt] entry. Returns None if invalid."""
+    if data is None or not isinstance(data, list) or len(data) < 2:
+        return None
+
+    try:
+        lat = float(data[0]) if data[0] is not None else None
+        lng = float(data[1]) if data[1] is not None else None
+        altitude = float(data[2]) if len(data) > 2 and data[2] is not None else None
+
+        if lat is None or lng is None:
+            return None
+
+        # Validate coordinates
+        if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
+            return None
+
+        return lat, lng, altitude
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_hour(hour_data: list, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse one hour of raw Windborne data into float32 lat/lng/alt columns and a
+    validity mask, padded to `n` balloons. Missing altitudes are NaN.
+    """
+    lat = np.full(n, np.nan, dtype=np.float32)
+    lng = np.full(n, np.nan, dtype=np.float32)
+    alt = np.full(n, np.nan, dtype=np.float32)
+    valid = np.zeros(n, dtype=bool)
+    count = len(hour_data)
+
+    # Fast path: a clean rectangular list of numbers converts in one call
+    try:
+        raw = np.asarray(hour_data, dtype=np.float64)
+    except (ValueError, TypeError):
+        raw = None
+
+    if raw is not None and raw.ndim == 2 and raw.shape[1] >= 2:
+        lat[:count] = raw[:, 0]
+        lng[:count] = raw[:, 1]
+        if raw.shape[1] > 2:
+            alt[:count] = raw[:, 2]
+        # NaN compares False, so it is rejected like any out-of-range value
+        valid[:count] = (
+            (raw[:, 0] >= -90) & (raw[:, 0] <= 90) &
+            (raw[:, 1] >= -180) & (raw[:, 1] <= 180)
+        )
+    else:
+        # Corrupted or ragged data: fall back to per-entry parsing
+        for idx, entry in enumerate(hour_data):
+            parsed = parse_position(entry)
+            if parsed:
+                lat[idx], lng[idx] = parsed[0], parsed[1]
+                if parsed[2] is not None:
+                    alt[idx] = parsed[2]
+                valid[idx] = True
+
+    return lat, lng, alt, valid
+
+
+def _to_floats(values: np.ndarray) -> list[float]:
+    return np.round(values.astype(np.float64), COORD_DECIMALS).tolist()
+
+
+@dataclass(frozen=True)
+class BalloonSnapshot:
+    """
+    Immutable columnar view of the constellation's 24h history.
+
+    Arrays are shaped (24, n_balloons), indexed by [hours_ago, balloon_id].
+    Built once per refresh and shared (read-only) by every request.
+    """
+    lat: np.ndarray
+    lng: np.ndarray
+    alt: np.ndarray
+    valid: np.ndarray
+    total_count: int  # Number of balloons reported for the current hour
+    version: int
+    fetched_at: float
+
+    @classmethod
+    def from_hourly_data(cls, hourly_data: list[list]) -> "BalloonSnapshot":
+        """Build a snapshot from raw per-hour Windborne lists (hour 0 = current)."""
+        hourly_data = list(hourly_data)[:HOURS]
+        hourly_data += [[] for _ in range(HOURS - len(hourly_data))]
+        n = max(len(hour) for hour in hourly_data)
+
+        columns = [parse_hour(hour, n) for hour in hourly_data]
+        lat, lng, alt, valid = (np.stack(col) for col in zip(*columns))
+
+        for array in (lat, lng, alt, valid):
+            array.setflags(write=False)
+
+        return cls(
+            lat=lat,
+            lng=lng,
+            alt=alt,
+            valid=valid,
+            total_count=len(hourly_data[0]),
+            version=next(_snapshot_versions),
+            fetched_at=time.time(),
+        )
+
+    def matches_current(self, hour_data: list) -> bool:
+        """Check whether raw hour data is identical to this snapshot's current hour."""
+        if len(hour_data) != self.total_count:
+            return False
+
+        lat, lng, alt, valid = parse_hour(hour_data, self.n_balloons)
+        return (
+            np.array_equal(valid, self.valid[0]) and
+            np.array_equal(lat, self.lat[0], equal_nan=True) and
+            np.array_equal(lng, self.lng[0], equal_nan=True) and
+            np.array_equal(alt, self.alt[0], equal_nan=True)
+        )
+
+    def rolled(self, newest_hour: list) -> "BalloonSnapshot":
+        """
+        Build the next snapshot after the window moved by one hour: `newest_hour`
+        becomes hour 0 and every existing hour shifts back by one (hour 23 drops off).
+        """
+        n = max(self.n_balloons, len(newest_hour))
+        pad = n - self.n_balloons
+        newest = parse_hour(newest_hour, n)
+
+        arrays = []
+        columns = (self.lat, self.lng, self.alt, self.valid)
+        fills = (np.nan, np.nan, np.nan, False)
+        for new_row, old, fill in zip(newest, columns, fills):
+            shifted = np.pad(old[:HOURS - 1], ((0, 0), (0, pad)), constant_values=fill)
+            array = np.concatenate([new_row[np.newaxis], shifted])
+            array.setflags(write=False)
+            arrays.append(array)
+
+        lat, lng, alt, valid = arrays
+        return BalloonSnapshot(
+            lat=lat,
+            lng=lng,
+            alt=alt,
+            valid=valid,
+            total_count=len(newest_hour),
+            version=next(_snapshot_versions),
+            fetched_at=time.time(),
+        )
+
+    def __repr__(self) -> str:
+        # Compact and unique per snapshot, so cache_with_ttl can key on it
+        return f"BalloonSnapshot(version={self.version}, total_count={self.total_count})"
+
+    @property
+    def n_balloons(self) -> int:
+        return self.lat.shape[1]
+
+    def current_indices(self) -> np.ndarray:
+        """Ids of balloons with a valid current (hour 0) position."""
+        return np.flatnonzero(self.valid[0])
+
+    def positions(self, balloon_id: int) -> list[BalloonPosition]:
+        """All valid positions of one balloon, most recent first."""
+        hours = np.flatnonzero(self.valid[:, balloon_id])
+        return self._build_positions(
+            self.lat[hours, balloon_id],
+            self.lng[hours, balloon_id],
+            self.alt[hours, balloon_id],
+            hours.tolist(),
+        )
+
+    def balloon(self, balloon_id: int, color: str) -> Optional[Balloon]:
+        """Build a Balloon with its full history, or None if it has no valid position."""
+        positions = self.positions(balloon_id)
+        if not positions:
+            return None
+        return Balloon(id=balloon_id, color=color, positions=positions, current=positions[0])
+
+    def current_positions(self) -> list[BalloonPosition]:
+        """Current positions of every balloon with a valid hour-0 fix."""
+        indices = self.current_indices()
+        return self._build_positions(
+            self.lat[0, indices],
+            self.lng[0, indices],
+            self.alt[0, indices],
+            [0] * len(indices),
+        )
+
+    def _build_positions(
+        self,
+        lat: np.ndarray,
+        lng: np.ndarray,
+        alt: np.ndarray,
+        hours_ago: list[int],
+    ) -> list[BalloonPosition]:
+        # Values come straight from validated arrays, so skip pydantic validation
+        altitudes = [None if a != a else a for a in _to_floats(alt)]  # NaN -> None
+        return [
+            BalloonPosition.model_construct(lat=la, lng=ln, altitude=al, hours_ago=h)
+            for la, ln, al, h in zip(_to_floats(lat), _to_floats(lng), altitudes, hours_ago)
+        ]
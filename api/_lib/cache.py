@@ -1,17 +1,39 @@
 from cachetools import TTLCache
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 import asyncio
+import inspect
 from functools import wraps
 
 # Global caches with different TTLs
 _caches: dict[str, TTLCache] = {
     "balloons": TTLCache(maxsize=100, ttl=300),      # 5 minutes
+    "selection": TTLCache(maxsize=4, ttl=300),       # 5 minutes (per-snapshot FPS order)
+    "selected": TTLCache(maxsize=200, ttl=300),      # 5 minutes (per-snapshot responses)
     "fires": TTLCache(maxsize=10, ttl=900),          # 15 minutes
     "storms": TTLCache(maxsize=10, ttl=600),         # 10 minutes
     "weather": TTLCache(maxsize=500, ttl=600),       # 10 minutes
     "wind": TTLCache(maxsize=10, ttl=900),           # 15 minutes
+    "forecasts": TTLCache(maxsize=20, ttl=300),      # 5 minutes (per-snapshot fleet forecasts)
 }
 
+# Stale-while-revalidate grace (seconds past the TTL). Within it, an expired entry
+# is still served immediately while a background task refreshes it.
+# Empty here: each serverless invocation runs its own event loop (asyncio.run),
+# which cancels a background refresh as soon as the response is returned.
+_stale_grace: dict[str, int] = {}
+
+# Expired-but-servable entries for caches with a grace period (ttl + grace)
+_stale_caches: dict[str, TTLCache] = {}
+
+# Fetches currently running, keyed by (cache name, call key), so concurrent
+# callers on a cache miss share one upstream request instead of each starting one
+_in_flight: dict[tuple[str, str], asyncio.Future] = {}
+
+# Per-cache counters: hits, misses (calls that ran the function), coalesced
+# (calls that awaited another caller's in-flight fetch) and stale (calls served
+# an expired entry while it was refreshed in the background)
+_stats: dict[str, dict[str, int]] = {}
+
 
 def get_cache(cache_name: str) -> TTLCache:
     """Get a specific cache by name."""
@@ -20,31 +42,117 @@ def get_cache(cache_name: str) -> TTLCache:
     return _caches[cache_name]
 
 
+def _get_stale_cache(cache_name: str) -> Optional[TTLCache]:
+    """Get the stale-entry store for a cache, or None if it has no grace period."""
+    grace = _stale_grace.get(cache_name)
+    if not grace:
+        return None
+    if cache_name not in _stale_caches:
+        cache = get_cache(cache_name)
+        _stale_caches[cache_name] = TTLCache(maxsize=cache.maxsize, ttl=cache.ttl + grace)
+    return _stale_caches[cache_name]
+
+
 def clear_cache(cache_name: Optional[str] = None) -> None:
-    """Clear a specific cache or all caches."""
+    """Clear a specific cache or all caches (including stale entries)."""
     if cache_name:
-        if cache_name in _caches:
-            _caches[cache_name].clear()
+        for caches in (_caches, _stale_caches):
+            if cache_name in caches:
+                caches[cache_name].clear()
     else:
-        for cache in _caches.values():
+        for cache in (*_caches.values(), *_stale_caches.values()):
             cache.clear()
 
 
+def get_cache_stats(cache_name: Optional[str] = None) -> dict:
+    """Get hit/miss/coalesced/stale counters for one cache, or for all caches."""
+    if cache_name:
+        return dict(_get_stats(cache_name))
+    return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def _get_stats(cache_name: str) -> dict[str, int]:
+    if cache_name not in _stats:
+        _stats[cache_name] = {"hits": 0, "misses": 0, "coalesced": 0, "stale": 0}
+    return _stats[cache_name]
+
+
+def _start_fetch(cache_name: str, key: str, func, args, kwargs) -> asyncio.Future:
+    """Start (or join) the single in-flight fetch for a cache key."""
+    flight_key = (cache_name, key)
+    if flight_key in _in_flight:
+        return _in_flight[flight_key]
+    
+    task = asyncio.ensure_future(func(*args, **kwargs))
+    _in_flight[flight_key] = task
+    
+    def on_done(done: asyncio.Future) -> None:
+        # Runs even if every awaiting caller was cancelled, so the fetch
+        # still lands in the cache
+        _in_flight.pop(flight_key, None)
+        if done.cancelled() or done.exception() is not None:
+            return
+        get_cache(cache_name)[key] = done.result()
+        stale_cache = _get_stale_cache(cache_name)
+        if stale_cache is not None:
+            stale_cache[key] = done.result()
+    
+    task.add_done_callback(on_done)
+    return task
+
+
 def cache_with_ttl(cache_name: str):
-    """Decorator to cache async function results."""
+    """
+    Decorator to cache async function results.
+    
+    Misses are single-flight: while one call is fetching a key, concurrent calls
+    for the same key await that fetch instead of starting their own.
+    
+    Caches with a stale grace period serve an expired entry immediately and
+    refresh it in the background. The decorated function also gets a
+    `refresh(*args, **kwargs)` coroutine that re-fetches unconditionally.
+    """
     def decorator(func):
+        def make_key(args, kwargs) -> str:
+            # Create a cache key from function name and arguments
+            return f"{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
             cache = get_cache(cache_name)
-            # Create a cache key from function name and arguments
-            key = f"{func.__name__}:{str(args)}:{str(sorted(kwargs.items()))}"
+            stats = _get_stats(cache_name)
+            key = make_key(args, kwargs)
             
             if key in cache:
+                stats["hits"] += 1
                 return cache[key]
             
-            result = await func(*args, **kwargs)
-            cache[key] = result
-            return result
+            flight_key = (cache_name, key)
+            stale_cache = _get_stale_cache(cache_name)
+            if stale_cache is not None and key in stale_cache:
+                stats["stale"] += 1
+                _start_fetch(cache_name, key, func, args, kwargs)
+                return stale_cache[key]
+            
+            if flight_key in _in_flight:
+                stats["coalesced"] += 1
+            else:
+                stats["misses"] += 1
+            task = _start_fetch(cache_name, key, func, args, kwargs)
+            # Shielded so one caller disconnecting does not cancel the shared fetch
+            return await asyncio.shield(task)
+        
+        async def refresh(*args, **kwargs):
+            task = _start_fetch(cache_name, make_key(args, kwargs), func, args, kwargs)
+            return await asyncio.shield(task)
+        
+        wrapper.refresh = refresh
         return wrapper
     return decorator
 
+
+async def refresh_cached(method: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """Force a refresh of the entry behind a @cache_with_ttl function or bound method."""
+    if inspect.ismethod(method):
+        return await method.__func__.refresh(method.__self__, *args, **kwargs)
+    return await method.refresh(*args, **kwargs)
@@ -0,0 +1,84 @@
+import httpx
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class _CachedResponse:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    payload: Any
+
+
+class ConditionalFetcher:
+    """
+    GET requests with HTTP revalidation (ETag / If-Modified-Since).
+
+    The parsed payload of every 200 response that carries a validator is kept
+    alongside it. The next request for the same URL is sent conditionally, and a
+    304 hands back the stored payload without downloading or parsing the body.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self._entries: dict[str, _CachedResponse] = {}
+        self.stats = {"requests": 0, "not_modified": 0, "bytes_received": 0}
+
+    async def get(
+        self,
+        url: str,
+        parse: Callable[[httpx.Response], Any],  # May be sync or async
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        stream: bool = False,
+    ) -> tuple[Any, bool]:
+        """
+        Fetch and parse a URL, revalidating against the previous response.
+
+        With `stream=True` the body is not read up front: `parse` receives the
+        open response and consumes it (e.g. with `response.aiter_bytes()`), so
+        large bodies never have to sit in memory whole.
+
+        Returns (payload, modified). `modified` is False when the server answered
+        304 and the stored payload was reused.
+        """
+        request = self.client.build_request("GET", url, params=params, headers=headers)
+        key = str(request.url)
+        entry = self._entries.get(key)
+
+        if entry:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            response = await self.client.send(request, stream=stream)
+        except Exception:
+            # Never revalidate against a payload we could not confirm
+            self._entries.pop(key, None)
+            raise
+
+        try:
+            self.stats["requests"] += 1
+
+            if response.status_code == 304 and entry:
+                self.stats["not_modified"] += 1
+                return entry.payload, False
+
+            self._entries.pop(key, None)
+            payload = parse(response)
+            if inspect.isawaitable(payload):
+                payload = await payload
+        finally:
+            if stream:
+                await response.aclose()
+            self.stats["bytes_received"] += response.num_bytes_downloaded if stream else len(response.content)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            self._entries[key] = _CachedResponse(etag, last_modified, payload)
+
+        return payload, True
@@ -9,6 +9,7 @@ class Fire(BaseModel):
     confidence: str
     acq_date: str
     acq_time: str
+    frp: float = 0.0  # Fire radiative power (MW)
 
 
 class FireData(BaseModel):
@@ -16,3 +17,61 @@ class FireData(BaseModel):
     count: int
     regions: dict[str, int]  # region name -> fire count
 
+
+class FireColumns(BaseModel):
+    """FireData as parallel arrays (GET /api/fires?format=columnar)."""
+    count: int
+    regions: dict[str, int]
+    lat: list[float]
+    lng: list[float]
+    brightness: list[float]
+    confidence: list[str]
+    acq_date: list[str]
+    acq_time: list[str]
+    frp: list[float]
+
+
+
+class FireZone(BaseModel):
+    """A cluster of adjacent fire detections."""
+    id: int  # Rank by total FRP (0 = most intense)
+    lat: float  # Centroid
+    lng: float
+    # Bounding box; east may exceed 180 for zones that cross the antimeridian
+    south: float
+    west: float
+    north: float
+    east: float
+    count: int
+    total_frp: float
+
+
+class FireCell(BaseModel):
+    lat: float  # Cell center
+    lng: float
+    count: int
+    total_frp: float
+
+
+class FireAggregate(BaseModel):
+    resolution: float  # Cell size in degrees
+    cells: list[FireCell]
+
+
+class FireSourceStats(BaseModel):
+    source: str  # FIRMS product, e.g. VIIRS_SNPP_NRT
+    seconds: float  # Download + parse time of the last refresh
+    bytes: int  # CSV bytes parsed (0 when revalidated)
+    lines: int  # Data rows in the CSV
+    kept: int  # Rows passing the significance filters
+    modified: bool  # False when the server answered 304 and the previous rows were reused
+    error: Optional[str] = None
+
+
+class FireSources(BaseModel):
+    sources: list[FireSourceStats]
+    count: int  # Fires after merging
+    duplicates: int  # Detections dropped as duplicates across passes/sensors
+    added: int = 0  # Detections that became live in the rolling store this refresh
+    expired: int = 0  # Detections that aged out of the store's window (or became repeats)
+    merge_seconds: float
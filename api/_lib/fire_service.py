@@ -1,16 +1,45 @@
+import asyncio
 import httpx
 import os
-from typing import Optional
-from .fire import Fire, FireData
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import numpy as np
+from .fire import FireData, FireZone, FireAggregate, FireSourceStats, FireSources
 from .cache import cache_with_ttl
+from .conditional import ConditionalFetcher
+from .geo import GridIndex
+from .fire_encoding import FIRE_FORMATS, encode_fires
+from .fire_store import FIRE_WINDOW_HOURS, RollingFireStore
+from .fire_zones import FIRE_AGGREGATE_RESOLUTIONS, aggregate_fires, cluster_fires, fire_columns
+from .firms_parser import FirmsCsvParser, deduplicate
 
 NASA_FIRMS_BASE_URL = "https://firms.modaps.eosdis.nasa.gov/api/area/csv"
 
 
+# FIRMS products merged into FireData, in dedupe priority order (375 m VIIRS before 1 km MODIS)
+DEFAULT_FIRMS_SOURCES = "VIIRS_SNPP_NRT,VIIRS_NOAA20_NRT,VIIRS_NOAA21_NRT,MODIS_NRT"
+
+# Filters for significant fires
+MIN_FRP = 5.0  # MW (filters very small fires but keeps more than before)
+MIN_NUMERIC_CONFIDENCE = 50  # MODIS reports confidence as 0-100
+
+# Serverless functions have no /dev/shm for process pools, so CSV blocks are
+# parsed in threads: the event loop keeps streaming the other downloads meanwhile
+_parse_pool = ThreadPoolExecutor(max_workers=4)
+
+
 class FireService:
     def __init__(self):
         self.client = httpx.AsyncClient(timeout=60.0)  # Longer timeout for large data
+        self.fetcher = ConditionalFetcher(self.client)
         self.api_key = os.getenv("NASA_FIRMS_API_KEY", "")
+        self.sources = [s.strip() for s in os.getenv("FIRMS_SOURCES", DEFAULT_FIRMS_SOURCES).split(",") if s.strip()]
+        self.source_stats: Optional[FireSources] = None
+        # Lives as long as the warm function instance; a cold start loads the full window
+        self.store = RollingFireStore(float(os.getenv("FIRE_WINDOW_HOURS", str(FIRE_WINDOW_HOURS))))
+        self._merged: Optional[tuple[list[np.ndarray], int]] = None
+        self._derived: dict[str, tuple[FireData, Any]] = {}
 
     async def close(self):
         await self.client.aclose()
@@ -25,241 +54,208 @@ class FireService:
         - count: Total number of fires returned
         - regions: Dictionary mapping region coordinates to fire count
         
+        Every product in FIRMS_SOURCES (VIIRS on Suomi NPP, NOAA-20 and NOAA-21,
+        plus MODIS) is downloaded concurrently, parsed as it streams in and
+        merged, dropping repeat detections of the same fire (see
+        firms_parser.deduplicate). A product that fails is logged and skipped.
+        
+        The merged rows feed a rolling store (see RollingFireStore): only new
+        detections are added, detections older than FIRE_WINDOW_HOURS expire,
+        and the index, zones and aggregates are updated for just those rows.
+        
         Filters:
-        - Only high/nominal confidence fires
-        - FRP (Fire Radiative Power) > 5 MW (filters very small fires)
+        - Only high/nominal confidence fires (or numeric confidence >= 50)
+        - FRP (Fire Radiative Power) >= 5 MW (filters very small fires)
         
         Note: Requires NASA_FIRMS_API_KEY environment variable.
         """
-        fires = []
-        regions: dict[str, int] = {}
-        errors: list[str] = []
-        
         # Check for API key
         if not self.api_key:
-            errors.append("NASA_FIRMS_API_KEY environment variable not set")
-            print(f"Fire service error: {errors[0]}")
+            print("Fire service error: NASA_FIRMS_API_KEY environment variable not set")
             return FireData(fires=[], count=0, regions={})
         
         try:
-            # Get fires from VIIRS satellite (global coverage, last 1 day)
-            # VIIRS_SNPP_NRT = Near Real-Time data from Suomi NPP satellite
-            url = f"{NASA_FIRMS_BASE_URL}/{self.api_key}/VIIRS_SNPP_NRT/world/1"
-            
-            response = await self.client.get(url)
-            
-            if response.status_code == 401:
-                errors.append("Invalid NASA FIRMS API key")
-                print(f"Fire service error: {errors[0]}")
-                return FireData(fires=[], count=0, regions={})
-            
-            if response.status_code == 429:
-                errors.append("NASA FIRMS API rate limit exceeded")
-                print(f"Fire service error: {errors[0]}")
-                return FireData(fires=[], count=0, regions={})
-            
-            if response.status_code != 200:
-                errors.append(f"NASA FIRMS API returned status {response.status_code}: {response.text[:200]}")
-                print(f"Fire service error: {errors[0]}")
-                return FireData(fires=[], count=0, regions={})
-            
-            # Check for error messages in response body
-            response_text = response.text.strip()
-            if response_text.startswith("Error") or response_text.startswith("Invalid"):
-                errors.append(f"NASA FIRMS API error: {response_text[:200]}")
-                print(f"Fire service error: {errors[0]}")
-                return FireData(fires=[], count=0, regions={})
-            
-            lines = response_text.split("\n")
-            
-            if len(lines) <= 1:
-                # No fires found - this is valid, not an error
-                return FireData(fires=[], count=0, regions={})
-            
-            # Parse header to get column indices (more robust than hardcoded indices)
-            header = lines[0].lower().split(",")
-            col_indices = self._get_column_indices(header)
-            
-            if not col_indices:
-                errors.append("Could not parse FIRMS CSV header")
-                print(f"Fire service error: {errors[0]}")
-                return FireData(fires=[], count=0, regions={})
-            
-            # Parse data rows
-            parse_errors = 0
-            for line in lines[1:]:
-                if not line.strip():
-                    continue
-                    
-                fire = self._parse_fire_line(line, col_indices)
-                if fire:
-                    fires.append(fire)
-                    # Group by approximate region (10 degree grid for broader regions)
-                    region_key = f"{int(fire.lat / 10) * 10},{int(fire.lng / 10) * 10}"
-                    regions[region_key] = regions.get(region_key, 0) + 1
-                else:
-                    parse_errors += 1
-            
-            if parse_errors > 0:
-                print(f"Fire service: {parse_errors} lines failed to parse or were filtered out")
-                    
+            results = await asyncio.gather(*(self._fetch_source(source) for source in self.sources))
+            return self._merge(results)
+        except Exception as e:
+            print(f"Fire service error: Unexpected error: {str(e)}")
+            return FireData(fires=[], count=0, regions={})
+
+    async def get_source_stats(self) -> Optional[FireSources]:
+        """Per-source timings and counts of the last refresh."""
+        await self.get_active_fires()
+        return self.source_stats
+
+    async def _fetch_source(self, source: str) -> tuple[Optional[np.ndarray], FireSourceStats]:
+        """Download and parse one FIRMS product (global coverage, last 1 day)."""
+        url = f"{NASA_FIRMS_BASE_URL}/{self.api_key}/{source}/world/1"
+        start = time.perf_counter()
+        rows, lines, size, modified, error = None, 0, 0, True, None
+        
+        try:
+            # Revalidated with ETag / If-Modified-Since: a 304 reuses the parsed rows
+            (rows, lines, size), modified = await self.fetcher.get(url, self._parse_fires_response, stream=True)
         except httpx.TimeoutException:
-            errors.append("NASA FIRMS API request timed out")
-            print(f"Fire service error: {errors[0]}")
+            error = "NASA FIRMS API request timed out"
         except httpx.RequestError as e:
-            errors.append(f"NASA FIRMS API request failed: {str(e)}")
-            print(f"Fire service error: {errors[0]}")
+            error = f"NASA FIRMS API request failed: {str(e)}"
         except Exception as e:
-            errors.append(f"Unexpected error: {str(e)}")
-            print(f"Fire service error: {errors[0]}")
+            error = str(e)
+        if error:
+            print(f"Fire service error ({source}): {error}")
         
-        return FireData(fires=fires, count=len(fires), regions=regions)
+        return rows, FireSourceStats(
+            source=source,
+            seconds=round(time.perf_counter() - start, 3),
+            bytes=size if modified else 0,
+            lines=lines,
+            kept=0 if rows is None else len(rows),
+            modified=modified,
+            error=error,
+        )
 
-    def _get_column_indices(self, header: list[str]) -> Optional[dict[str, int]]:
+    async def _parse_fires_response(self, response: httpx.Response) -> tuple[np.ndarray, int, int]:
         """
-        Get column indices from CSV header.
+        Parse a streamed FIRMS CSV response chunk by chunk. Returns (rows, lines, bytes).
         
-        Expected columns: latitude, longitude, bright_ti4, acq_date, acq_time, confidence, frp
-        
-        Returns dict mapping column name to index, or None if required columns missing.
+        Error statuses and error bodies raise, so the source is reported as failed.
         """
-        required = ["latitude", "longitude"]
-        optional = {
-            "bright_ti4": "brightness",
-            "brightness": "brightness",
-            "acq_date": "acq_date",
-            "acq_time": "acq_time",
-            "confidence": "confidence",
-            "frp": "frp",
-        }
-        
-        indices = {}
+        if response.status_code == 401:
+            raise RuntimeError("Invalid NASA FIRMS API key")
+        if response.status_code == 429:
+            raise RuntimeError("NASA FIRMS API rate limit exceeded")
+        if response.status_code != 200:
+            body = (await response.aread()).decode("utf-8", errors="replace")
+            raise RuntimeError(f"NASA FIRMS API returned status {response.status_code}: {body[:200]}")
         
-        # Find required columns
-        for col in required:
-            if col in header:
-                indices[col] = header.index(col)
-            else:
-                return None
+        parser = FirmsCsvParser(min_frp=MIN_FRP, min_numeric_confidence=MIN_NUMERIC_CONFIDENCE, executor=_parse_pool)
+        async for chunk in response.aiter_bytes():
+            parser.feed(chunk)
+        rows = await parser.rows()
         
-        # Find optional columns
-        for csv_col, key in optional.items():
-            if csv_col in header and key not in indices:
-                indices[key] = header.index(csv_col)
+        # Error messages come back as a 200 with a plain-text body instead of a CSV header
+        if parser.header is not None and parser.columns is None:
+            header = parser.header.strip()
+            if header.startswith("Error") or header.startswith("Invalid"):
+                raise RuntimeError(f"NASA FIRMS API error: {header[:200]}")
+            raise RuntimeError("Could not parse FIRMS CSV header")
         
-        return indices
+        return rows, parser.lines_read, parser.bytes_read
 
-    def _parse_fire_line(self, line: str, col_indices: dict[str, int]) -> Optional[Fire]:
-        """
-        Parse a single line of FIRMS CSV data.
+    def _merge(self, results: list[tuple[Optional[np.ndarray], FireSourceStats]]) -> FireData:
+        """Deduplicate the sources' rows and merge them into the rolling store."""
+        start = time.perf_counter()
+        rows_by_source = [rows for rows, _ in results if rows is not None]
         
-        Filters for significant fires:
-        - High or nominal confidence
-        - FRP > 5 MW (filters very small fires but keeps more than before)
+        previous = self._merged
+        if previous and len(previous[0]) == len(rows_by_source) and all(
+            a is b for a, b in zip(previous[0], rows_by_source)
+        ):
+            # No source changed: only expire
+            duplicates = previous[1]
+            added, expired = self.store.update()
+        else:
+            rows, duplicates = deduplicate(rows_by_source)
+            added, expired = self.store.update(rows)
+            self._merged = (rows_by_source, duplicates)
+        fire_data = self.store.fire_data()
         
-        Returns Fire object or None if filtered out or parse error.
+        self.source_stats = FireSources(
+            sources=[stats for _, stats in results],
+            count=fire_data.count,
+            duplicates=duplicates,
+            added=added,
+            expired=expired,
+            merge_seconds=round(time.perf_counter() - start, 3),
+        )
+        return fire_data
+
+    def _derive(self, name: str, fire_data: FireData, build: Callable[[], Any]) -> Any:
         """
-        try:
-            parts = line.split(",")
-            
-            # Get required fields
-            lat = float(parts[col_indices["latitude"]])
-            lng = float(parts[col_indices["longitude"]])
-            
-            # Validate coordinates
-            if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
-                return None
-            
-            # Get optional fields with defaults
-            brightness = 0.0
-            if "brightness" in col_indices and col_indices["brightness"] < len(parts):
-                try:
-                    brightness = float(parts[col_indices["brightness"]])
-                except ValueError:
-                    pass
-            
-            acq_date = ""
-            if "acq_date" in col_indices and col_indices["acq_date"] < len(parts):
-                acq_date = parts[col_indices["acq_date"]]
-            
-            acq_time = ""
-            if "acq_time" in col_indices and col_indices["acq_time"] < len(parts):
-                acq_time = parts[col_indices["acq_time"]]
-            
-            confidence = "unknown"
-            if "confidence" in col_indices and col_indices["confidence"] < len(parts):
-                confidence = parts[col_indices["confidence"]]
-            
-            frp = 0.0
-            if "frp" in col_indices and col_indices["frp"] < len(parts):
-                try:
-                    frp_str = parts[col_indices["frp"]]
-                    if frp_str:
-                        frp = float(frp_str)
-                except ValueError:
-                    pass
-            
-            # Filter for significant fires
-            # Accept high, nominal, or numeric confidence >= 50
-            confidence_lower = confidence.lower().strip()
-            is_confident = confidence_lower in ('high', 'h', 'nominal', 'n')
-            
-            # Also accept numeric confidence
-            if not is_confident:
-                try:
-                    conf_num = float(confidence)
-                    is_confident = conf_num >= 50
-                except ValueError:
-                    pass
-            
-            if not is_confident:
-                return None
-            
-            # FRP filter - lowered from 10 to 5 to show more fires
-            if frp < 5:
-                return None
-            
-            return Fire(
-                lat=lat,
-                lng=lng,
-                brightness=brightness,
-                confidence=confidence,
-                acq_date=acq_date,
-                acq_time=acq_time,
-            )
-        except (ValueError, IndexError, KeyError) as e:
-            return None
+        Memoize an artifact derived from fire_data: encodings, and the index,
+        zones and aggregates of a FireData that is not the store's (the store
+        keeps its own up to date).
+        """
+        entry = self._derived.get(name)
+        if entry is None or entry[0] is not fire_data:
+            entry = (fire_data, build())
+            self._derived[name] = entry
+        return entry[1]
+
+    def _fire_columns(self, fire_data: FireData) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._derive("columns", fire_data, lambda: fire_columns(fire_data))
 
-    def is_balloon_over_fire(self, balloon_lat: float, balloon_lng: float, fires: list[Fire], radius_km: float = 50) -> bool:
+    def get_fire_index(self, fire_data: FireData) -> GridIndex:
+        """Spatial index over fire_data's fires, built once per FireData."""
+        if fire_data is self.store.fire_data():
+            return self.store.index
+        def build() -> GridIndex:
+            lat, lng, _ = self._fire_columns(fire_data)
+            return GridIndex(lat, lng)
+        return self._derive("index", fire_data, build)
+
+    def get_fire_zones(self, fire_data: FireData) -> list[FireZone]:
+        """Fire zones (clusters of adjacent detections), built once per FireData."""
+        if fire_data is self.store.fire_data():
+            return self.store.zones()
+        return self._derive("zones", fire_data, lambda: cluster_fires(*self._fire_columns(fire_data)))
+
+    def get_fire_aggregate(self, fire_data: FireData, resolution: float) -> FireAggregate:
+        """
+        Per-cell fire counts at one of FIRE_AGGREGATE_RESOLUTIONS; every
+        resolution is built together, once per FireData.
+        """
+        if fire_data is self.store.fire_data():
+            return self.store.aggregate(resolution)
+        def build() -> dict[float, FireAggregate]:
+            columns = self._fire_columns(fire_data)
+            return {r: aggregate_fires(*columns, r) for r in FIRE_AGGREGATE_RESOLUTIONS}
+        return self._derive("aggregates", fire_data, build)[resolution]
+
+    def nearest_fires(
+        self, lats: np.ndarray, lngs: np.ndarray, fire_data: FireData, radius_km: float = 50
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        For each point, the position in fire_data.fires of the closest fire
+        within radius_km (great-circle; -1 for none) and its distance in km.
+        """
+        index = self.get_fire_index(fire_data)
+        nearest = [index.nearest(lat, lng, radius_km) for lat, lng in zip(lats.tolist(), lngs.tolist())]
+        ids = np.array([i for i, _ in nearest], dtype=np.int64)
+        distances = np.array([d for _, d in nearest])
+        if index is self.store.index:
+            # The store's index is keyed by slot
+            found = ids >= 0
+            ids[found] = self.store.positions(ids[found])
+        return ids, distances
+
+    def get_encoded_fires(self, fire_data: FireData, fmt: str) -> bytes:
+        """fire_data encoded in one of FIRE_FORMATS (see encode_fires), once per FireData."""
+        return self._derive(f"encoded:{fmt}", fire_data, lambda: encode_fires(fire_data, fmt))
+
+    async def warm_fire_layers(self) -> None:
+        """Build the index, zones, aggregates and encodings for the current fires ahead of requests."""
+        fire_data = await self.get_active_fires()
+        self.get_fire_index(fire_data)
+        self.get_fire_zones(fire_data)
+        self.get_fire_aggregate(fire_data, FIRE_AGGREGATE_RESOLUTIONS[0])
+        for fmt in FIRE_FORMATS:
+            self.get_encoded_fires(fire_data, fmt)
+
+    def is_balloon_over_fire(self, balloon_lat: float, balloon_lng: float, fire_data: FireData, radius_km: float = 50) -> bool:
         """
         Check if a balloon is within radius_km of any fire.
         
         Args:
             balloon_lat: Balloon latitude
             balloon_lng: Balloon longitude
-            fires: List of fires to check against
+            fire_data: Fires to check against (queried through their spatial index)
             radius_km: Radius in km for proximity check
             
         Returns:
             True if balloon is near a fire, False otherwise
         """
-        import math
-        
-        for fire in fires:
-            # Simple distance calculation (approximate for small distances)
-            lat_diff = abs(balloon_lat - fire.lat)
-            lng_diff = abs(balloon_lng - fire.lng)
-            
-            # Rough km conversion (1 degree ≈ 111 km at equator)
-            dist_km = math.sqrt(
-                (lat_diff * 111) ** 2 + 
-                (lng_diff * 111 * math.cos(math.radians(balloon_lat))) ** 2
-            )
-            
-            if dist_km <= radius_km:
-                return True
-        
-        return False
+        return self.get_fire_index(fire_data).any_within(balloon_lat, balloon_lng, radius_km)
 
 
 # Singleton instance
@@ -0,0 +1,240 @@
+import time
+from typing import Optional
+import numpy as np
+from .fire import Fire, FireAggregate, FireData, FireZone
+from .geo import GridIndex
+from .fire_zones import FIRE_ZONE_CELL_DEGREES, AggregateGrids, grid_cells, neighbor_cells, summarize_zones, zone_labels
+from .firms_parser import (
+    ROW_DTYPE, acquisition_minutes, dedupe_cells, deduplicate_indices, fire_data_from_rows, fire_regions,
+)
+
+# Detections expire this long after their acquisition time
+FIRE_WINDOW_HOURS = 24.0
+
+# Positions are keyed at this precision (degrees); FIRMS reports 4-5 decimals
+KEY_DEGREES = 1e-5
+
+
+def detection_keys(rows: np.ndarray, minutes: np.ndarray) -> np.ndarray:
+    """
+    One sortable value per (acq_date, acq_time, lat, lng): acquisition minutes
+    as the real part, the packed position as the imaginary part (exact in a
+    float64 below 2**53). Rows without a valid acquisition time share minute -1.
+    """
+    lat_key = np.round((rows["lat"] + 90) / KEY_DEGREES)
+    lng_key = np.round((rows["lng"] + 180) / KEY_DEGREES)
+    position = lat_key * (round(360 / KEY_DEGREES) + 1) + lng_key
+    return np.where(np.isnan(minutes), -1.0, minutes) + 1j * position
+
+
+class RollingFireStore:
+    """
+    Significant fire detections of the last `window_hours`, keyed by
+    (acq_date, acq_time, lat, lng), with their spatial index, zones and
+    aggregate grids kept up to date as detections arrive and expire.
+
+    Every detection of the window is stored, but only those that deduplicate
+    keeps are live (shown in the views). Each refresh ingests only the rows
+    whose key is new and expires the rows that have left the window, then
+    re-runs deduplicate over the stored rows of just the dedupe cells those
+    touched, so a repeat detection hidden behind an expired one comes back:
+    the live rows always match deduplicate over the whole window. The index
+    and aggregate grids are updated with just the rows that became live or
+    stopped being live, and only the zones touching them are re-clustered.
+    Rows live in slots that only grow until expired slots outnumber stored
+    ones, when the arrays are compacted.
+    """
+
+    def __init__(self, window_hours: float = FIRE_WINDOW_HOURS):
+        self.window_minutes = window_hours * 60
+        self.version = 0
+        self.index = GridIndex(np.empty(0), np.empty(0))
+        self.aggregates = AggregateGrids()
+        self._rows = np.empty(0, dtype=ROW_DTYPE)
+        self._fires: list[Fire] = []
+        # Stored (in the window) and live (kept by deduplicate) slots
+        self._alive = np.zeros(0, dtype=bool)
+        self._live = np.zeros(0, dtype=bool)
+        self._keys = np.empty(0, dtype=np.complex128)
+        self._expires = np.empty(0)
+        self._dedupe_cell = np.empty(0, dtype=np.int64)
+        self._zone_cell = np.empty(0, dtype=np.int64)
+        self._zone = np.empty(0, dtype=np.int64)
+        self._next_zone = 0
+        self._regions: dict[str, int] = {}
+        # Sorted keys of the stored rows
+        self._stored_keys = np.empty(0, dtype=np.complex128)
+        self._views: dict[str, object] = {}
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._live))
+
+    def update(self, rows: Optional[np.ndarray] = None, now: Optional[float] = None) -> tuple[int, int]:
+        """
+        Merge newly downloaded rows (may repeat stored ones) and expire old
+        rows, at `now` in minutes since the epoch. Returns the number of
+        detections that became live and that stopped being live.
+        """
+        now = time.time() / 60 if now is None else now
+        new = self._ingest(rows, now) if rows is not None and len(rows) else np.empty(0, dtype=np.int64)
+        expired = self._expire(now)
+        if not len(new) and not len(expired):
+            return 0, 0
+
+        was_live = self._live[expired]
+        self._alive[expired] = False
+        self._live[expired] = False
+        shown, hidden = self._deduplicate(np.concatenate([new, expired]))
+        added = np.concatenate([shown, new[~np.isin(new, hidden)]])
+        removed = np.concatenate([expired[was_live], hidden[~np.isin(hidden, new)]])
+        self._hide(np.concatenate([expired[was_live], hidden]))
+        self._show(shown)
+
+        if len(added) or len(removed):
+            self._recluster(added, removed)
+            self.version += 1
+            self._views = {}
+        if len(self._alive) - len(self._stored_keys) > len(self._stored_keys):
+            self._compact()
+        return len(added), len(removed)
+
+    def _ingest(self, rows: np.ndarray, now: float) -> np.ndarray:
+        """Store the rows not seen before (live until deduplicated). Returns their slots."""
+        minutes = acquisition_minutes(rows)
+        keys = detection_keys(rows, minutes)
+        position = np.minimum(np.searchsorted(self._stored_keys, keys), max(len(self._stored_keys) - 1, 0))
+        known = self._stored_keys[position] == keys if len(self._stored_keys) else np.zeros(len(rows), dtype=bool)
+        expires = np.where(np.isnan(minutes), now, minutes) + self.window_minutes
+        fresh = np.flatnonzero(~known & (expires > now))
+        if not len(fresh):
+            return np.empty(0, dtype=np.int64)
+        _, first = np.unique(keys[fresh], return_index=True)
+        fresh = fresh[np.sort(first)]
+
+        new = rows[fresh]
+        slots = np.arange(len(self._rows), len(self._rows) + len(new))
+        self._rows = np.concatenate([self._rows, new])
+        self._fires.extend(fire_data_from_rows(new).fires)
+        self._alive = np.concatenate([self._alive, np.ones(len(new), dtype=bool)])
+        self._live = np.concatenate([self._live, np.ones(len(new), dtype=bool)])
+        self._keys = np.concatenate([self._keys, keys[fresh]])
+        self._expires = np.concatenate([self._expires, expires[fresh]])
+        self._dedupe_cell = np.concatenate([self._dedupe_cell, dedupe_cells(new)])
+        self._zone_cell = np.concatenate([self._zone_cell, grid_cells(new["lat"], new["lng"], FIRE_ZONE_CELL_DEGREES)[0]])
+        self._zone = np.concatenate([self._zone, np.full(len(new), -1)])
+
+        sorted_keys = np.sort(keys[fresh])
+        self._stored_keys = np.insert(self._stored_keys, np.searchsorted(self._stored_keys, sorted_keys), sorted_keys)
+        self.index.add(new["lat"], new["lng"])
+        self.aggregates.add(new["lat"], new["lng"], new["frp"])
+        self._count_regions(new, 1)
+        return slots
+
+    def _expire(self, now: float) -> np.ndarray:
+        """Slots of the stored rows that have left the window (still flagged alive)."""
+        expired = np.flatnonzero(self._alive & (self._expires <= now))
+        if len(expired):
+            self._stored_keys = np.delete(self._stored_keys, np.searchsorted(self._stored_keys, self._keys[expired]))
+        return expired
+
+    def _deduplicate(self, changed: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Re-run deduplicate over the stored rows in the dedupe cells of the
+        `changed` slots (groups never span cells, so no other row's fate can
+        change). Returns the slots it keeps that are not live, and the live
+        slots it drops.
+        """
+        stored = np.flatnonzero(self._alive & np.isin(self._dedupe_cell, self._dedupe_cell[changed]))
+        keep = np.zeros(len(stored), dtype=bool)
+        # Slots are in arrival order, so ties go to the row downloaded first, as in a full rebuild
+        keep[deduplicate_indices([self._rows[stored]])] = True
+        live = self._live[stored]
+        return stored[keep & ~live], stored[~keep & live]
+
+    def _show(self, slots: np.ndarray) -> None:
+        rows = self._rows[slots]
+        self._live[slots] = True
+        self.index.insert(slots)
+        self.aggregates.add(rows["lat"], rows["lng"], rows["frp"])
+        self._count_regions(rows, 1)
+
+    def _hide(self, slots: np.ndarray) -> None:
+        rows = self._rows[slots]
+        self._live[slots] = False
+        self.index.remove(slots)
+        self.aggregates.add(rows["lat"], rows["lng"], rows["frp"], sign=-1)
+        self._count_regions(rows, -1)
+
+    def _count_regions(self, rows: np.ndarray, sign: int) -> None:
+        for region, count in fire_regions(rows["lat"], rows["lng"]).items():
+            total = self._regions.get(region, 0) + sign * count
+            if total:
+                self._regions[region] = total
+            else:
+                del self._regions[region]
+
+    def _recluster(self, added: np.ndarray, removed: np.ndarray) -> None:
+        """
+        Relabel only the zones that can have changed: those with a live row
+        in or next to a cell where rows became live or stopped being live (a
+        zone elsewhere cannot merge with the new rows or lose any of its own),
+        plus the new live rows themselves.
+        """
+        touched = self._zone_cell[np.concatenate([added, removed])]
+        n_cols = int(round(360 / FIRE_ZONE_CELL_DEGREES))
+        near = self._live & np.isin(self._zone_cell, neighbor_cells(np.unique(touched), n_cols))
+        affected = np.unique(np.concatenate([self._zone[near], self._zone[removed]]))
+        self._zone[removed] = -1
+
+        redo = self._live & (np.isin(self._zone, affected[affected >= 0]) | (self._zone < 0))
+        labels = zone_labels(self._rows["lat"][redo], self._rows["lng"][redo])
+        if len(labels):
+            self._zone[redo] = labels + self._next_zone
+            self._next_zone += int(labels.max()) + 1
+
+    def _compact(self) -> None:
+        keep = self._alive
+        self._rows = self._rows[keep]
+        self._fires = [fire for fire, alive in zip(self._fires, keep.tolist()) if alive]
+        self._keys = self._keys[keep]
+        self._live = self._live[keep]
+        self._expires = self._expires[keep]
+        self._dedupe_cell = self._dedupe_cell[keep]
+        self._zone_cell = self._zone_cell[keep]
+        self._zone = self._zone[keep]
+        self._alive = np.ones(len(self._rows), dtype=bool)
+        self.index = GridIndex(self._rows["lat"], self._rows["lng"])
+        self.index.remove(np.flatnonzero(~self._live))
+
+    def fire_data(self) -> FireData:
+        """The live detections, as one FireData object per version."""
+        if "fire_data" not in self._views:
+            live = np.flatnonzero(self._live)
+            self._views["fire_data"] = FireData.model_construct(
+                fires=[self._fires[i] for i in live.tolist()],
+                count=len(live),
+                regions=dict(self._regions),
+            )
+        return self._views["fire_data"]
+
+    def positions(self, slots: np.ndarray) -> np.ndarray:
+        """Positions in fire_data().fires of live rows, given their slots (index point ids)."""
+        if "positions" not in self._views:
+            self._views["positions"] = np.cumsum(self._live) - 1
+        return self._views["positions"][slots]
+
+    def zones(self) -> list[FireZone]:
+        """Fire zones of the live detections, ranked by total FRP."""
+        if "zones" not in self._views:
+            live = self._live
+            _, zone = np.unique(self._zone[live], return_inverse=True)
+            rows = self._rows[live]
+            self._views["zones"] = summarize_zones(rows["lat"], rows["lng"], rows["frp"], zone)
+        return self._views["zones"]
+
+    def aggregate(self, resolution: float) -> FireAggregate:
+        """Per-cell counts of the live detections at one of FIRE_AGGREGATE_RESOLUTIONS."""
+        key = f"aggregate:{resolution}"
+        if key not in self._views:
+            self._views[key] = self.aggregates.aggregate(resolution)
+        return self._views[key]
@@ -0,0 +1,208 @@
+import numpy as np
+from .fire import FireAggregate, FireCell, FireData, FireZone
+
+# Detections in touching cells of this size (degrees, ~11 km) form one zone
+FIRE_ZONE_CELL_DEGREES = 0.1
+
+# Precomputed aggregate grids (degrees), finest first
+FIRE_AGGREGATE_RESOLUTIONS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+# Aim for about this many aggregate cells across one map tile
+CELLS_PER_TILE = 16
+
+
+def fire_columns(fire_data: FireData) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """lat, lng and FRP of every fire as float64 arrays."""
+    lat = np.array([fire.lat for fire in fire_data.fires], dtype=np.float64)
+    lng = np.array([fire.lng for fire in fire_data.fires], dtype=np.float64)
+    frp = np.array([fire.frp for fire in fire_data.fires], dtype=np.float64)
+    return lat, lng, frp
+
+
+def grid_cells(lat: np.ndarray, lng: np.ndarray, cell_degrees: float) -> tuple[np.ndarray, int]:
+    """Flat cell code (row * n_cols + col) of every point, and n_cols."""
+    n_rows = int(round(180 / cell_degrees))
+    n_cols = int(round(360 / cell_degrees))
+    rows = np.clip(np.floor((lat + 90) / cell_degrees), 0, n_rows - 1).astype(np.int64)
+    cols = np.floor(((lng + 180) % 360) / cell_degrees).astype(np.int64) % n_cols
+    return rows * n_cols + cols, n_cols
+
+
+def neighbor_cells(cells: np.ndarray, n_cols: int) -> np.ndarray:
+    """The given cells and their 8 neighbours (wrapping in longitude), deduplicated."""
+    rows, cols = np.divmod(cells, n_cols)
+    return np.unique(np.concatenate([
+        (rows + d_row) * n_cols + (cols + d_col) % n_cols
+        for d_row in (-1, 0, 1)
+        for d_col in (-1, 0, 1)
+    ]))
+
+
+def connected_components(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Component label of each of `n` nodes joined by edges (a[i], b[i]).
+
+    Vectorized label propagation: every edge pulls both ends to the smaller
+    label, then labels are shortcut through each other (pointer jumping), until
+    nothing changes. Each component ends up labelled by one of its nodes.
+    """
+    labels = np.arange(n)
+    while True:
+        smaller = np.minimum(labels[a], labels[b])
+        updated = labels.copy()
+        np.minimum.at(updated, a, smaller)
+        np.minimum.at(updated, b, smaller)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def zone_labels(lat: np.ndarray, lng: np.ndarray, cell_degrees: float = FIRE_ZONE_CELL_DEGREES) -> np.ndarray:
+    """
+    Zone of every detection (0..zones-1): connected components of occupied
+    grid cells (8-connected, wrapping across the antimeridian).
+    """
+    if not len(lat):
+        return np.empty(0, dtype=np.int64)
+
+    codes, n_cols = grid_cells(lat, lng, cell_degrees)
+    cells, point_cell = np.unique(codes, return_inverse=True)
+    cell_rows, cell_cols = np.divmod(cells, n_cols)
+
+    # Link each occupied cell to its occupied E, N, NE and NW neighbours
+    a, b = [], []
+    for d_row, d_col in ((0, 1), (1, -1), (1, 0), (1, 1)):
+        neighbor = (cell_rows + d_row) * n_cols + (cell_cols + d_col) % n_cols
+        position = np.minimum(np.searchsorted(cells, neighbor), len(cells) - 1)
+        found = cells[position] == neighbor
+        a.append(np.flatnonzero(found))
+        b.append(position[found])
+    labels = connected_components(len(cells), np.concatenate(a), np.concatenate(b))
+
+    _, zone_of_cell = np.unique(labels, return_inverse=True)
+    return zone_of_cell[point_cell]
+
+
+def summarize_zones(lat: np.ndarray, lng: np.ndarray, frp: np.ndarray, zone: np.ndarray) -> list[FireZone]:
+    """FireZones for detections labelled 0..zones-1, ranked by total FRP, most intense first."""
+    if not len(lat):
+        return []
+    n_zones = zone.max() + 1
+
+    count = np.bincount(zone, minlength=n_zones)
+    total_frp = np.bincount(zone, weights=frp, minlength=n_zones)
+    centroid_lat = np.bincount(zone, weights=lat, minlength=n_zones) / count
+    # Average longitude on the circle so zones straddling the antimeridian stay whole
+    lng_rad = np.radians(lng)
+    centroid_lng = np.degrees(np.arctan2(
+        np.bincount(zone, weights=np.sin(lng_rad), minlength=n_zones),
+        np.bincount(zone, weights=np.cos(lng_rad), minlength=n_zones),
+    ))
+
+    # Bounding boxes in longitudes unwrapped around each centroid
+    unwrapped = centroid_lng[zone] + ((lng - centroid_lng[zone] + 180) % 360) - 180
+    south, west = np.full(n_zones, np.inf), np.full(n_zones, np.inf)
+    north, east = np.full(n_zones, -np.inf), np.full(n_zones, -np.inf)
+    np.minimum.at(south, zone, lat)
+    np.maximum.at(north, zone, lat)
+    np.minimum.at(west, zone, unwrapped)
+    np.maximum.at(east, zone, unwrapped)
+    # Keep each box's west edge in [-180, 180)
+    shift = np.where(west < -180, 360, 0)
+    west, east = west + shift, east + shift
+
+    order = np.argsort(-total_frp, kind="stable")
+    columns = [
+        np.round(values[order], 4).tolist()
+        for values in (centroid_lat, centroid_lng, south, west, north, east, total_frp)
+    ]
+    return [
+        FireZone.model_construct(
+            id=rank, lat=c_lat, lng=c_lng, south=s, west=w, north=n, east=e, count=int(c), total_frp=f
+        )
+        for rank, (c_lat, c_lng, s, w, n, e, f, c) in enumerate(zip(*columns, count[order].tolist()))
+    ]
+
+
+def cluster_fires(
+    lat: np.ndarray, lng: np.ndarray, frp: np.ndarray, cell_degrees: float = FIRE_ZONE_CELL_DEGREES
+) -> list[FireZone]:
+    """Group detections into zones (see zone_labels), ranked by total FRP."""
+    return summarize_zones(lat, lng, frp, zone_labels(lat, lng, cell_degrees))
+
+
+def _aggregate(
+    resolution: float, cells: np.ndarray, n_cols: int, count: np.ndarray, total_frp: np.ndarray
+) -> FireAggregate:
+    rows, cols = np.divmod(cells, n_cols)
+    centers_lat = np.round(-90 + (rows + 0.5) * resolution, 4).tolist()
+    centers_lng = np.round(-180 + (cols + 0.5) * resolution, 4).tolist()
+    return FireAggregate.model_construct(
+        resolution=resolution,
+        cells=[
+            FireCell.model_construct(lat=c_lat, lng=c_lng, count=c, total_frp=f)
+            for c_lat, c_lng, c, f in zip(centers_lat, centers_lng, count.tolist(), np.round(total_frp, 2).tolist())
+        ],
+    )
+
+
+def aggregate_fires(lat: np.ndarray, lng: np.ndarray, frp: np.ndarray, resolution: float) -> FireAggregate:
+    """Fire count and total FRP per `resolution`-degree cell (occupied cells only)."""
+    if not len(lat):
+        return FireAggregate(resolution=resolution, cells=[])
+
+    codes, n_cols = grid_cells(lat, lng, resolution)
+    cells, cell_of_point, count = np.unique(codes, return_inverse=True, return_counts=True)
+    total_frp = np.bincount(cell_of_point, weights=frp, minlength=len(cells))
+    return _aggregate(resolution, cells, n_cols, count, total_frp)
+
+
+class AggregateGrids:
+    """
+    Running fire count and total FRP per cell at every resolution, as dense
+    grids that detections are added to and subtracted from, so aggregates
+    follow a changing set of fires without regrouping all of them. Cell
+    objects are kept between calls and rebuilt only where counts changed.
+    """
+
+    def __init__(self, resolutions: tuple[float, ...] = FIRE_AGGREGATE_RESOLUTIONS):
+        self.count = {r: np.zeros(int(round(180 / r)) * int(round(360 / r)), dtype=np.int32) for r in resolutions}
+        self.frp = {r: np.zeros(len(self.count[r])) for r in resolutions}
+        self._cells: dict[float, dict[int, FireCell]] = {r: {} for r in resolutions}
+        self._changed: dict[float, list[np.ndarray]] = {r: [] for r in resolutions}
+
+    def add(self, lat: np.ndarray, lng: np.ndarray, frp: np.ndarray, sign: int = 1) -> None:
+        """Add detections to every grid (sign=-1 removes them)."""
+        for resolution in self.count:
+            codes, _ = grid_cells(lat, lng, resolution)
+            np.add.at(self.count[resolution], codes, sign)
+            np.add.at(self.frp[resolution], codes, sign * frp)
+            self._changed[resolution].append(codes)
+
+    def aggregate(self, resolution: float) -> FireAggregate:
+        """Occupied cells of one grid, like aggregate_fires over the current detections."""
+        count, cells = self.count[resolution], self._cells[resolution]
+        if self._changed[resolution]:
+            changed = np.unique(np.concatenate(self._changed[resolution]))
+            self._changed[resolution] = []
+            for code in changed[count[changed] == 0].tolist():
+                cells.pop(code, None)
+            occupied = changed[count[changed] > 0]
+            updated = _aggregate(resolution, occupied, int(round(360 / resolution)), count[occupied], self.frp[resolution][occupied])
+            cells.update(zip(occupied.tolist(), updated.cells))
+        return FireAggregate.model_construct(
+            resolution=resolution, cells=[cells[code] for code in np.flatnonzero(count).tolist()],
+        )
+
+
+def resolution_for_zoom(zoom: int) -> float:
+    """
+    The finest precomputed resolution that still gives at most about
+    CELLS_PER_TILE cells across a web-mercator tile at `zoom`.
+    """
+    target = 360 / 2 ** zoom / CELLS_PER_TILE
+    for resolution in FIRE_AGGREGATE_RESOLUTIONS:
+        if resolution >= target:
+            return resolution
+    return FIRE_AGGREGATE_RESOLUTIONS[-1]
@@ -0,0 +1,205 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Vectorized great-circle distance in km (inputs in degrees, broadcastable)."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lat = np.radians(np.subtract(lat2, lat1))
+    delta_lng = np.radians(np.subtract(lng2, lng1))
+
+    a = np.sin(delta_lat / 2) ** 2 + \
+        np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lng / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def points_in_polygon(lats, lngs, polygon: list[list[float]]) -> np.ndarray:
+    """
+    Vectorized ray casting: which (lat, lng) points lie inside a [lng, lat]
+    ring. Edges are straight lines in lat/lng, as in the storm layer.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    ring = np.asarray(polygon, dtype=np.float64)
+    inside = np.zeros(len(lats), dtype=bool)
+    for (lng1, lat1), (lng2, lat2) in zip(ring, np.roll(ring, -1, axis=0)):
+        # The edge spans the point's latitude (never true for horizontal edges)
+        spans = (lats > min(lat1, lat2)) & (lats <= max(lat1, lat2)) & (lngs <= max(lng1, lng2))
+        if lng1 != lng2:
+            crossing = (lats - lat1) * (lng2 - lng1) / ((lat2 - lat1) or 1.0) + lng1
+            spans &= lngs <= crossing
+        inside ^= spans
+    return inside
+
+
+class FarthestPointSampler:
+    """
+    Incremental greedy farthest-point sampling over a set of lat/lng points.
+
+    Keeps a running "distance to nearest selected point" array that is updated
+    once per pick, so selecting k of n points costs O(n*k) vectorized work
+    instead of O(n*k^2) scalar haversine calls. The ordering is prefix-stable:
+    extending to a larger count never changes the points already picked.
+    """
+
+    def __init__(self, lats: np.ndarray, lngs: np.ndarray):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.order: list[int] = []
+        self._min_dist = np.full(len(self.lats), np.inf)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def extend_to(self, count: int) -> list[int]:
+        """Pick points until `count` are selected (or all are). Returns the order so far."""
+        count = min(count, len(self.lats))
+        if count <= len(self.order):
+            return self.order[:count]
+
+        # Start with the first point, like the original scalar implementation
+        if not self.order:
+            self._pick(0)
+
+        while len(self.order) < count:
+            # np.argmax returns the first maximum, matching the strict ">" tie-break
+            # of the scalar loop (lowest remaining index wins)
+            self._pick(int(np.argmax(self._min_dist)))
+
+        return self.order[:count]
+
+    def _pick(self, idx: int) -> None:
+        self.order.append(idx)
+        dist = haversine_km(self.lats, self.lngs, self.lats[idx], self.lngs[idx])
+        np.minimum(self._min_dist, dist, out=self._min_dist)
+        # Selected points can never be picked again
+        self._min_dist[idx] = -np.inf
+
+
+class GridIndex:
+    """
+    Lat/lng grid hash for radius queries over a set of points.
+
+    Points are bucketed into `cell_degrees` cells and stored sorted by cell,
+    so each grid row's run of cells is one contiguous slice. A query only
+    visits the cells that can intersect the search cap (wrapping across the
+    antimeridian, and spanning every longitude when the cap reaches a pole),
+    then checks those candidates with the exact haversine distance.
+
+    Points can be added and removed in place: new points are merged into the
+    sorted runs and removed ones dropped from them, without re-sorting. Point
+    ids are positions in `lats`/`lngs`, which only grow; a removed point's
+    slot stays (and can be inserted again) but is never returned.
+    """
+
+    def __init__(self, lats, lngs, cell_degrees: float = 1.0):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.cell_degrees = cell_degrees
+        self.n_rows = int(np.ceil(180 / cell_degrees))
+        self.n_cols = int(np.ceil(360 / cell_degrees))
+
+        cells = self._cells_of(self.lats, self.lngs)
+        self._order = np.argsort(cells, kind="stable")
+        self._cells = cells[self._order]
+        self._update_starts()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _row(self, lat) -> np.ndarray:
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_degrees), 0, self.n_rows - 1).astype(np.intp)
+
+    def _col(self, lng) -> np.ndarray:
+        return (np.floor(((np.asarray(lng) + 180) % 360) / self.cell_degrees) % self.n_cols).astype(np.intp)
+
+    def _cells_of(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        return self._row(lats) * self.n_cols + self._col(lngs)
+
+    def _update_starts(self) -> None:
+        # Points of cell c are self._order[self._starts[c]:self._starts[c + 1]]
+        self._starts = np.searchsorted(self._cells, np.arange(self.n_rows * self.n_cols + 1))
+
+    def add(self, lats, lngs) -> np.ndarray:
+        """Insert points into their cells' runs. Returns their ids."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        ids = np.arange(len(self.lats), len(self.lats) + len(lats))
+        self.lats = np.concatenate([self.lats, lats])
+        self.lngs = np.concatenate([self.lngs, lngs])
+        self.insert(ids)
+        return ids
+
+    def insert(self, ids) -> None:
+        """Put points (by id) back into their cells' runs, e.g. after remove()."""
+        ids = np.asarray(ids, dtype=np.intp)
+        cells = self._cells_of(self.lats[ids], self.lngs[ids])
+        order = np.argsort(cells, kind="stable")
+        positions = np.searchsorted(self._cells, cells[order], side="right")
+        self._cells = np.insert(self._cells, positions, cells[order])
+        self._order = np.insert(self._order, positions, ids[order])
+        self._update_starts()
+
+    def remove(self, ids) -> None:
+        """Drop points (by id) from the index."""
+        keep = ~np.isin(self._order, ids)
+        self._order = self._order[keep]
+        self._cells = self._cells[keep]
+        self._update_starts()
+
+    def candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Ids of points in the cells overlapping the cap of `radius_km` around (lat, lng)."""
+        if not len(self) or radius_km < 0:
+            return np.empty(0, dtype=np.intp)
+
+        radius = radius_km / EARTH_RADIUS_KM  # Angular radius (radians)
+        delta_lat = np.degrees(radius)
+        first_row, last_row = self._row(lat - delta_lat), self._row(lat + delta_lat)
+
+        # Widest longitude offset of a spherical cap; it covers a pole when sin(r) >= cos(lat)
+        cos_lat = np.cos(np.radians(lat))
+        if lat + delta_lat >= 90 or lat - delta_lat <= -90 or np.sin(radius) >= cos_lat:
+            spans = [(0, self.n_cols - 1)]
+        else:
+            delta_lng = np.degrees(np.arcsin(np.sin(radius) / cos_lat))
+            first_col, last_col = int(self._col(lng - delta_lng)), int(self._col(lng + delta_lng))
+            if 2 * delta_lng + self.cell_degrees >= 360:
+                spans = [(0, self.n_cols - 1)]
+            elif first_col <= last_col:
+                spans = [(first_col, last_col)]
+            else:  # Crosses the antimeridian
+                spans = [(first_col, self.n_cols - 1), (0, last_col)]
+
+        slices = [
+            self._order[self._starts[row * self.n_cols + first]:self._starts[row * self.n_cols + last + 1]]
+            for row in range(first_row, last_row + 1)
+            for first, last in spans
+        ]
+        if not slices:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(slices)
+
+    def within(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Ids of points within `radius_km` (great-circle) of (lat, lng)."""
+        candidates = self.candidates(lat, lng, radius_km)
+        distances = haversine_km(lat, lng, self.lats[candidates], self.lngs[candidates])
+        return candidates[distances <= radius_km]
+
+    def nearest(self, lat: float, lng: float, radius_km: float) -> tuple[int, float]:
+        """Id and distance (km) of the closest point within `radius_km`, or (-1, inf)."""
+        candidates = self.candidates(lat, lng, radius_km)
+        if not len(candidates):
+            return -1, float("inf")
+        distances = haversine_km(lat, lng, self.lats[candidates], self.lngs[candidates])
+        closest = int(np.argmin(distances))
+        if distances[closest] > radius_km:
+            return -1, float("inf")
+        return int(candidates[closest]), float(distances[closest])
+
+    def any_within(self, lat: float, lng: float, radius_km: float) -> bool:
+        """Whether any point lies within `radius_km` of (lat, lng)."""
+        return len(self.within(lat, lng, radius_km)) > 0
@@ -0,0 +1,96 @@
+from typing import Optional
+import numpy as np
+from .balloon import BalloonHazard, BalloonHazards
+from .fire import FireData
+from .storm import StormData
+from .balloon_service import get_balloon_service
+from .balloon_snapshot import COORD_DECIMALS, BalloonSnapshot
+from .fire_service import get_fire_service
+from .storm_service import get_storm_service
+
+# Balloons within this distance of a fire are over it (as /api/fires/check)
+FIRE_HAZARD_RADIUS_KM = 50
+
+# Storms without a polygon cover this radius around their center (as /api/storms/check)
+STORM_HAZARD_RADIUS_KM = 100
+
+
+class HazardService:
+    def __init__(self):
+        self.balloon_service = get_balloon_service()
+        self.fire_service = get_fire_service()
+        self.storm_service = get_storm_service()
+        self._latest: Optional[tuple[tuple[object, ...], BalloonHazards]] = None
+
+    async def get_hazards(self) -> BalloonHazards:
+        """
+        Fire and storm flags for every balloon with a current position.
+
+        Computed once per (balloon snapshot, FireData, StormData): each is a
+        cached object that is replaced only when its source refreshes, so
+        repeat requests are a single lookup.
+        """
+        snapshot = await self.balloon_service.fetch_all_balloon_data()
+        fire_data = await self.fire_service.get_active_fires()
+        storm_data = await self.storm_service.get_active_storms()
+
+        sources = (snapshot, fire_data, storm_data)
+        if self._latest is None or any(a is not b for a, b in zip(self._latest[0], sources)):
+            self._latest = (sources, self._annotate(snapshot, fire_data, storm_data))
+        return self._latest[1]
+
+    async def warm_hazards(self) -> None:
+        """Annotate the current balloons ahead of requests (after any source refresh)."""
+        await self.get_hazards()
+
+    def _annotate(self, snapshot: BalloonSnapshot, fire_data: FireData, storm_data: StormData) -> BalloonHazards:
+        """
+        Check every current balloon position against the fire index (nearest
+        fire within FIRE_HAZARD_RADIUS_KM) and the storm polygons/radii in one
+        pass each.
+        """
+        ids = snapshot.current_indices()
+        lats, lngs = snapshot.lat[0, ids], snapshot.lng[0, ids]
+
+        fires, fire_km = self.fire_service.nearest_fires(lats, lngs, fire_data, FIRE_HAZARD_RADIUS_KM)
+        storms = self.storm_service.storms_at(lats, lngs, storm_data.storms, STORM_HAZARD_RADIUS_KM)
+
+        balloons = [
+            BalloonHazard.model_construct(
+                id=balloon_id,
+                lat=lat,
+                lng=lng,
+                over_fire=fire >= 0,
+                in_storm=storm >= 0,
+                nearest_fire=fire if fire >= 0 else None,
+                nearest_fire_km=round(km, 2) if fire >= 0 else None,
+                storm_id=storm_data.storms[storm].id if storm >= 0 else None,
+            )
+            for balloon_id, lat, lng, fire, km, storm in zip(
+                ids.tolist(),
+                # Rounded like the balloon endpoints, so hazards match served positions exactly
+                np.round(lats.astype(np.float64), COORD_DECIMALS).tolist(),
+                np.round(lngs.astype(np.float64), COORD_DECIMALS).tolist(),
+                fires.tolist(),
+                fire_km.tolist(),
+                storms.tolist(),
+            )
+        ]
+        return BalloonHazards(
+            balloons=balloons,
+            over_fire=int(np.count_nonzero(fires >= 0)),
+            in_storm=int(np.count_nonzero(storms >= 0)),
+            fire_radius_km=FIRE_HAZARD_RADIUS_KM,
+            storm_radius_km=STORM_HAZARD_RADIUS_KM,
+        )
+
+
+# Singleton instance
+_hazard_service: Optional[HazardService] = None
+
+
+def get_hazard_service() -> HazardService:
+    global _hazard_service
+    if _hazard_service is None:
+        _hazard_service = HazardService()
+    return _hazard_service
@@ -2,9 +2,12 @@ import httpx
 import os
 import json
 from typing import Optional
+import numpy as np
 from openai import AsyncOpenAI
 from .storm import Storm, StormData
 from .cache import cache_with_ttl
+from .conditional import ConditionalFetcher
+from .geo import haversine_km, points_in_polygon
 
 # NOAA National Weather Service API (no key required)
 NOAA_ALERTS_URL = "https://api.weather.gov/alerts/active"
@@ -16,6 +19,7 @@ _zone_coordinate_cache: dict[str, tuple[float, float]] = {}
 class StormService:
     def __init__(self):
         self.client = httpx.AsyncClient(timeout=30.0)
+        self.fetcher = ConditionalFetcher(self.client)
         self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
 
     async def close(self):
@@ -125,26 +129,12 @@ If you cannot determine coordinates, respond with:
                 "severity": "Severe,Extreme",
             }
             
-            response = await self.client.get(NOAA_ALERTS_URL, headers=headers, params=params)
-            
-            if response.status_code != 200:
-                errors.append(f"NOAA API returned status {response.status_code}")
-                return StormData(storms=[], count=0, regions={})
-            
-            data = response.json()
-            features = data.get("features", [])
-            
-            if not features:
-                # No severe weather alerts - this is valid, not an error
-                return StormData(storms=[], count=0, regions={})
-            
-            for feature in features:
-                storm = await self._parse_storm_feature(feature)
-                if storm:
-                    storms.append(storm)
-                    # Group by event type for the regions summary
-                    event_type = feature.get("properties", {}).get("event", "Unknown")
-                    regions[event_type] = regions.get(event_type, 0) + 1
+            # Revalidated with ETag / If-Modified-Since: a 304 reuses the parsed StormData
+            # (and skips re-resolving zone coordinates)
+            storm_data, _ = await self.fetcher.get(
+                NOAA_ALERTS_URL, self._parse_alerts_response, params=params, headers=headers
+            )
+            return storm_data
                     
         except httpx.TimeoutException:
             errors.append("NOAA API request timed out")
@@ -161,6 +151,31 @@ If you cannot determine coordinates, respond with:
         
         return StormData(storms=storms, count=len(storms), regions=regions)
 
+    async def _parse_alerts_response(self, response: httpx.Response) -> StormData:
+        """Parse a NOAA alerts response into StormData."""
+        storms = []
+        regions: dict[str, int] = {}
+        
+        if response.status_code != 200:
+            return StormData(storms=[], count=0, regions={})
+        
+        data = response.json()
+        features = data.get("features", [])
+        
+        if not features:
+            # No severe weather alerts - this is valid, not an error
+            return StormData(storms=[], count=0, regions={})
+        
+        for feature in features:
+            storm = await self._parse_storm_feature(feature)
+            if storm:
+                storms.append(storm)
+                # Group by event type for the regions summary
+                event_type = feature.get("properties", {}).get("event", "Unknown")
+                regions[event_type] = regions.get(event_type, 0) + 1
+        
+        return StormData(storms=storms, count=len(storms), regions=regions)
+
     async def _parse_storm_feature(self, feature: dict) -> Optional[Storm]:
         """
         Parse a GeoJSON feature into a Storm object.
@@ -261,6 +276,40 @@ If you cannot determine coordinates, respond with:
         
         return None
 
+    def storms_at(self, lats: np.ndarray, lngs: np.ndarray, storms: list[Storm], radius_km: float = 100) -> np.ndarray:
+        """
+        is_balloon_in_storm for many points at once.
+        
+        Args:
+            lats: Point latitudes
+            lngs: Point longitudes
+            storms: List of storms to check against
+            radius_km: Radius in km around storms without a polygon (great-circle)
+            
+        Returns:
+            Index in `storms` of the first storm containing each point, -1 for none.
+            Each polygon is only tested against the points in its bounding box.
+        """
+        found = np.full(len(lats), -1)
+        for i, storm in enumerate(storms):
+            unmatched = found < 0
+            if storm.polygon:
+                if len(storm.polygon) < 3:
+                    continue
+                ring = np.asarray(storm.polygon, dtype=np.float64)
+                in_box = np.flatnonzero(
+                    unmatched
+                    & (lats >= ring[:, 1].min()) & (lats <= ring[:, 1].max())
+                    & (lngs >= ring[:, 0].min()) & (lngs <= ring[:, 0].max())
+                )
+                hits = in_box[points_in_polygon(lats[in_box], lngs[in_box], storm.polygon)]
+            elif storm.lat != 0 or storm.lng != 0:
+                hits = np.flatnonzero(unmatched & (haversine_km(lats, lngs, storm.lat, storm.lng) <= radius_km))
+            else:
+                continue
+            found[hits] = i
+        return found
+
     def _point_in_polygon(self, lat: float, lng: float, polygon: list[list[float]]) -> bool:
         """Check if a point is inside a polygon using ray casting algorithm."""
         n = len(polygon)
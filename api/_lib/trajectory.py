@@ -0,0 +1,149 @@
+import numpy as np
+from .geo import haversine_km
+from .wind_field import WindVolume
+
+INTEGRATION_METHODS = ("rk2", "rk4")
+
+# Wind samples per integration step
+METHOD_STAGES = {"rk2": 2, "rk4": 4}
+
+# 1 degree latitude ≈ 111 km; m/s -> km/h
+KM_PER_DEGREE = 111
+KMH_PER_MS = 3.6
+
+# Keep the longitude rate finite next to the poles (cos(87°) ≈ 0.05)
+MIN_COS_LAT = 0.05
+
+
+def _normalize(lat: np.ndarray, lng: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Fold positions that crossed a pole back onto the sphere and wrap longitude."""
+    over = np.abs(lat) > 90
+    lat = np.where(over, np.sign(lat) * 180 - lat, lat)
+    lng = np.where(over, lng + 180, lng)
+    return lat, ((lng + 180) % 360) - 180
+
+
+def advect(
+    volume: WindVolume,
+    lat,
+    lng,
+    pressure,
+    hours: list[float],
+    step_minutes: float = 30,
+    method: str = "rk2",
+    wind_scale=1.0,
+    wind_bias_u=0.0,
+    wind_bias_v=0.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Integrate parcels held at fixed pressures (hPa) through the wind volume.
+
+    Positions advance in equal substeps of at most `step_minutes` between
+    consecutive horizons, with the midpoint (RK2) or classic RK4 scheme. Every
+    parcel is advanced at once, so `lat`/`lng`/`pressure` can be any
+    broadcastable shape (e.g. members x balloons). The sampled wind is
+    perturbed as u * wind_scale + wind_bias_u (likewise for v).
+
+    Returns lat and lng arrays shaped (len(hours), *parcel_shape), one slice
+    per requested horizon (in the given order).
+    """
+    if method not in INTEGRATION_METHODS:
+        raise ValueError(f"Unknown integration method: {method}")
+
+    lat, lng, pressure = np.broadcast_arrays(
+        np.asarray(lat, dtype=np.float64),
+        np.asarray(lng, dtype=np.float64),
+        np.asarray(pressure, dtype=np.float64),
+    )
+    sample = volume.level_sampler(pressure)
+
+    def velocity(lat: np.ndarray, lng: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Rate of change of (lat, lng) in degrees per hour."""
+        u, v = sample(lat, lng)
+        u = u * wind_scale + wind_bias_u
+        v = v * wind_scale + wind_bias_v
+        cos_lat = np.maximum(np.cos(np.radians(lat)), MIN_COS_LAT)
+        return v * KMH_PER_MS / KM_PER_DEGREE, u * KMH_PER_MS / (KM_PER_DEGREE * cos_lat)
+
+    def step(lat: np.ndarray, lng: np.ndarray, dt: float) -> tuple[np.ndarray, np.ndarray]:
+        k1_lat, k1_lng = velocity(lat, lng)
+        if method == "rk2":
+            k2_lat, k2_lng = velocity(lat + k1_lat * dt / 2, lng + k1_lng * dt / 2)
+            return _normalize(lat + k2_lat * dt, lng + k2_lng * dt)
+
+        k2_lat, k2_lng = velocity(lat + k1_lat * dt / 2, lng + k1_lng * dt / 2)
+        k3_lat, k3_lng = velocity(lat + k2_lat * dt / 2, lng + k2_lng * dt / 2)
+        k4_lat, k4_lng = velocity(lat + k3_lat * dt, lng + k3_lng * dt)
+        return _normalize(
+            lat + (k1_lat + 2 * k2_lat + 2 * k3_lat + k4_lat) * dt / 6,
+            lng + (k1_lng + 2 * k2_lng + 2 * k3_lng + k4_lng) * dt / 6,
+        )
+
+    out_lat = np.empty((len(hours),) + lat.shape)
+    out_lng = np.empty((len(hours),) + lat.shape)
+    elapsed = 0.0
+    for index in np.argsort(hours, kind="stable"):
+        remaining = hours[index] - elapsed
+        if remaining > 0:
+            substeps = int(np.ceil(remaining * 60 / step_minutes))
+            for _ in range(substeps):
+                lat, lng = step(lat, lng, remaining / substeps)
+            elapsed = hours[index]
+        out_lat[index], out_lng[index] = lat, lng
+
+    return out_lat, out_lng
+
+
+def integration_cost(parcels: int, hours: list[float], step_minutes: float = 30, method: str = "rk2") -> int:
+    """Wind samples advect() takes for `parcels` parcels (substeps x stages per parcel)."""
+    substeps, elapsed = 0, 0.0
+    for hour in sorted(hours):
+        if hour > elapsed:
+            substeps += int(np.ceil((hour - elapsed) * 60 / step_minutes))
+            elapsed = hour
+    return parcels * substeps * METHOD_STAGES[method]
+
+
+def ensemble_perturbations(
+    members: int,
+    n: int,
+    rng: np.random.Generator,
+    speed_spread: float,
+    wind_noise_ms: float,
+    pressure_spread: float,
+) -> dict[str, np.ndarray]:
+    """
+    Per-member, per-parcel wind and pressure perturbations, shaped (members, n).
+
+    Member 0 is the unperturbed control run. The others scale the wind speed
+    by 1 + N(0, speed_spread), add N(0, wind_noise_ms) to u and v, and move
+    the parcel's pressure by a factor exp(N(0, pressure_spread)) so members
+    also sample the wind shear around the balloon's altitude.
+    """
+    def draw(sigma: float) -> np.ndarray:
+        values = rng.normal(0, sigma, (members, n))
+        values[0] = 0
+        return values
+
+    return {
+        "wind_scale": 1 + draw(speed_spread),
+        "wind_bias_u": draw(wind_noise_ms),
+        "wind_bias_v": draw(wind_noise_ms),
+        "pressure_factor": np.exp(draw(pressure_spread)),
+    }
+
+
+def ensemble_spread(
+    lat: np.ndarray, lng: np.ndarray, percentile: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ensemble centre and spread for member positions shaped (..., members, n).
+
+    Returns the mean lat/lng (longitude averaged on the circle) and the given
+    percentile of the members' great-circle distance (km) from that mean.
+    """
+    mean_lat = lat.mean(axis=-2)
+    lng_rad = np.radians(lng)
+    mean_lng = np.degrees(np.arctan2(np.sin(lng_rad).mean(axis=-2), np.cos(lng_rad).mean(axis=-2)))
+    distance = haversine_km(lat, lng, mean_lat[..., np.newaxis, :], mean_lng[..., np.newaxis, :])
+    return mean_lat, mean_lng, np.percentile(distance, percentile, axis=-2)
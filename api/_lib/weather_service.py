@@ -1,52 +1,167 @@
 import httpx
+import asyncio
 import os
 import math
-import random
+import time
+from pathlib import Path
 from typing import Optional
-from .weather import WeatherData, WindData, WindGrid
+import numpy as np
+from .weather import WeatherData, WindData, WindGrid, WindTile
 from .cache import cache_with_ttl, get_cache
+from .wind_field import WindField, WindVolume, uv_to_wind, wind_to_uv
+from .wind_store import GriddedWindStore, open_latest_wind_store
+from .wind_tiles import WindPyramid
 
 OPENWEATHERMAP_BASE_URL = "https://api.openweathermap.org/data/2.5"
 
+# Weather is cached per grid cell of this size (degrees), so nearby points share an entry
+DEFAULT_WEATHER_GRID_RESOLUTION = 0.25
+
+# Maximum concurrent OpenWeatherMap requests for a batch lookup
+WEATHER_BATCH_CONCURRENCY = 8
+
+# Simulated wind grid layout (degrees). WIND_GRID_RESOLUTION sets both steps,
+# down to MIN_WIND_GRID_RESOLUTION; unset keeps the default 15° x 20° layout.
+DEFAULT_WIND_LAT_STEP = 15
+DEFAULT_WIND_LNG_STEP = 20
+MIN_WIND_GRID_RESOLUTION = 1.0
+WIND_GRID_MAX_LAT = 75
+
+# Opt-in observed wind (WIND_OBSERVED) is sampled from OpenWeatherMap on this
+# fixed grid (degrees), whatever WIND_GRID_RESOLUTION is: 11 x 18 = 198 requests
+# per wind window and process (so also per serverless cold start), within
+# OBSERVED_WIND_REQUEST_BUDGET
+OBSERVED_WIND_LAT_STEP = 15
+OBSERVED_WIND_LNG_STEP = 20
+OBSERVED_WIND_REQUEST_BUDGET = 200
+
+# Wind is refreshed (and the simulated noise re-seeded) once per window. The
+# volume is cached per window and the grid and tile pyramid per volume, so all
+# of them (and the forecasts) always come from the same window.
+WIND_TIME_BUCKET_SECONDS = 900
+
+# Pressure level (hPa) used for the 2D wind field (~10 km)
+DEFAULT_WIND_LEVEL_HPA = 250
+
+# Simulated wind speed relative to the jet-stream level, by pressure level (hPa)
+SIMULATED_WIND_PROFILE = {
+    1000: 0.35, 850: 0.5, 700: 0.6, 500: 0.75, 300: 0.95, 250: 1.0, 200: 0.95,
+    150: 0.8, 100: 0.6, 70: 0.5, 50: 0.45, 30: 0.4, 20: 0.4,
+}
+
 
 class WeatherService:
-    def __init__(self):
+    def __init__(
+        self,
+        grid_resolution: Optional[float] = None,
+        wind_resolution: Optional[float] = None,
+        observed_wind: Optional[bool] = None,
+    ):
         self.client = httpx.AsyncClient(timeout=15.0)
         self.api_key = os.getenv("OPENWEATHERMAP_API_KEY", "")
+        self.grid_resolution = grid_resolution or float(
+            os.getenv("WEATHER_GRID_RESOLUTION", DEFAULT_WEATHER_GRID_RESOLUTION)
+        )
+        
+        wind_resolution = wind_resolution or os.getenv("WIND_GRID_RESOLUTION")
+        if wind_resolution:
+            step = max(MIN_WIND_GRID_RESOLUTION, float(wind_resolution))
+            self.wind_lat_step = self.wind_lng_step = step
+        else:
+            self.wind_lat_step = DEFAULT_WIND_LAT_STEP
+            self.wind_lng_step = DEFAULT_WIND_LNG_STEP
+        
+        # Optional gridded model wind (u/v on pressure levels) dropped on local disk
+        wind_data_dir = os.getenv("WIND_DATA_DIR")
+        wind_cache_dir = os.getenv("WIND_CACHE_DIR")
+        self.wind_data_dir = Path(wind_data_dir) if wind_data_dir else None
+        self.wind_cache_dir = Path(wind_cache_dir) if wind_cache_dir else None
+        self.wind_level = float(os.getenv("WIND_LEVEL_HPA", DEFAULT_WIND_LEVEL_HPA))
+        
+        # Observed OpenWeatherMap wind costs requests every window, so it is opt-in
+        if observed_wind is None:
+            observed_wind = os.getenv("WIND_OBSERVED", "").lower() in ("1", "true", "yes")
+        self.observed_wind = observed_wind
     
-    def _generate_realistic_wind(self, lat: float, lng: float) -> WindData:
-        """Generate realistic wind data based on latitude and typical global patterns."""
+    def _generate_realistic_wind(
+        self, lats: np.ndarray, lngs: np.ndarray, seed: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Generate realistic wind speed (m/s) and direction (degrees) on a lat/lng
+        grid from typical global circulation patterns. The same seed always
+        produces the same field. Returns arrays shaped (len(lats), len(lngs)).
+        """
         # Trade winds (0-30 degrees): blow from east to west
         # Westerlies (30-60 degrees): blow from west to east
         # Polar easterlies (60-90 degrees): blow from east to west
+        rng = np.random.default_rng(seed)
+        lat = np.broadcast_to(lats[:, np.newaxis], (len(lats), len(lngs)))
+        abs_lat = np.abs(lat)
+        north = lat >= 0
+        trades = abs_lat < 30
+        westerlies = ~trades & (abs_lat < 60)
         
-        abs_lat = abs(lat)
-        
-        if abs_lat < 30:
-            # Trade winds - easterly (from east, ~5-15 m/s)
-            base_direction = 90 if lat >= 0 else 270  # NE trades in NH, SE trades in SH
-            base_speed = 8 + random.uniform(-3, 5)
-        elif abs_lat < 60:
-            # Westerlies (from west, ~10-20 m/s)
-            base_direction = 270 if lat >= 0 else 90
-            base_speed = 12 + random.uniform(-4, 8)
-        else:
-            # Polar easterlies (from east, ~5-10 m/s)
-            base_direction = 90
-            base_speed = 6 + random.uniform(-2, 4)
+        # Trade winds - easterly (from east, ~5-15 m/s), NE trades in NH, SE trades in SH
+        # Westerlies (from west, ~10-20 m/s)
+        # Polar easterlies (from east, ~5-10 m/s)
+        base_direction = np.select(
+            [trades, westerlies],
+            [np.where(north, 90, 270), np.where(north, 270, 90)],
+            default=90,
+        )
+        base_speed = rng.uniform(
+            np.select([trades, westerlies], [8 - 3, 12 - 4], default=6 - 2),
+            np.select([trades, westerlies], [8 + 5, 12 + 8], default=6 + 4),
+        )
         
         # Add some randomness for natural variation
-        direction = (base_direction + random.uniform(-30, 30)) % 360
-        speed = max(0, base_speed + random.uniform(-2, 2))
+        direction = (base_direction + rng.uniform(-30, 30, lat.shape)) % 360
+        speed = np.maximum(0, base_speed + rng.uniform(-2, 2, lat.shape))
         
-        return WindData(lat=lat, lng=lng, speed=round(speed, 1), direction=round(direction))
+        return np.round(speed, 1), np.round(direction) % 360
 
     async def close(self):
         await self.client.aclose()
 
-    @cache_with_ttl("weather")
+    def _snap_to_cell(self, lat: float, lng: float) -> tuple[float, float]:
+        """Snap a point to the center of its weather grid cell."""
+        res = self.grid_resolution
+        cell_lat = max(-90.0, min(90.0, round(lat / res) * res))
+        cell_lng = ((round(lng / res) * res + 180) % 360) - 180
+        # Round off float noise so equal cells produce equal cache keys
+        return round(cell_lat, 6), round(cell_lng, 6)
+
     async def get_weather_at_location(self, lat: float, lng: float) -> Optional[WeatherData]:
-        """Get current weather at a specific location."""
+        """Get current weather at a specific location (cached per grid cell)."""
+        return await self._get_weather_for_cell(*self._snap_to_cell(lat, lng))
+
+    async def get_weather_batch(
+        self,
+        points: list[tuple[float, float]],
+        max_concurrency: int = WEATHER_BATCH_CONCURRENCY,
+    ) -> list[Optional[WeatherData]]:
+        """
+        Get current weather for many points at once.
+        
+        Points are deduplicated into grid cells, cache misses are fetched
+        concurrently (at most `max_concurrency` at a time), and the results are
+        fanned back out in input order.
+        """
+        cells = [self._snap_to_cell(lat, lng) for lat, lng in points]
+        unique_cells = list(dict.fromkeys(cells))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch(cell: tuple[float, float]) -> Optional[WeatherData]:
+            async with semaphore:
+                return await self._get_weather_for_cell(*cell)
+        
+        results = await asyncio.gather(*(fetch(cell) for cell in unique_cells))
+        by_cell = dict(zip(unique_cells, results))
+        return [by_cell[cell] for cell in cells]
+
+    @cache_with_ttl("weather")
+    async def _get_weather_for_cell(self, lat: float, lng: float) -> Optional[WeatherData]:
+        """Fetch current weather for a grid cell center from OpenWeatherMap."""
         try:
             url = f"{OPENWEATHERMAP_BASE_URL}/weather"
             params = {
@@ -83,26 +198,146 @@ class WeatherService:
 
     async def get_wind_grid(self) -> WindGrid:
         """
-        Get a grid of wind data points covering the globe.
-        Uses realistic simulated wind patterns based on global circulation.
+        Get a grid of wind data points covering the globe, sampled from the
+        current wind volume's field at the wind grid resolution.
+        """
+        return await self._get_wind_grid(await self.get_wind_volume())
+
+    @cache_with_ttl("wind")
+    async def _get_wind_grid(self, volume: WindVolume) -> WindGrid:
+        field = volume.level_field(self.wind_level)
+        lats, lngs = self._wind_grid_axes(self.wind_lat_step, self.wind_lng_step)
+        speed, direction = uv_to_wind(*field.sample(lats[:, np.newaxis], lngs[np.newaxis, :]))
+        # Also undoes float error from the u/v round trip of the simulated values
+        speed, direction = np.round(speed, 1), np.round(direction) % 360
+        lat, lng = np.meshgrid(lats, lngs, indexing="ij")
+        
+        # Validating plain dicts in one call is much faster than building models one by one
+        winds = [
+            {"lat": la, "lng": ln, "speed": sp, "direction": int(di)}
+            for la, ln, sp, di in zip(
+                lat.ravel().tolist(), lng.ravel().tolist(), speed.ravel().tolist(), direction.ravel().tolist()
+            )
+        ]
+        return WindGrid.model_validate({"winds": winds, "timestamp": field.timestamp})
+
+    async def get_wind_field(self) -> WindField:
+        """
+        Get the global wind field (at the level closest to WIND_LEVEL_HPA) as a
+        gridded u/v array for vectorized sampling.
+        """
+        volume = await self.get_wind_volume()
+        return volume.level_field(self.wind_level)
+
+    async def get_wind_volume(self) -> WindVolume:
+        """
+        Get global wind on pressure levels for altitude-aware sampling.
+        
+        Uses the newest model file in WIND_DATA_DIR (memory-mapped) when there
+        is one. Otherwise the winds are simulated once per
+        WIND_TIME_BUCKET_SECONDS window from a seed derived from the window, so
+        every call (and every process) within a window sees the same winds
+        without any API requests. The simulated levels share one circulation
+        pattern, scaled by SIMULATED_WIND_PROFILE.
+        
+        With WIND_OBSERVED the volume is built from OpenWeatherMap
+        observations instead (see _observed_wind_volume).
+        
+        Built once per window; the grid and tiles are derived from it.
+        """
+        return await self._get_wind_volume(int(time.time()) // WIND_TIME_BUCKET_SECONDS)
+
+    @cache_with_ttl("wind")
+    async def _get_wind_volume(self, bucket: int) -> WindVolume:
+        store = await self._open_wind_store()
+        if store:
+            return store.volume()
         
-        Note: We use simulated data instead of API calls to avoid rate limiting
-        and ensure reliable wind visualization.
+        if self.observed_wind:
+            return await self._observed_wind_volume(timestamp=bucket * WIND_TIME_BUCKET_SECONDS)
+        
+        lats, lngs = self._wind_grid_axes(self.wind_lat_step, self.wind_lng_step)
+        
+        speed, direction = self._generate_realistic_wind(lats, lngs, seed=bucket)
+        levels = np.array(list(SIMULATED_WIND_PROFILE), dtype=np.float64)
+        scale = np.array(list(SIMULATED_WIND_PROFILE.values()))[:, np.newaxis, np.newaxis]
+        u, v = wind_to_uv(speed * scale, direction)
+        return WindVolume(
+            levels=levels,
+            lats=lats,
+            lngs=lngs,
+            u=u,
+            v=v,
+            timestamp=bucket * WIND_TIME_BUCKET_SECONDS,
+        )
+
+    async def _observed_wind_volume(self, timestamp: int) -> WindVolume:
+        """
+        Build a single-level volume from OpenWeatherMap wind observed on the
+        OBSERVED_WIND_LAT_STEP x OBSERVED_WIND_LNG_STEP grid (one request per
+        grid point, WEATHER_BATCH_CONCURRENCY at a time). The samples bypass
+        the "weather" cache so they never evict user lookups. These are surface
+        observations, so every altitude samples the same winds, and finer wind
+        grids only interpolate them. Grid points without an observation are calm.
         """
-        import time
-        winds = []
+        lats, lngs = self._wind_grid_axes(OBSERVED_WIND_LAT_STEP, OBSERVED_WIND_LNG_STEP)
+        points = [(lat, lng) for lat in lats.tolist() for lng in lngs.tolist()]
+        if len(points) > OBSERVED_WIND_REQUEST_BUDGET:
+            raise ValueError(f"Observed wind grid needs {len(points)} requests (budget {OBSERVED_WIND_REQUEST_BUDGET})")
         
-        # Generate wind data at a grid of points (every 15 degrees for better coverage)
-        lat_step = 15
-        lng_step = 20
+        semaphore = asyncio.Semaphore(WEATHER_BATCH_CONCURRENCY)
         
-        for lat in range(-75, 76, lat_step):
-            for lng in range(-180, 180, lng_step):
-                wind = self._generate_realistic_wind(lat, lng)
-                winds.append(wind)
+        async def fetch(lat: float, lng: float) -> Optional[WindData]:
+            async with semaphore:
+                return await self._get_wind_at_point(lat, lng)
         
-        print(f"[DEBUG] Generated {len(winds)} wind data points")
-        return WindGrid(winds=winds, timestamp=int(time.time()))
+        winds = await asyncio.gather(*(fetch(lat, lng) for lat, lng in points))
+        missing = sum(w is None for w in winds)
+        if missing:
+            print(f"No observed wind at {missing} of {len(winds)} wind grid points")
+        
+        shape = (1, len(lats), len(lngs))
+        speed = np.array([w.speed if w else 0.0 for w in winds], dtype=np.float64).reshape(shape)
+        direction = np.array([w.direction if w else 0.0 for w in winds], dtype=np.float64).reshape(shape)
+        u, v = wind_to_uv(speed, direction)
+        return WindVolume(
+            levels=np.array([self.wind_level]),
+            lats=lats,
+            lngs=lngs,
+            u=u,
+            v=v,
+            timestamp=timestamp,
+        )
+
+    def _wind_grid_axes(self, lat_step: float, lng_step: float) -> tuple[np.ndarray, np.ndarray]:
+        """Latitudes and longitudes of a global wind grid with the given steps (degrees)."""
+        lats = np.arange(-WIND_GRID_MAX_LAT, WIND_GRID_MAX_LAT + 1e-9, lat_step, dtype=np.float64)
+        lngs = np.arange(-180, 180, lng_step, dtype=np.float64)
+        return lats, lngs
+
+    async def _open_wind_store(self) -> Optional[GriddedWindStore]:
+        """Open (ingesting on first use) the newest local model wind file, if any."""
+        if not self.wind_data_dir:
+            return None
+        try:
+            # Ingestion converts the whole file, so keep it off the event loop
+            return await asyncio.to_thread(open_latest_wind_store, self.wind_data_dir, self.wind_cache_dir)
+        except Exception as e:
+            print(f"Error loading wind data from {self.wind_data_dir}: {e}")
+            return None
+
+    async def get_wind_pyramid(self) -> WindPyramid:
+        """Get the multi-resolution tile pyramid of the current wind volume's field."""
+        return await self._get_wind_pyramid(await self.get_wind_volume())
+
+    @cache_with_ttl("wind")
+    async def _get_wind_pyramid(self, volume: WindVolume) -> WindPyramid:
+        return WindPyramid.from_field(volume.level_field(self.wind_level))
+
+    async def get_wind_tile(self, z: int, x: int, y: int) -> Optional[WindTile]:
+        """Get one wind tile (sampled once per pyramid), or None if z/x/y is out of range."""
+        pyramid = await self.get_wind_pyramid()
+        return pyramid.tile(z, x, y)
 
     async def _get_wind_at_point(self, lat: float, lng: float) -> Optional[WindData]:
         """Get wind data at a specific point."""
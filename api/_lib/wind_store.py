@@ -0,0 +1,203 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from .wind_field import WindVolume
+
+# Gridded model files picked up from WIND_DATA_DIR
+WIND_FILE_SUFFIXES = (".npz", ".nc")
+
+# Accepted variable names, first match wins (NetCDF conventions vary by producer)
+_LAT_NAMES = ("lat", "latitude")
+_LNG_NAMES = ("lon", "lng", "longitude")
+_LEVEL_NAMES = ("level", "isobaricInhPa", "plev", "pressure")
+_U_NAMES = ("u", "uwnd", "u_component_of_wind")
+_V_NAMES = ("v", "vwnd", "v_component_of_wind")
+
+
+def _pick(names: tuple[str, ...], available, what: str) -> str:
+    for name in names:
+        if name in available:
+            return name
+    raise ValueError(f"No {what} variable (expected one of {', '.join(names)})")
+
+
+def _regular_axis(values: np.ndarray, what: str) -> None:
+    steps = np.diff(values)
+    if len(values) < 2 or not np.allclose(steps, steps[0], rtol=0, atol=1e-6):
+        raise ValueError(f"{what} axis is not a regular grid")
+
+
+class _GriddedSource:
+    """
+    Read access to a gridded u/v file, one pressure level at a time.
+
+    `u_level` / `v_level` return (lat, lng) arrays; axes are read as stored
+    and normalized by ingest_wind_file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        if path.suffix == ".npz":
+            self._data = np.load(path)
+            names = self._data.files
+        else:
+            try:
+                import netCDF4
+            except ImportError as e:
+                raise RuntimeError("Reading NetCDF wind files requires the netCDF4 package") from e
+            self._data = netCDF4.Dataset(path)
+            self._data.set_auto_mask(False)
+            names = self._data.variables
+
+        self.lats = np.asarray(self._data[_pick(_LAT_NAMES, names, "latitude")][:], dtype=np.float64)
+        self.lngs = np.asarray(self._data[_pick(_LNG_NAMES, names, "longitude")][:], dtype=np.float64)
+        self._u = self._data[_pick(_U_NAMES, names, "u wind")]
+        self._v = self._data[_pick(_V_NAMES, names, "v wind")]
+
+        level_name = next((name for name in _LEVEL_NAMES if name in names), None)
+        if level_name:
+            levels = np.atleast_1d(np.asarray(self._data[level_name][:], dtype=np.float64))
+            # Some producers store pressure in Pa rather than hPa
+            self.levels = levels / 100 if levels.max() > 2000 else levels
+        else:
+            self.levels = np.array([np.nan])
+
+        # .npz files may carry a unix "time"; NetCDF time units vary, so use the file's mtime
+        if path.suffix == ".npz" and "time" in names and np.size(self._data["time"]):
+            self.timestamp = int(np.ravel(self._data["time"])[0])
+        else:
+            self.timestamp = int(path.stat().st_mtime)
+
+    def _level(self, variable, index: int) -> np.ndarray:
+        ndim = len(variable.shape)
+        if ndim == 4:  # (time, level, lat, lng): use the first time step
+            return np.asarray(variable[0, index], dtype=np.float32)
+        if ndim == 3:
+            return np.asarray(variable[index], dtype=np.float32)
+        return np.asarray(variable[:], dtype=np.float32)
+
+    def u_level(self, index: int) -> np.ndarray:
+        return self._level(self._u, index)
+
+    def v_level(self, index: int) -> np.ndarray:
+        return self._level(self._v, index)
+
+    def close(self) -> None:
+        self._data.close()
+
+
+def _cache_key(source: Path) -> str:
+    stat = source.stat()
+    return f"{source.stem}-{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def ingest_wind_file(source: Path, cache_dir: Path) -> Path:
+    """
+    Convert a gridded u/v file into (level, lat, lng) .npy arrays under `cache_dir`.
+
+    Latitudes are sorted ascending and longitudes rolled into [-180, 180), so
+    the arrays can be memory-mapped straight into a WindVolume. The cache
+    entry is keyed by file name, mtime and size and written to a temporary
+    directory first, so concurrent workers never see a partial entry.
+    Returns the cache entry's directory (existing entries are reused).
+    """
+    target = cache_dir / _cache_key(source)
+    if (target / "meta.json").exists():
+        return target
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    source_data = _GriddedSource(source)
+    staging = Path(tempfile.mkdtemp(prefix=".ingest-", dir=cache_dir))
+    try:
+        lngs = ((source_data.lngs + 180) % 360) - 180
+        lat_order = np.argsort(source_data.lats)
+        lng_order = np.argsort(lngs)
+        lats, lngs = source_data.lats[lat_order], lngs[lng_order]
+        _regular_axis(lats, "Latitude")
+        _regular_axis(lngs, "Longitude")
+
+        np.save(staging / "lat.npy", lats)
+        np.save(staging / "lng.npy", lngs)
+        shape = (len(source_data.levels), len(lats), len(lngs))
+        u = np.lib.format.open_memmap(staging / "u.npy", mode="w+", dtype=np.float32, shape=shape)
+        v = np.lib.format.open_memmap(staging / "v.npy", mode="w+", dtype=np.float32, shape=shape)
+        for index in range(len(source_data.levels)):
+            # One level in memory at a time
+            u[index] = source_data.u_level(index)[lat_order][:, lng_order]
+            v[index] = source_data.v_level(index)[lat_order][:, lng_order]
+        u.flush()
+        v.flush()
+        del u, v
+
+        meta = {
+            "source": source.name,
+            "levels": [None if np.isnan(level) else float(level) for level in source_data.levels],
+            "timestamp": source_data.timestamp,
+        }
+        (staging / "meta.json").write_text(json.dumps(meta))
+
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another worker finished the same entry first
+            if not (target / "meta.json").exists():
+                raise
+    finally:
+        source_data.close()
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return target
+
+
+class GriddedWindStore:
+    """
+    Memory-mapped u/v wind on pressure levels, from one ingested model file.
+
+    Arrays are opened with np.load(mmap_mode="r"), so only the pages of the
+    levels actually sampled are read, and worker processes share the OS page
+    cache instead of holding copies.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        meta = json.loads((path / "meta.json").read_text())
+        self.source = meta["source"]
+        self.levels: list[Optional[float]] = meta["levels"]
+        self.timestamp: int = meta["timestamp"]
+        self._volume: Optional[WindVolume] = None
+
+    def volume(self) -> WindVolume:
+        """The stored wind as a (memory-mapped) WindVolume."""
+        if self._volume is None:
+            self._volume = WindVolume(
+                # A file without pressure levels holds a single level; treat it as any pressure
+                levels=np.array([np.nan if level is None else level for level in self.levels]),
+                lats=np.load(self.path / "lat.npy"),
+                lngs=np.load(self.path / "lng.npy"),
+                u=np.load(self.path / "u.npy", mmap_mode="r"),
+                v=np.load(self.path / "v.npy", mmap_mode="r"),
+                timestamp=self.timestamp,
+            )
+        return self._volume
+
+
+def open_latest_wind_store(data_dir: Path, cache_dir: Optional[Path] = None) -> Optional[GriddedWindStore]:
+    """
+    Open the newest gridded wind file in `data_dir`, ingesting it on first use.
+
+    The array cache defaults to `data_dir/.cache`. Returns None when the
+    directory holds no supported file.
+    """
+    files = [
+        path for path in data_dir.glob("*")
+        if path.suffix in WIND_FILE_SUFFIXES and path.is_file()
+    ] if data_dir.is_dir() else []
+    if not files:
+        return None
+
+    newest = max(files, key=lambda path: path.stat().st_mtime)
+    return GriddedWindStore(ingest_wind_file(newest, cache_dir or data_dir / ".cache"))
@@ -0,0 +1,38 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import json
+import asyncio
+import sys
+import os
+
+# Add current directory to path for _lib imports (flat structure)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _lib.balloon_service import get_balloon_service
+from _lib.prediction_service import get_prediction_service, parse_forecast_hours
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        hours_ahead = parse_forecast_hours(query.get('hours', ['6,12,24'])[0])
+        
+        result = asyncio.run(self._get_all_forecasts(hours_ahead))
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(result).encode())
+    
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+    
+    async def _get_all_forecasts(self, hours_ahead: list[float]):
+        snapshot = await get_balloon_service().fetch_all_balloon_data()
+        forecasts = await get_prediction_service().get_fleet_forecast(snapshot, hours_ahead)
+        return [forecast.model_dump() for forecast in forecasts]
@@ -0,0 +1,88 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import json
+import asyncio
+import sys
+import os
+import re
+
+# Add current directory to path for _lib imports (flat structure)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _lib.balloon_service import get_balloon_service
+from _lib.prediction_service import (
+    MAX_ENSEMBLE_MEMBERS,
+    MAX_FORECAST_WIND_SAMPLES,
+    forecast_cost,
+    get_prediction_service,
+    parse_forecast_hours,
+)
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # Serves /api/balloons/selected/forecast and /api/balloons/forecast/{balloon_id}
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        match = re.search(r'/forecast/(\d+)', parsed.path)
+        balloon_id = int(match.group(1)) if match else None
+        
+        try:
+            count = max(1, min(100, int(query.get('count', ['50'])[0])))
+            members = max(1, min(MAX_ENSEMBLE_MEMBERS, int(query.get('members', ['50'])[0])))
+            step_minutes = max(5.0, min(60.0, float(query.get('step_minutes', ['30'])[0])))
+        except ValueError:
+            self.send_error(400, "Invalid query parameter")
+            return
+        method = query.get('method', ['rk2'])[0]
+        if method not in ('rk2', 'rk4'):
+            self.send_error(400, "Invalid method")
+            return
+        options = {
+            'hours_ahead': parse_forecast_hours(query.get('hours', ['6,12,24'])[0]),
+            'members': members,
+            'step_minutes': step_minutes,
+            'method': method,
+            'include_members': query.get('include_members', ['false'])[0].lower() in ('1', 'true', 'yes'),
+        }
+        cost = forecast_cost(
+            1 if balloon_id is not None else count, members, options['hours_ahead'], step_minutes, method
+        )
+        if cost > MAX_FORECAST_WIND_SAMPLES:
+            self.send_error(400, f"Forecast too large ({cost:,} wind samples, limit {MAX_FORECAST_WIND_SAMPLES:,})")
+            return
+        
+        result = asyncio.run(self._get_forecasts(balloon_id, count, options))
+        if result is None:
+            self.send_error(404, "Balloon not found")
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(result).encode())
+    
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+    
+    async def _get_forecasts(self, balloon_id, count: int, options: dict):
+        service = get_balloon_service()
+        prediction_service = get_prediction_service()
+        
+        if balloon_id is None:
+            balloons = (await service.get_selected_balloons(count)).balloons
+        else:
+            balloon = await service.get_balloon(balloon_id)
+            if balloon is None:
+                return None
+            balloons = [balloon]
+        
+        forecasts = await prediction_service.forecast_ensemble(balloons, **options)
+        if balloon_id is None:
+            return [forecast.model_dump() for forecast in forecasts]
+        return forecasts[0].model_dump()
@@ -0,0 +1,34 @@
+from http.server import BaseHTTPRequestHandler
+import json
+import asyncio
+import sys
+import os
+
+# Add current directory to path for _lib imports (flat structure)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _lib.hazard_service import get_hazard_service
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        result = asyncio.run(self._get_hazards())
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(result).encode())
+    
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+    
+    async def _get_hazards(self):
+        # Computed once per balloon/fire/storm refresh, then reused
+        service = get_hazard_service()
+        hazards = await service.get_hazards()
+        return hazards.model_dump()
@@ -39,10 +39,10 @@ class handler(BaseHTTPRequestHandler):
         service = get_balloon_service()
         balloons = await service.get_selected_balloons(count)
         
-        # Add future predictions
+        # Add future predictions for all balloons in one batched pass
         prediction_service = get_prediction_service()
-        for balloon in balloons.balloons:
-            future_positions = await prediction_service.predict_future_positions(balloon)
+        predictions = await prediction_service.predict_many(balloons.balloons)
+        for balloon, future_positions in zip(balloons.balloons, predictions):
             balloon.future_positions = future_positions
         
         return balloons.model_dump()
@@ -1,5 +1,5 @@
 from http.server import BaseHTTPRequestHandler
-import json
+from urllib.parse import urlparse, parse_qs
 import asyncio
 import sys
 import os
@@ -7,18 +7,29 @@ import os
 # Add current directory to path for _lib imports (flat structure)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from _lib.fire_encoding import FIRE_FORMATS
 from _lib.fire_service import get_fire_service
 
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
-        result = asyncio.run(self._get_fires())
+        fmt = parse_qs(urlparse(self.path).query).get('format', ['json'])[0]
+        if fmt not in FIRE_FORMATS:
+            self.send_error(400, "Invalid format")
+            return
+        
+        count, content = asyncio.run(self._get_fires(fmt))
         
         self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        if fmt == 'packed':
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('X-Fire-Count', str(count))
+            self.send_header('Access-Control-Expose-Headers', 'X-Fire-Count')
+        else:
+            self.send_header('Content-Type', 'application/json')
         self.end_headers()
-        self.wfile.write(json.dumps(result).encode())
+        self.wfile.write(content)
     
     def do_OPTIONS(self):
         self.send_response(200)
@@ -27,8 +38,8 @@ class handler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.end_headers()
     
-    async def _get_fires(self):
+    async def _get_fires(self, fmt: str):
+        # Encoded once per refresh; repeat requests reuse the bytes
         service = get_fire_service()
         fires = await service.get_active_fires()
-        return fires.model_dump()
-
+        return fires.count, service.get_encoded_fires(fires, fmt)
@@ -0,0 +1,52 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import json
+import asyncio
+import sys
+import os
+
+# Add current directory to path for _lib imports (flat structure)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _lib.fire_service import get_fire_service
+from _lib.fire_zones import resolution_for_zoom
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # Serves /api/fires/zones, /api/fires/aggregate and /api/fires/sources
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        
+        try:
+            min_count = max(1, int(query.get('min_count', ['1'])[0]))
+            zoom = max(0, min(22, int(query.get('zoom', ['2'])[0])))
+        except ValueError:
+            self.send_error(400, "Invalid query parameter")
+            return
+        
+        result = asyncio.run(self._get_layer(parsed.path.rstrip('/').split('/')[-1], min_count, zoom))
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(result).encode())
+    
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+    
+    async def _get_layer(self, layer: str, min_count: int, zoom: int):
+        service = get_fire_service()
+        if layer == 'sources':
+            stats = await service.get_source_stats()
+            return stats.model_dump() if stats else None
+        
+        fire_data = await service.get_active_fires()
+        if layer == 'aggregate':
+            return service.get_fire_aggregate(fire_data, resolution_for_zoom(zoom)).model_dump()
+        return [zone.model_dump() for zone in service.get_fire_zones(fire_data) if zone.count >= min_count]
@@ -0,0 +1,43 @@
+from http.server import BaseHTTPRequestHandler
+import json
+import asyncio
+import sys
+import os
+
+# Add current directory to path for _lib imports (flat structure)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _lib.weather import WeatherBatchRequest
+from _lib.weather_service import get_weather_service
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        content_length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(content_length)
+        
+        try:
+            request = WeatherBatchRequest.model_validate_json(body)
+        except ValueError:
+            self.send_error(400, "Invalid request body")
+            return
+        
+        result = asyncio.run(self._get_weather_batch(request))
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(result).encode())
+    
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+    
+    async def _get_weather_batch(self, request: WeatherBatchRequest):
+        service = get_weather_service()
+        results = await service.get_weather_batch([(p.lat, p.lng) for p in request.points])
+        return [weather.model_dump() if weather else None for weather in results]
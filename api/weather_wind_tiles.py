@@ -0,0 +1,60 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import json
+import asyncio
+import sys
+import os
+import re
+
+# Add current directory to path for _lib imports (flat structure)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _lib.weather_service import get_weather_service
+from _lib.wind_tiles import WIND_TILE_DTYPES, pack_wind_tile
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # Extract z/x/y from path and the encoding from the query string
+        parsed = urlparse(self.path)
+        match = re.search(r'/wind/tiles/(\d+)/(\d+)/(\d+)', parsed.path)
+        if not match:
+            self.send_error(400, "Invalid path")
+            return
+        
+        fmt = parse_qs(parsed.query).get('format', ['json'])[0]
+        if fmt != 'json' and fmt not in WIND_TILE_DTYPES:
+            self.send_error(400, "Invalid format")
+            return
+        
+        z, x, y = (int(group) for group in match.groups())
+        tile = asyncio.run(self._get_wind_tile(z, x, y))
+        if tile is None:
+            self.send_error(404, "Tile out of range")
+            return
+        
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if fmt == 'json':
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(tile.model_dump()).encode())
+        else:
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('X-Wind-Tile-Size', str(tile.size))
+            self.send_header('X-Wind-Tile-Bounds', f"{tile.west},{tile.south},{tile.east},{tile.north}")
+            self.send_header('X-Wind-Timestamp', str(tile.timestamp))
+            self.send_header('Access-Control-Expose-Headers', 'X-Wind-Tile-Size, X-Wind-Tile-Bounds, X-Wind-Timestamp')
+            self.end_headers()
+            self.wfile.write(pack_wind_tile(tile, fmt))
+    
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+    
+    async def _get_wind_tile(self, z: int, x: int, y: int):
+        service = get_weather_service()
+        return await service.get_wind_tile(z, x, y)
@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+import asyncio
 import os
 
 # Load environment variables
@@ -13,11 +15,53 @@ from .routers import (
     storms_router,
     location_router,
 )
+from .services.balloon_service import get_balloon_service
+from .services.fire_service import get_fire_service
+from .services.hazard_service import get_hazard_service
+from .services.prediction_service import get_prediction_service
+from .services.storm_service import get_storm_service
+from .utils.cache import get_cache, get_cache_stats
+from .utils.scheduler import refresh_periodically
+
+# Refresh upstream caches at this fraction of their TTL, so entries are replaced
+# before they expire and no user request waits on an upstream fetch
+REFRESH_AT_TTL_FRACTION = 0.8
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background cache refreshers (disable with BACKGROUND_REFRESH=false)."""
+    tasks = []
+    if os.getenv("BACKGROUND_REFRESH", "true").lower() in ("1", "true", "yes"):
+        jobs = {
+            "balloons": get_balloon_service().fetch_all_balloon_data,
+            "fires": get_fire_service().get_active_fires,
+            "storms": get_storm_service().get_active_storms,
+        }
+        # Derived artifacts rebuilt right after their source refreshes
+        warm_hazards = get_hazard_service().warm_hazards
+        follow_ups = {
+            "balloons": [get_prediction_service().warm_fleet_forecast, warm_hazards],
+            "fires": [get_fire_service().warm_fire_layers, warm_hazards],
+            "storms": [warm_hazards],
+        }
+        for name, method in jobs.items():
+            interval = get_cache(name).ttl * REFRESH_AT_TTL_FRACTION
+            tasks.append(asyncio.create_task(
+                refresh_periodically(name, method, interval, then=follow_ups[name])
+            ))
+    
+    yield
+    
+    for task in tasks:
+        task.cancel()
+
 
 app = FastAPI(
     title="SkyDrift API",
     description="API for Windborne balloon constellation tracking",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend
@@ -46,3 +90,8 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit, miss and coalesced-call counters for each TTL cache."""
+    return get_cache_stats()
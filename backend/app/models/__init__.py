@@ -1,6 +1,6 @@
-from .balloon import Balloon, BalloonPosition, BalloonHistory, SelectedBalloons
-from .weather import WeatherData, WindData, WindGrid
-from .fire import Fire, FireData
+from .balloon import Balloon, BalloonPosition, BalloonHistory, SelectedBalloons, ForecastPoint, BalloonForecast, BalloonHazard, BalloonHazards
+from .weather import WeatherData, WindData, WindGrid, WindTile, GeoPoint, WeatherBatchRequest
+from .fire import Fire, FireData, FireColumns, FireZone, FireCell, FireAggregate, FireSourceStats, FireSources
 from .storm import Storm, StormData
 from .location import LocationRequest, LocationResponse
 
@@ -9,11 +9,24 @@ __all__ = [
     "BalloonPosition", 
     "BalloonHistory",
     "SelectedBalloons",
+    "ForecastPoint",
+    "BalloonForecast",
+    "BalloonHazard",
+    "BalloonHazards",
     "WeatherData",
     "WindData",
     "WindGrid",
+    "WindTile",
+    "GeoPoint",
+    "WeatherBatchRequest",
     "Fire",
     "FireData",
+    "FireColumns",
+    "FireZone",
+    "FireCell",
+    "FireAggregate",
+    "FireSourceStats",
+    "FireSources",
     "Storm",
     "StormData",
     "LocationRequest",
@@ -26,3 +26,35 @@ class SelectedBalloons(BaseModel):
     balloons: list[Balloon]
     total_count: int
 
+
+
+class ForecastPoint(BaseModel):
+    hours_ahead: float
+    lat: float  # Ensemble mean position
+    lng: float
+    radius_km: float  # Uncertainty cone radius (percentile distance of members from the mean)
+
+
+class BalloonForecast(BaseModel):
+    id: int
+    track: list[ForecastPoint]
+    members: Optional[list[list[list[float]]]] = None  # Per member, per horizon [lat, lng]
+
+
+class BalloonHazard(BaseModel):
+    id: int  # Balloon id
+    lat: float
+    lng: float
+    over_fire: bool
+    in_storm: bool
+    nearest_fire: Optional[int] = None  # Index into /api/fires of the closest fire within the fire radius
+    nearest_fire_km: Optional[float] = None
+    storm_id: Optional[str] = None  # Storm the balloon is in
+
+
+class BalloonHazards(BaseModel):
+    balloons: list[BalloonHazard]  # Same order as /api/balloons/all/current
+    over_fire: int  # Balloons over fires
+    in_storm: int  # Balloons in storms
+    fire_radius_km: float
+    storm_radius_km: float
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 
@@ -24,3 +24,26 @@ class WindGrid(BaseModel):
     winds: list[WindData]
     timestamp: int
 
+
+class GeoPoint(BaseModel):
+    lat: float
+    lng: float
+
+
+class WeatherBatchRequest(BaseModel):
+    points: list[GeoPoint] = Field(max_length=500)
+
+
+class WindTile(BaseModel):
+    """Wind u/v components (m/s) sampled on a size x size grid over one web-mercator tile, rows north to south."""
+    z: int
+    x: int
+    y: int
+    size: int
+    west: float
+    south: float
+    east: float
+    north: float
+    timestamp: int
+    u: list[list[float]]
+    v: list[list[float]]
@@ -1,27 +1,67 @@
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
 from ..services.balloon_service import get_balloon_service
-from ..services.prediction_service import get_prediction_service
-from ..models import SelectedBalloons, BalloonPosition
+from ..services.hazard_service import get_hazard_service
+from ..services.prediction_service import (
+    MAX_ENSEMBLE_MEMBERS,
+    MAX_FORECAST_WIND_SAMPLES,
+    forecast_cost,
+    get_prediction_service,
+    parse_forecast_hours,
+)
+from ..models import SelectedBalloons, BalloonPosition, BalloonForecast, BalloonHazards
 
 router = APIRouter(prefix="/api/balloons", tags=["balloons"])
 
 
+def check_forecast_budget(balloons: int, members: int, hours: list[float], step_minutes: float, method: str) -> None:
+    """Reject (400) ensemble forecasts that would integrate more than MAX_FORECAST_WIND_SAMPLES."""
+    cost = forecast_cost(balloons, members, hours, step_minutes, method)
+    if cost > MAX_FORECAST_WIND_SAMPLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Forecast too large ({cost:,} wind samples, limit {MAX_FORECAST_WIND_SAMPLES:,}): "
+                   "reduce count, members or hours, or increase step_minutes",
+        )
+
+
 @router.get("/selected", response_model=SelectedBalloons)
 async def get_selected_balloons(count: int = Query(default=50, ge=1, le=100)):
     """Get the most spatially distributed balloons with full 24h history."""
     service = get_balloon_service()
     balloons = await service.get_selected_balloons(count)
     
-    # Add future predictions for each balloon
+    # Add future predictions for all balloons in one batched pass
     prediction_service = get_prediction_service()
-    for balloon in balloons.balloons:
-        future_positions = await prediction_service.predict_future_positions(balloon)
+    predictions = await prediction_service.predict_many(balloons.balloons)
+    for balloon, future_positions in zip(balloons.balloons, predictions):
         balloon.future_positions = future_positions
     
     return balloons
 
 
+@router.get("/selected/forecast", response_model=list[BalloonForecast])
+async def get_selected_forecasts(
+    count: int = Query(default=50, ge=1, le=100),
+    hours: str = "6,12,24",
+    members: int = Query(default=50, ge=1, le=MAX_ENSEMBLE_MEMBERS),
+    step_minutes: float = Query(default=30, ge=5, le=60),
+    method: str = Query(default="rk2", pattern="^(rk2|rk4)$"),
+    include_members: bool = False,
+):
+    """Ensemble forecast tracks and uncertainty cones for the selected balloons."""
+    hours_ahead = parse_forecast_hours(hours)
+    check_forecast_budget(count, members, hours_ahead, step_minutes, method)
+    
+    service = get_balloon_service()
+    balloons = await service.get_selected_balloons(count)
+    
+    prediction_service = get_prediction_service()
+    return await prediction_service.forecast_ensemble(
+        balloons.balloons, hours_ahead,
+        members=members, step_minutes=step_minutes, method=method, include_members=include_members,
+    )
+
+
 @router.get("/all/current", response_model=list[BalloonPosition])
 async def get_all_balloons_current():
     """Get current positions of all balloons (for counting in zones)."""
@@ -29,6 +69,23 @@ async def get_all_balloons_current():
     return await service.get_all_balloons_current()
 
 
+@router.get("/all/forecast", response_model=list[BalloonForecast])
+async def get_all_forecasts(hours: str = "6,12,24"):
+    """Ensemble forecast tracks and uncertainty cones for every balloon, precomputed per snapshot."""
+    service = get_balloon_service()
+    snapshot = await service.fetch_all_balloon_data()
+    
+    prediction_service = get_prediction_service()
+    return await prediction_service.get_fleet_forecast(snapshot, parse_forecast_hours(hours))
+
+
+@router.get("/hazards", response_model=BalloonHazards)
+async def get_balloon_hazards():
+    """Over-fire and in-storm flags (with the nearest fire and the storm) for every current balloon."""
+    service = get_hazard_service()
+    return await service.get_hazards()
+
+
 @router.get("/predictions/{balloon_id}")
 async def get_balloon_predictions(balloon_id: int, hours: str = "5,10"):
     """Get future position predictions for a specific balloon."""
@@ -41,13 +98,37 @@ async def get_balloon_predictions(balloon_id: int, hours: str = "5,10"):
     except ValueError:
         hours_list = [5, 10]
     
-    # Get the balloon data
-    balloons = await service.get_selected_balloons(1000)  # Get all to find the specific one
+    # Look up the balloon directly by id
+    balloon = await service.get_balloon(balloon_id)
     
-    for balloon in balloons.balloons:
-        if balloon.id == balloon_id:
-            predictions = await prediction_service.predict_future_positions(balloon, hours_list)
-            return {"balloon_id": balloon_id, "predictions": predictions}
+    if balloon is None:
+        return {"balloon_id": balloon_id, "predictions": [], "error": "Balloon not found"}
     
-    return {"balloon_id": balloon_id, "predictions": [], "error": "Balloon not found"}
+    predictions = await prediction_service.predict_future_positions(balloon, hours_list)
+    return {"balloon_id": balloon_id, "predictions": predictions}
 
+
+@router.get("/forecast/{balloon_id}", response_model=BalloonForecast)
+async def get_balloon_forecast(
+    balloon_id: int,
+    hours: str = "6,12,24",
+    members: int = Query(default=50, ge=1, le=MAX_ENSEMBLE_MEMBERS),
+    step_minutes: float = Query(default=30, ge=5, le=60),
+    method: str = Query(default="rk2", pattern="^(rk2|rk4)$"),
+    include_members: bool = False,
+):
+    """Ensemble forecast track and uncertainty cone for one balloon."""
+    hours_ahead = parse_forecast_hours(hours)
+    check_forecast_budget(1, members, hours_ahead, step_minutes, method)
+    
+    service = get_balloon_service()
+    balloon = await service.get_balloon(balloon_id)
+    if balloon is None:
+        raise HTTPException(status_code=404, detail="Balloon not found")
+    
+    prediction_service = get_prediction_service()
+    forecasts = await prediction_service.forecast_ensemble(
+        [balloon], hours_ahead,
+        members=members, step_minutes=step_minutes, method=method, include_members=include_members,
+    )
+    return forecasts[0]
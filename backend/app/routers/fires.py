@@ -1,15 +1,75 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Response
+from typing import Optional, Union
 from ..services.fire_service import get_fire_service
-from ..models import FireData
+from ..services.fire_zones import resolution_for_zoom
+from ..models import FireData, FireColumns, FireZone, FireAggregate, FireSources
 
 router = APIRouter(prefix="/api/fires", tags=["fires"])
 
 
-@router.get("", response_model=FireData)
-async def get_active_fires():
-    """Get all active wildfires globally."""
+# Encodings are served as prebuilt bytes, so the schema is documented per format
+FIRES_RESPONSES = {
+    200: {
+        "description": "FireData (json), FireColumns (columnar) or packed arrays (packed)",
+        "model": Union[FireData, FireColumns],
+        "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+        "headers": {
+            "X-Fire-Count": {
+                "description": "Number of fires (packed only): each array holds this many values",
+                "schema": {"type": "integer"},
+            },
+        },
+    },
+}
+
+
+@router.get("", response_class=Response, responses=FIRES_RESPONSES)
+async def get_active_fires(format: str = Query("json", pattern="^(json|columnar|packed)$")):
+    """
+    Get all active wildfires globally.
+    
+    `format=columnar` returns count, regions and one parallel array per Fire
+    field. `format=packed` returns float32 lat, float32 lng and uint16
+    brightness arrays back to back (little-endian); the count is in the
+    headers. Every encoding is built once per refresh and served as bytes.
+    """
+    service = get_fire_service()
+    fire_data = await service.get_active_fires()
+    content = service.get_encoded_fires(fire_data, format)
+    
+    if format != "packed":
+        return Response(content=content, media_type="application/json")
+    return Response(
+        content=content,
+        media_type="application/octet-stream",
+        headers={
+            "X-Fire-Count": str(fire_data.count),
+            "Access-Control-Expose-Headers": "X-Fire-Count",
+        },
+    )
+
+
+@router.get("/sources", response_model=Optional[FireSources])
+async def get_fire_sources():
+    """Per-product download/parse timings and counts of the last FIRMS refresh."""
+    service = get_fire_service()
+    return await service.get_source_stats()
+
+
+@router.get("/zones", response_model=list[FireZone])
+async def get_fire_zones(min_count: int = Query(default=1, ge=1)):
+    """Fire zones (clusters of adjacent detections), most intense first."""
     service = get_fire_service()
-    return await service.get_active_fires()
+    fire_data = await service.get_active_fires()
+    return [zone for zone in service.get_fire_zones(fire_data) if zone.count >= min_count]
+
+
+@router.get("/aggregate", response_model=FireAggregate)
+async def get_fire_aggregate(zoom: int = Query(default=2, ge=0, le=22)):
+    """Fire counts per grid cell, at the resolution precomputed for a map zoom level."""
+    service = get_fire_service()
+    fire_data = await service.get_active_fires()
+    return service.get_fire_aggregate(fire_data, resolution_for_zoom(zoom))
 
 
 @router.get("/check/{lat}/{lng}")
@@ -17,6 +77,6 @@ async def check_balloon_over_fire(lat: float, lng: float, radius_km: float = 50)
     """Check if a location is near any active fires."""
     service = get_fire_service()
     fire_data = await service.get_active_fires()
-    is_over_fire = service.is_balloon_over_fire(lat, lng, fire_data.fires, radius_km)
+    is_over_fire = service.is_balloon_over_fire(lat, lng, fire_data, radius_km)
     return {"lat": lat, "lng": lng, "is_over_fire": is_over_fire}
 
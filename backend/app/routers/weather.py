@@ -1,7 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import Optional
 from ..services.weather_service import get_weather_service
-from ..models import WeatherData, WindGrid
+from ..services.wind_tiles import pack_wind_tile
+from ..models import WeatherData, WindGrid, WindTile, WeatherBatchRequest
 
 router = APIRouter(prefix="/api/weather", tags=["weather"])
 
@@ -14,6 +15,40 @@ async def get_wind_grid():
     return await service.get_wind_grid()
 
 
+@router.get("/wind/tiles/{z}/{x}/{y}", response_model=WindTile)
+async def get_wind_tile(z: int, x: int, y: int, format: str = Query("json", pattern="^(json|f16|f32)$")):
+    """
+    Get wind u/v for one web-mercator tile.
+    
+    `format=f16` / `f32` returns the u then v arrays packed as little-endian
+    floats (row-major, north row first); tile metadata is in the headers.
+    """
+    service = get_weather_service()
+    tile = await service.get_wind_tile(z, x, y)
+    if tile is None:
+        raise HTTPException(status_code=404, detail="Tile out of range")
+    
+    if format == "json":
+        return tile
+    return Response(
+        content=pack_wind_tile(tile, format),
+        media_type="application/octet-stream",
+        headers={
+            "X-Wind-Tile-Size": str(tile.size),
+            "X-Wind-Tile-Bounds": f"{tile.west},{tile.south},{tile.east},{tile.north}",
+            "X-Wind-Timestamp": str(tile.timestamp),
+            "Access-Control-Expose-Headers": "X-Wind-Tile-Size, X-Wind-Tile-Bounds, X-Wind-Timestamp",
+        },
+    )
+
+
+@router.post("/batch", response_model=list[Optional[WeatherData]])
+async def get_weather_batch(request: WeatherBatchRequest):
+    """Get weather for many locations at once (results in request order)."""
+    service = get_weather_service()
+    return await service.get_weather_batch([(p.lat, p.lng) for p in request.points])
+
+
 @router.get("/{lat}/{lng}", response_model=Optional[WeatherData])
 async def get_weather_at_location(lat: float, lng: float):
     """Get weather data at a specific location."""
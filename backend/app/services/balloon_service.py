@@ -1,12 +1,17 @@
 import httpx
 import asyncio
-import math
 from typing import Optional
 from ..models import Balloon, BalloonPosition, SelectedBalloons
 from ..utils.cache import cache_with_ttl, get_cache
+from ..utils.conditional import ConditionalFetcher
+from ..utils.geo import FarthestPointSampler
+from .balloon_snapshot import BalloonSnapshot
 
 WINDBORNE_BASE_URL = "https://a.windbornesystems.com/treasure"
 
+# Selection order is computed at least this far ahead (the /selected endpoint max)
+SELECTION_ORDER_SIZE = 100
+
 # Vibrant color palette for balloons
 BALLOON_COLORS = [
     "#FF6B6B",  # Coral Red
@@ -29,15 +34,65 @@ BALLOON_COLORS = [
 
 
 class BalloonService:
-    def __init__(self):
+    def __init__(self, rolling_ingest: bool = True):
         self.client = httpx.AsyncClient(timeout=30.0)
+        self.fetcher = ConditionalFetcher(self.client)
+        # When enabled, refreshes reuse the previous snapshot and only fetch new hours
+        self.rolling_ingest = rolling_ingest
+        self._snapshot: Optional[BalloonSnapshot] = None
 
     async def close(self):
         await self.client.aclose()
 
     @cache_with_ttl("balloons")
-    async def fetch_all_balloon_data(self) -> list[list[Optional[list[float]]]]:
-        """Fetch all 24 hours of balloon data from Windborne API."""
+    async def fetch_all_balloon_data(self) -> BalloonSnapshot:
+        """Fetch all 24 hours of balloon data from Windborne API as a columnar snapshot."""
+        if self.rolling_ingest and self._snapshot is not None:
+            snapshot = await self._refresh_rolling(self._snapshot)
+            if snapshot is not None:
+                self._snapshot = snapshot
+                return snapshot
+        
+        self._snapshot = await self._fetch_full_window()
+        return self._snapshot
+
+    async def _refresh_rolling(self, previous: BalloonSnapshot) -> Optional[BalloonSnapshot]:
+        """
+        Refresh from the previous snapshot by fetching only the newest hour.
+        
+        - 00.json revalidates (304) or is identical to cached hour 0: nothing
+          changed, reuse the snapshot.
+        - New 01.json identical to cached hour 0: the window rolled by one hour, so
+          shift the cached hours back and prepend the new 00.json.
+        
+        Returns None when neither holds (e.g. several hours were missed) so the
+        caller falls back to a full 24-file fetch.
+        """
+        try:
+            newest, modified = await self.fetcher.get(
+                f"{WINDBORNE_BASE_URL}/00.json", self._parse_hour_response
+            )
+        except Exception:
+            return None
+        
+        # 304: 00.json is still exactly the file the previous snapshot was built from
+        if not modified:
+            return previous
+        
+        if not newest:
+            return None
+        
+        if previous.matches_current(newest):
+            return previous
+        
+        second = await self._fetch_hour_data(f"{WINDBORNE_BASE_URL}/01.json", 1)
+        if second and previous.matches_current(second):
+            return previous.rolled(newest)
+        
+        return None
+
+    async def _fetch_full_window(self) -> BalloonSnapshot:
+        """Fetch all 24 hour files concurrently and build a fresh snapshot."""
         tasks = []
         for hour in range(24):
             url = f"{WINDBORNE_BASE_URL}/{hour:02d}.json"
@@ -53,155 +108,112 @@ class BalloonService:
             else:
                 hourly_data.append(result)
         
-        return hourly_data
+        return BalloonSnapshot.from_hourly_data(hourly_data)
 
     async def _fetch_hour_data(self, url: str, hour: int) -> Optional[list]:
-        """Fetch balloon data for a specific hour."""
+        """
+        Fetch balloon data for a specific hour.
+        
+        The current hour (00.json) is the file refetched on every refresh, so it is
+        requested conditionally (ETag / If-Modified-Since) through the fetcher.
+        """
         try:
+            if hour == 0:
+                data, _ = await self.fetcher.get(url, self._parse_hour_response)
+                return data
             response = await self.client.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                # Handle potentially corrupted data
-                if isinstance(data, list):
-                    return data
-            return []
+            return self._parse_hour_response(response)
         except Exception:
             return []
 
-    def _parse_balloon_position(self, data: Optional[list], hours_ago: int) -> Optional[BalloonPosition]:
-        """Parse a single balloon position from raw data."""
-        if data is None or not isinstance(data, list) or len(data) < 2:
-            return None
-        
-        try:
-            lat = float(data[0]) if data[0] is not None else None
-            lng = float(data[1]) if data[1] is not None else None
-            altitude = float(data[2]) if len(data) > 2 and data[2] is not None else None
-            
-            if lat is None or lng is None:
-                return None
-            
-            # Validate coordinates
-            if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
-                return None
-            
-            return BalloonPosition(lat=lat, lng=lng, altitude=altitude, hours_ago=hours_ago)
-        except (ValueError, TypeError):
-            return None
+    def _parse_hour_response(self, response: httpx.Response) -> list:
+        """Parse one hour file response, treating errors and corrupted data as empty."""
+        if response.status_code == 200:
+            data = response.json()
+            # Handle potentially corrupted data
+            if isinstance(data, list):
+                return data
+        return []
 
-    def _haversine_distance(self, lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-        """Calculate the great-circle distance between two points in km."""
-        R = 6371  # Earth's radius in km
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lng = math.radians(lng2 - lng1)
-        
-        a = math.sin(delta_lat / 2) ** 2 + \
-            math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    def _get_selection_order(self, snapshot: BalloonSnapshot) -> FarthestPointSampler:
+        """
+        Get the farthest-point selection order for a snapshot.
         
-        return R * c
-
-    def _select_distributed_balloons(
-        self, 
-        hourly_data: list[list[Optional[list[float]]]], 
-        count: int = 50
-    ) -> list[int]:
+        FPS order is prefix-stable, so one sampler per snapshot serves every `count`
+        as a slice. It is extended lazily if a larger count is ever requested.
+        """
+        cache = get_cache("selection")
+        sampler = cache.get(snapshot.version)
+        if sampler is None:
+            valid_ids = snapshot.current_indices()
+            sampler = FarthestPointSampler(snapshot.lat[0, valid_ids], snapshot.lng[0, valid_ids])
+            sampler.extend_to(SELECTION_ORDER_SIZE)
+            cache[snapshot.version] = sampler
+        return sampler
+
+    def _select_distributed_balloons(self, snapshot: BalloonSnapshot, count: int = 50) -> list[int]:
         """
         Select the most spatially distributed balloons using greedy farthest-point sampling.
         Returns indices of selected balloons.
         """
-        if not hourly_data or not hourly_data[0]:
-            return []
-        
-        current_positions = hourly_data[0]  # Hour 0 = current positions
-        
-        # Get valid balloon indices with their current positions
-        valid_balloons = []
-        for idx, pos in enumerate(current_positions):
-            parsed = self._parse_balloon_position(pos, 0)
-            if parsed:
-                valid_balloons.append((idx, parsed.lat, parsed.lng))
+        # Balloons with a valid current (hour 0) position
+        valid_ids = snapshot.current_indices()
         
-        if len(valid_balloons) <= count:
-            return [b[0] for b in valid_balloons]
+        if len(valid_ids) <= count:
+            return valid_ids.tolist()
         
-        # Greedy farthest-point sampling
-        selected = []
-        remaining = valid_balloons.copy()
-        
-        # Start with the first valid balloon
-        selected.append(remaining.pop(0))
-        
-        while len(selected) < count and remaining:
-            max_min_dist = -1
-            best_idx = 0
-            
-            for i, (idx, lat, lng) in enumerate(remaining):
-                # Find minimum distance to any selected balloon
-                min_dist = float('inf')
-                for sel_idx, sel_lat, sel_lng in selected:
-                    dist = self._haversine_distance(lat, lng, sel_lat, sel_lng)
-                    min_dist = min(min_dist, dist)
-                
-                # Keep track of the balloon with maximum minimum distance
-                if min_dist > max_min_dist:
-                    max_min_dist = min_dist
-                    best_idx = i
-            
-            selected.append(remaining.pop(best_idx))
+        order = self._get_selection_order(snapshot).extend_to(count)
         
-        return [b[0] for b in selected]
+        return valid_ids[order].tolist()
 
     async def get_selected_balloons(self, count: int = 50) -> SelectedBalloons:
         """Get the most spatially distributed balloons with full history."""
-        hourly_data = await self.fetch_all_balloon_data()
+        snapshot = await self.fetch_all_balloon_data()
         
-        if not hourly_data or not hourly_data[0]:
+        if snapshot.total_count == 0:
             return SelectedBalloons(balloons=[], total_count=0)
         
-        total_count = len(hourly_data[0])
-        selected_indices = self._select_distributed_balloons(hourly_data, count)
-        
-        balloons = []
-        for i, idx in enumerate(selected_indices):
-            # Collect all positions for this balloon across 24 hours
-            positions = []
-            for hour, hour_data in enumerate(hourly_data):
-                if idx < len(hour_data):
-                    pos = self._parse_balloon_position(hour_data[idx], hour)
-                    if pos:
-                        positions.append(pos)
+        cache = get_cache("selected")
+        key = f"{snapshot.version}:{count}"
+        selected = cache.get(key)
+        
+        if selected is None:
+            selected_indices = self._select_distributed_balloons(snapshot, count)
             
-            if positions:
-                current = positions[0] if positions else None
-                if current:
-                    balloon = Balloon(
-                        id=idx,
-                        color=BALLOON_COLORS[i % len(BALLOON_COLORS)],
-                        positions=positions,
-                        current=current,
-                    )
+            balloons = []
+            for i, idx in enumerate(selected_indices):
+                balloon = snapshot.balloon(idx, BALLOON_COLORS[i % len(BALLOON_COLORS)])
+                if balloon:
                     balloons.append(balloon)
+            
+            selected = SelectedBalloons(balloons=balloons, total_count=snapshot.total_count)
+            cache[key] = selected
         
-        return SelectedBalloons(balloons=balloons, total_count=total_count)
+        # Callers attach future_positions to the balloons, so hand out shallow copies
+        # rather than the cached objects
+        return SelectedBalloons.model_construct(
+            balloons=[balloon.model_copy() for balloon in selected.balloons],
+            total_count=selected.total_count,
+        )
 
-    async def get_all_balloons_current(self) -> list[BalloonPosition]:
-        """Get current positions of all balloons (for counting in zones)."""
-        hourly_data = await self.fetch_all_balloon_data()
+    async def get_balloon(self, balloon_id: int) -> Optional[Balloon]:
+        """
+        Get a single balloon's 24h history by id.
         
-        if not hourly_data or not hourly_data[0]:
-            return []
+        Balloon ids are column indices into the snapshot, so this is a direct slice
+        rather than a search. Returns None if the balloon has no current position.
+        """
+        snapshot = await self.fetch_all_balloon_data()
         
-        positions = []
-        for idx, pos_data in enumerate(hourly_data[0]):
-            pos = self._parse_balloon_position(pos_data, 0)
-            if pos:
-                positions.append(pos)
+        if not 0 <= balloon_id < snapshot.n_balloons or not snapshot.valid[0, balloon_id]:
+            return None
         
-        return positions
+        return snapshot.balloon(balloon_id, BALLOON_COLORS[balloon_id % len(BALLOON_COLORS)])
+
+    async def get_all_balloons_current(self) -> list[BalloonPosition]:
+        """Get current positions of all balloons (for counting in zones)."""
+        snapshot = await self.fetch_all_balloon_data()
+        return snapshot.current_positions()
 
 
 # Singleton instance
@@ -0,0 +1,40 @@
+import json
+import numpy as np
+from ..models import FireData
+
+# Encodings of /api/fires (format query parameter)
+FIRE_FORMATS = ("json", "columnar", "packed")
+
+# Packed encoding: every lat, then every lng, then every brightness (little-endian)
+PACKED_FIRE_DTYPES = (("lat", "<f4"), ("lng", "<f4"), ("brightness", "<u2"))
+
+FIRE_FIELDS = ("lat", "lng", "brightness", "confidence", "acq_date", "acq_time", "frp")
+
+
+def encode_fires(fire_data: FireData, fmt: str) -> bytes:
+    """
+    Encode FireData for the wire.
+
+    - json: the FireData model as JSON
+    - columnar: JSON with count, regions and one parallel array per Fire field
+    - packed: float32 lat and lng arrays, then a uint16 brightness array
+      (kelvin, rounded) - 10 bytes per fire
+    """
+    if fmt == "json":
+        return fire_data.model_dump_json().encode()
+
+    if fmt == "columnar":
+        columns = {field: [getattr(fire, field) for fire in fire_data.fires] for field in FIRE_FIELDS}
+        return json.dumps(
+            {"count": fire_data.count, "regions": fire_data.regions, **columns}, separators=(",", ":")
+        ).encode()
+
+    if fmt == "packed":
+        values = {
+            "lat": [fire.lat for fire in fire_data.fires],
+            "lng": [fire.lng for fire in fire_data.fires],
+            "brightness": np.clip(np.round([fire.brightness for fire in fire_data.fires]), 0, 65535),
+        }
+        return b"".join(np.asarray(values[field], dtype=dtype).tobytes() for field, dtype in PACKED_FIRE_DTYPES)
+
+    raise ValueError(f"Unknown fire format: {fmt}")
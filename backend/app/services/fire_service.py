@@ -1,113 +1,220 @@
+import asyncio
 import httpx
+import multiprocessing
 import os
-from typing import Optional
-from ..models import Fire, FireData
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+import numpy as np
+from ..models import FireData, FireZone, FireAggregate, FireSourceStats, FireSources
 from ..utils.cache import cache_with_ttl
+from ..utils.conditional import ConditionalFetcher
+from ..utils.geo import GridIndex
+from .fire_encoding import FIRE_FORMATS, encode_fires
+from .fire_store import FIRE_WINDOW_HOURS, RollingFireStore
+from .fire_zones import FIRE_AGGREGATE_RESOLUTIONS, aggregate_fires, cluster_fires, fire_columns
+from .firms_parser import FirmsCsvParser, deduplicate
 
 NASA_FIRMS_BASE_URL = "https://firms.modaps.eosdis.nasa.gov/api/area/csv"
 
 
+# FIRMS products merged into FireData, in dedupe priority order (375 m VIIRS before 1 km MODIS)
+DEFAULT_FIRMS_SOURCES = "VIIRS_SNPP_NRT,VIIRS_NOAA20_NRT,VIIRS_NOAA21_NRT,MODIS_NRT"
+
+# MODIS reports confidence as 0-100; keep detections at or above this
+MIN_NUMERIC_CONFIDENCE = 50
+
+
 class FireService:
     def __init__(self):
         self.client = httpx.AsyncClient(timeout=30.0)
+        self.fetcher = ConditionalFetcher(self.client)
         self.api_key = os.getenv("NASA_FIRMS_API_KEY", "")
+        self.sources = [s.strip() for s in os.getenv("FIRMS_SOURCES", DEFAULT_FIRMS_SOURCES).split(",") if s.strip()]
+        # CSV blocks are parsed in this many worker processes (0 parses in the event loop)
+        self.parse_workers = int(os.getenv("FIRMS_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.source_stats: Optional[FireSources] = None
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self.store = RollingFireStore(float(os.getenv("FIRE_WINDOW_HOURS", str(FIRE_WINDOW_HOURS))))
+        self._merged: Optional[tuple[list[np.ndarray], int]] = None
+        self._derived: dict[str, tuple[FireData, Any]] = {}
 
     async def close(self):
         await self.client.aclose()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
 
     @cache_with_ttl("fires")
     async def get_active_fires(self) -> FireData:
         """Get active wildfires globally from NASA FIRMS.
         
-        Filters to only include significant fires (high confidence, high FRP).
-        """
-        fires = []
-        regions: dict[str, int] = {}
+        Every product in FIRMS_SOURCES is downloaded concurrently and parsed
+        as it streams in, in a worker pool (see FirmsCsvParser). Filters to only
+        include significant fires (high confidence, high FRP), then merges the
+        products, dropping repeat detections of the same fire (see
+        firms_parser.deduplicate). Each download is revalidated with ETag /
+        If-Modified-Since.
         
+        The merged rows feed a rolling store (see RollingFireStore): only
+        detections it has not seen are added, detections older than
+        FIRE_WINDOW_HOURS expire, and the index, zones and aggregates are
+        updated for just those rows. When nothing was added or expired, the
+        previous FireData object is returned.
+        """
         try:
-            # Get fires from VIIRS satellite (global coverage, last 1 day)
-            url = f"{NASA_FIRMS_BASE_URL}/{self.api_key}/VIIRS_SNPP_NRT/world/1"
-            
-            response = await self.client.get(url)
-            
-            if response.status_code == 200:
-                lines = response.text.strip().split("\n")
-                if len(lines) > 1:
-                    # Skip header row
-                    for line in lines[1:]:
-                        fire = self._parse_fire_line(line)
-                        if fire:
-                            fires.append(fire)
-                            # Group by approximate region (10 degree grid for broader regions)
-                            region_key = f"{int(fire.lat / 10) * 10},{int(fire.lng / 10) * 10}"
-                            regions[region_key] = regions.get(region_key, 0) + 1
+            results = await asyncio.gather(*(self._fetch_source(source) for source in self.sources))
+            return self._merge(results)
         except Exception:
-            pass
-        
-        return FireData(fires=fires, count=len(fires), regions=regions)
+            return FireData(fires=[], count=0, regions={})
 
-    def _parse_fire_line(self, line: str) -> Optional[Fire]:
-        """Parse a single line of FIRMS CSV data (VIIRS format).
-        
-        Only returns significant fires (high confidence and high FRP).
-        """
-        # VIIRS format: latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_ti5,frp,daynight
+    async def get_source_stats(self) -> Optional[FireSources]:
+        """Per-source timings and counts of the last refresh."""
+        await self.get_active_fires()
+        return self.source_stats
+
+    async def _fetch_source(self, source: str) -> tuple[Optional[np.ndarray], FireSourceStats]:
+        """Download and parse one FIRMS product (global coverage, last 1 day)."""
+        url = f"{NASA_FIRMS_BASE_URL}/{self.api_key}/{source}/world/1"
+        start = time.perf_counter()
         try:
-            parts = line.split(",")
-            if len(parts) < 13:
-                return None
-            
-            lat = float(parts[0])
-            lng = float(parts[1])
-            brightness = float(parts[2])
-            acq_date = parts[5]
-            acq_time = parts[6]
-            confidence = parts[9] if len(parts) > 9 else "unknown"
-            
-            # FRP (Fire Radiative Power) - higher = larger fire
-            frp = float(parts[12]) if len(parts) > 12 and parts[12] else 0
-            
-            # Validate coordinates
-            if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
-                return None
-            
-            # Only include significant fires:
-            # - High or nominal confidence
-            # - FRP > 10 MW (filters out small agricultural burns)
-            confidence_lower = confidence.lower()
-            if confidence_lower not in ('high', 'h', 'nominal', 'n'):
-                return None
-            
-            if frp < 10:
-                return None
-            
-            return Fire(
-                lat=lat,
-                lng=lng,
-                brightness=brightness,
-                confidence=confidence,
-                acq_date=acq_date,
-                acq_time=acq_time,
-            )
-        except (ValueError, IndexError):
+            (rows, lines, size), modified = await self.fetcher.get(url, self._parse_fires_response, stream=True)
+            error = None
+        except Exception as e:
+            rows, lines, size, modified, error = None, 0, 0, True, str(e)
+        
+        return rows, FireSourceStats(
+            source=source,
+            seconds=round(time.perf_counter() - start, 3),
+            bytes=size if modified else 0,
+            lines=lines,
+            kept=0 if rows is None else len(rows),
+            modified=modified,
+            error=error,
+        )
+
+    async def _parse_fires_response(self, response: httpx.Response) -> tuple[np.ndarray, int, int]:
+        """Parse a streamed FIRMS CSV response chunk by chunk. Returns (rows, lines, bytes)."""
+        parser = FirmsCsvParser(min_numeric_confidence=MIN_NUMERIC_CONFIDENCE, executor=self._executor())
+        if response.status_code != 200:
+            raise RuntimeError(f"FIRMS returned status {response.status_code}")
+        async for chunk in response.aiter_bytes():
+            parser.feed(chunk)
+        rows = await parser.rows()
+        return rows, parser.lines_read, parser.bytes_read
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.parse_workers <= 0:
             return None
+        if self._parse_pool is None:
+            # spawn: forking a process that is running an event loop and HTTP client is unsafe
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._parse_pool
 
-    def is_balloon_over_fire(self, balloon_lat: float, balloon_lng: float, fires: list[Fire], radius_km: float = 50) -> bool:
-        """Check if a balloon is within radius_km of any fire."""
-        import math
+    def _merge(self, results: list[tuple[Optional[np.ndarray], FireSourceStats]]) -> FireData:
+        """Deduplicate the sources' rows and merge them into the rolling store."""
+        start = time.perf_counter()
+        rows_by_source = [rows for rows, _ in results if rows is not None]
         
-        for fire in fires:
-            # Simple distance calculation (approximate for small distances)
-            lat_diff = abs(balloon_lat - fire.lat)
-            lng_diff = abs(balloon_lng - fire.lng)
-            
-            # Rough km conversion (1 degree ≈ 111 km at equator)
-            dist_km = math.sqrt((lat_diff * 111) ** 2 + (lng_diff * 111 * math.cos(math.radians(balloon_lat))) ** 2)
-            
-            if dist_km <= radius_km:
-                return True
+        previous = self._merged
+        if previous and len(previous[0]) == len(rows_by_source) and all(
+            a is b for a, b in zip(previous[0], rows_by_source)
+        ):
+            # No source changed: only expire
+            duplicates = previous[1]
+            added, expired = self.store.update()
+        else:
+            rows, duplicates = deduplicate(rows_by_source)
+            added, expired = self.store.update(rows)
+            self._merged = (rows_by_source, duplicates)
+        fire_data = self.store.fire_data()
         
-        return False
+        self.source_stats = FireSources(
+            sources=[stats for _, stats in results],
+            count=fire_data.count,
+            duplicates=duplicates,
+            added=added,
+            expired=expired,
+            merge_seconds=round(time.perf_counter() - start, 3),
+        )
+        return fire_data
+
+    def _derive(self, name: str, fire_data: FireData, build: Callable[[], Any]) -> Any:
+        """
+        Memoize an artifact derived from fire_data: encodings, and the index,
+        zones and aggregates of a FireData that is not the store's (the store
+        keeps its own up to date).
+        """
+        entry = self._derived.get(name)
+        if entry is None or entry[0] is not fire_data:
+            entry = (fire_data, build())
+            self._derived[name] = entry
+        return entry[1]
+
+    def _fire_columns(self, fire_data: FireData) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._derive("columns", fire_data, lambda: fire_columns(fire_data))
+
+    def get_fire_index(self, fire_data: FireData) -> GridIndex:
+        """Spatial index over fire_data's fires, built once per FireData."""
+        if fire_data is self.store.fire_data():
+            return self.store.index
+        def build() -> GridIndex:
+            lat, lng, _ = self._fire_columns(fire_data)
+            return GridIndex(lat, lng)
+        return self._derive("index", fire_data, build)
+
+    def get_fire_zones(self, fire_data: FireData) -> list[FireZone]:
+        """Fire zones (clusters of adjacent detections), built once per FireData."""
+        if fire_data is self.store.fire_data():
+            return self.store.zones()
+        return self._derive("zones", fire_data, lambda: cluster_fires(*self._fire_columns(fire_data)))
+
+    def get_fire_aggregate(self, fire_data: FireData, resolution: float) -> FireAggregate:
+        """
+        Per-cell fire counts at one of FIRE_AGGREGATE_RESOLUTIONS; every
+        resolution is built together, once per FireData.
+        """
+        if fire_data is self.store.fire_data():
+            return self.store.aggregate(resolution)
+        def build() -> dict[float, FireAggregate]:
+            columns = self._fire_columns(fire_data)
+            return {r: aggregate_fires(*columns, r) for r in FIRE_AGGREGATE_RESOLUTIONS}
+        return self._derive("aggregates", fire_data, build)[resolution]
+
+    def nearest_fires(
+        self, lats: np.ndarray, lngs: np.ndarray, fire_data: FireData, radius_km: float = 50
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        For each point, the position in fire_data.fires of the closest fire
+        within radius_km (great-circle; -1 for none) and its distance in km.
+        """
+        index = self.get_fire_index(fire_data)
+        nearest = [index.nearest(lat, lng, radius_km) for lat, lng in zip(lats.tolist(), lngs.tolist())]
+        ids = np.array([i for i, _ in nearest], dtype=np.int64)
+        distances = np.array([d for _, d in nearest])
+        if index is self.store.index:
+            # The store's index is keyed by slot
+            found = ids >= 0
+            ids[found] = self.store.positions(ids[found])
+        return ids, distances
+
+    def get_encoded_fires(self, fire_data: FireData, fmt: str) -> bytes:
+        """fire_data encoded in one of FIRE_FORMATS (see encode_fires), once per FireData."""
+        return self._derive(f"encoded:{fmt}", fire_data, lambda: encode_fires(fire_data, fmt))
+
+    async def warm_fire_layers(self) -> None:
+        """Build the index, zones, aggregates and encodings for the current fires ahead of requests."""
+        fire_data = await self.get_active_fires()
+        self.get_fire_index(fire_data)
+        self.get_fire_zones(fire_data)
+        self.get_fire_aggregate(fire_data, FIRE_AGGREGATE_RESOLUTIONS[0])
+        for fmt in FIRE_FORMATS:
+            self.get_encoded_fires(fire_data, fmt)
+
+    def is_balloon_over_fire(self, balloon_lat: float, balloon_lng: float, fire_data: FireData, radius_km: float = 50) -> bool:
+        """Check if a balloon is within radius_km (great-circle) of any fire."""
+        return self.get_fire_index(fire_data).any_within(balloon_lat, balloon_lng, radius_km)
 
 
 # Singleton instance
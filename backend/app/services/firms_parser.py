@@ -0,0 +1,334 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Optional, Union
+import numpy as np
+from ..models import FireData
+
+# Parse the streamed CSV in blocks of about this many bytes (whole lines only)
+PARSE_BLOCK_BYTES = 1 << 20
+
+# Confidence labels of significant fires (VIIRS uses l/n/h or low/nominal/high)
+CONFIDENT_LABELS = ("high", "h", "nominal", "n")
+
+# Region histogram cell size (degrees)
+REGION_DEGREES = 10
+
+# Detections from different passes/sensors in the same cell (~1 km) with
+# acquisition times within the window of each other count as one fire
+DEDUPE_CELL_DEGREES = 0.01
+DEDUPE_WINDOW_MINUTES = 60
+
+# Output field -> accepted header names (first match wins). Latitude and
+# longitude are required; other missing columns fall back to FIELD_DEFAULTS.
+FIRMS_COLUMNS = {
+    "lat": ("latitude",),
+    "lng": ("longitude",),
+    "brightness": ("bright_ti4", "brightness"),
+    "acq_date": ("acq_date",),
+    "acq_time": ("acq_time",),
+    "confidence": ("confidence",),
+    "frp": ("frp",),
+}
+
+FIELD_DTYPES = {
+    "lat": "f8",
+    "lng": "f8",
+    "brightness": "f8",
+    "acq_date": "U10",
+    "acq_time": "U4",
+    "confidence": "U16",
+    "frp": "f8",
+}
+
+FIELD_DEFAULTS = {
+    "brightness": 0.0,
+    "acq_date": "",
+    "acq_time": "",
+    "confidence": "unknown",
+    "frp": 0.0,
+}
+
+ROW_DTYPE = np.dtype(list(FIELD_DTYPES.items()))
+
+
+def column_indices(header: str) -> Optional[dict[str, int]]:
+    """Map output fields to CSV column indices, or None without latitude/longitude."""
+    names = [name.strip().lower() for name in header.split(",")]
+    indices = {}
+    for field, candidates in FIRMS_COLUMNS.items():
+        for candidate in candidates:
+            if candidate in names:
+                indices[field] = names.index(candidate)
+                break
+    if "lat" not in indices or "lng" not in indices:
+        return None
+    return indices
+
+
+def _load_rows(lines: list[str], columns: dict[str, int]) -> np.ndarray:
+    fields = list(columns)
+    loaded = np.loadtxt(
+        lines,
+        delimiter=",",
+        usecols=[columns[field] for field in fields],
+        dtype=np.dtype([(field, FIELD_DTYPES[field]) for field in fields]),
+        comments=None,
+        ndmin=1,
+    )
+    rows = np.empty(len(loaded), dtype=ROW_DTYPE)
+    for field in FIELD_DTYPES:
+        rows[field] = loaded[field] if field in columns else FIELD_DEFAULTS[field]
+    return rows
+
+
+def _load_rows_tolerant(lines: list[str], columns: dict[str, int]) -> np.ndarray:
+    """Line-by-line fallback: skips rows without valid coordinates, defaults bad optional values."""
+    parsed = []
+    for line in lines:
+        parts = line.split(",")
+        try:
+            lat = float(parts[columns["lat"]])
+            lng = float(parts[columns["lng"]])
+        except (ValueError, IndexError):
+            continue
+        row = [lat, lng]
+        for field in ("brightness", "acq_date", "acq_time", "confidence", "frp"):
+            value = FIELD_DEFAULTS[field]
+            index = columns.get(field)
+            if index is not None and index < len(parts) and parts[index]:
+                try:
+                    value = float(parts[index]) if FIELD_DTYPES[field] == "f8" else parts[index]
+                except ValueError:
+                    pass
+            row.append(value)
+        parsed.append(tuple(row))
+    return np.array(parsed, dtype=ROW_DTYPE)
+
+
+def _significant(rows: np.ndarray, min_frp: float, min_numeric_confidence: Optional[float]) -> np.ndarray:
+    """
+    Mask of rows to keep: valid coordinates, high or nominal confidence
+    (or a numeric confidence >= min_numeric_confidence), and FRP of at
+    least min_frp MW (filters out small agricultural burns).
+    """
+    lat, lng = rows["lat"], rows["lng"]
+    keep = (lat >= -90) & (lat <= 90) & (lng >= -180) & (lng <= 180)
+
+    confidence = np.char.lower(np.char.strip(rows["confidence"]))
+    confident = np.isin(confidence, CONFIDENT_LABELS)
+    if min_numeric_confidence is not None:
+        numeric = np.char.isdigit(confidence)
+        if numeric.any():
+            values = np.zeros(len(rows))
+            values[numeric] = confidence[numeric].astype(np.float64)
+            confident |= numeric & (values >= min_numeric_confidence)
+
+    return keep & confident & (rows["frp"] >= min_frp)
+
+
+def parse_block(
+    block: bytes, columns: dict[str, int], min_frp: float, min_numeric_confidence: Optional[float]
+) -> tuple[np.ndarray, int]:
+    """
+    Parse a block of complete CSV data lines (no header) and filter it.
+
+    Returns the significant rows and the number of lines read. A module-level
+    function, so blocks can be parsed in a process pool.
+    """
+    lines = block.decode("utf-8", errors="replace").splitlines()
+    if not lines:
+        return np.empty(0, dtype=ROW_DTYPE), 0
+    try:
+        rows = _load_rows(lines, columns)
+    except ValueError:
+        rows = _load_rows_tolerant(lines, columns)
+    return rows[_significant(rows, min_frp, min_numeric_confidence)], len(lines)
+
+
+def acquisition_minutes(rows: np.ndarray) -> np.ndarray:
+    """Acquisition time in minutes since the epoch (NaN where the date is missing or invalid)."""
+    days = np.full(len(rows), np.nan)
+    try:
+        dates = rows["acq_date"].astype("datetime64[D]")
+    except ValueError:
+        dates = np.array([_to_date(value) for value in rows["acq_date"].tolist()], dtype="datetime64[D]")
+    valid = ~np.isnat(dates)
+    days[valid] = dates[valid].astype(np.int64)
+
+    hhmm = np.zeros(len(rows))
+    times = np.char.strip(rows["acq_time"])
+    digits = np.char.isdigit(times)
+    hhmm[digits] = times[digits].astype(np.float64)
+    return days * 1440 + (hhmm // 100) * 60 + hhmm % 100
+
+
+def _to_date(value: str) -> np.datetime64:
+    try:
+        return np.datetime64(value, "D")
+    except ValueError:
+        return np.datetime64("NaT")
+
+
+def dedupe_cells(rows: np.ndarray, cell_degrees: float = DEDUPE_CELL_DEGREES) -> np.ndarray:
+    """Flat code of every row's `cell_degrees` dedupe cell."""
+    n_cols = int(round(360 / cell_degrees))
+    return (
+        np.floor((rows["lat"] + 90) / cell_degrees).astype(np.int64) * n_cols
+        + np.floor(((rows["lng"] + 180) % 360) / cell_degrees).astype(np.int64) % n_cols
+    )
+
+
+def deduplicate_indices(
+    rows_by_source: list[np.ndarray],
+    cell_degrees: float = DEDUPE_CELL_DEGREES,
+    window_minutes: float = DEDUPE_WINDOW_MINUTES,
+) -> np.ndarray:
+    """
+    Positions (in the concatenated sources, ascending) of the rows that
+    deduplicate keeps.
+    """
+    rows = np.concatenate(rows_by_source) if rows_by_source else np.empty(0, dtype=ROW_DTYPE)
+    if len(rows) < 2:
+        return np.arange(len(rows))
+    priority = np.concatenate([np.full(len(source), i) for i, source in enumerate(rows_by_source)])
+
+    cell = dedupe_cells(rows, cell_degrees)
+    minutes = acquisition_minutes(rows)
+    order = np.lexsort((priority, minutes, cell))
+    cell, minutes = cell[order], minutes[order]
+
+    # A new group starts at a new cell, a gap longer than the window, or an unknown time
+    starts = np.ones(len(rows), dtype=bool)
+    starts[1:] = (
+        (cell[1:] != cell[:-1])
+        | ~(minutes[1:] - minutes[:-1] <= window_minutes)
+        | np.isnan(minutes[:-1])
+    )
+    group = np.cumsum(starts) - 1
+
+    # Within each group keep the highest-priority source, then the earliest detection
+    best = np.lexsort((minutes, priority[order], group))
+    first = np.ones(len(best), dtype=bool)
+    first[1:] = group[best][1:] != group[best][:-1]
+    return np.sort(order[best[first]])
+
+
+def deduplicate(
+    rows_by_source: list[np.ndarray],
+    cell_degrees: float = DEDUPE_CELL_DEGREES,
+    window_minutes: float = DEDUPE_WINDOW_MINUTES,
+) -> tuple[np.ndarray, int]:
+    """
+    Merge detections from several sources (listed in priority order) into one set.
+
+    Rows are hashed by their `cell_degrees` grid cell and sorted by time within
+    each cell. Consecutive detections in a cell no more than `window_minutes`
+    apart form one group, and each group keeps a single row: the one from the
+    highest-priority source (earliest on ties). Rows without a valid
+    acquisition time are never merged. Returns the rows and the number dropped.
+    """
+    rows = np.concatenate(rows_by_source) if rows_by_source else np.empty(0, dtype=ROW_DTYPE)
+    keep = deduplicate_indices(rows_by_source, cell_degrees, window_minutes)
+    return rows[keep], len(rows) - len(keep)
+
+
+def fire_regions(lat: np.ndarray, lng: np.ndarray) -> dict[str, int]:
+    """Fire counts per REGION_DEGREES cell, keyed "lat,lng" (truncated toward zero), in first-seen order."""
+    if not len(lat):
+        return {}
+    cells = np.stack([
+        np.trunc(lat / REGION_DEGREES).astype(np.int64) * REGION_DEGREES,
+        np.trunc(lng / REGION_DEGREES).astype(np.int64) * REGION_DEGREES,
+    ], axis=1)
+    unique, first, counts = np.unique(cells, axis=0, return_index=True, return_counts=True)
+    order = np.argsort(first)
+    return {f"{cell_lat},{cell_lng}": int(count) for (cell_lat, cell_lng), count in zip(unique[order].tolist(), counts[order])}
+
+
+def fire_data_from_rows(rows: np.ndarray) -> FireData:
+    """Build FireData (fires and the region histogram) from parsed rows."""
+    # Validating plain dicts in one call is much faster than constructing each Fire
+    fields = ("lat", "lng", "brightness", "confidence", "acq_date", "acq_time", "frp")
+    fires = [dict(zip(fields, row)) for row in zip(*(rows[field].tolist() for field in fields))]
+    return FireData.model_validate({
+        "fires": fires,
+        "count": len(fires),
+        "regions": fire_regions(rows["lat"], rows["lng"]),
+    })
+
+
+class FirmsCsvParser:
+    """
+    Incremental FIRMS CSV parser: feed it the body in chunks as it downloads.
+
+    Complete lines are parsed a block at a time (see parse_block) into NumPy
+    columns with np.loadtxt, the coordinate, confidence and FRP filters run
+    on whole columns, and only the surviving rows are kept. With an
+    `executor`, blocks are parsed in its workers while the download
+    continues. Fire objects are built for the survivors only, once.
+    """
+
+    def __init__(
+        self,
+        min_frp: float = 10.0,
+        min_numeric_confidence: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.min_frp = min_frp
+        # MODIS reports confidence as 0-100; None rejects numeric confidences
+        self.min_numeric_confidence = min_numeric_confidence
+        self.executor = executor
+        self.header: Optional[str] = None
+        self.columns: Optional[dict[str, int]] = None
+        self.lines_read = 0
+        self.bytes_read = 0
+        self._buffer = bytearray()
+        self._blocks: list[Union[tuple[np.ndarray, int], asyncio.Future]] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self.bytes_read += len(chunk)
+        self._buffer += chunk
+        if self.header is None:
+            end = self._buffer.find(b"\n") + 1
+            if not end:
+                return
+            self.header = self._buffer[:end].decode("utf-8", errors="replace").strip()
+            self.columns = column_indices(self.header)
+            del self._buffer[:end]
+        if len(self._buffer) >= PARSE_BLOCK_BYTES:
+            end = self._buffer.rfind(b"\n") + 1
+            if end:
+                self._submit(bytes(self._buffer[:end]))
+                del self._buffer[:end]
+
+    async def rows(self) -> np.ndarray:
+        """Parse any buffered tail, wait for pending blocks and return the kept rows."""
+        if self.header is None and self._buffer:
+            # A body without a newline is only a header (or an error message)
+            self.header = self._buffer.decode("utf-8", errors="replace").strip()
+            self.columns = column_indices(self.header)
+            self._buffer.clear()
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+
+        kept = []
+        for block in self._blocks:
+            rows, lines = await block if isinstance(block, asyncio.Future) else block
+            kept.append(rows)
+            self.lines_read += lines
+        self._blocks = []
+        return np.concatenate(kept) if kept else np.empty(0, dtype=ROW_DTYPE)
+
+    async def finish(self) -> FireData:
+        """Build the FireData for the kept rows."""
+        return fire_data_from_rows(await self.rows())
+
+    def _submit(self, block: bytes) -> None:
+        if not self.columns:
+            return
+        args = (block, self.columns, self.min_frp, self.min_numeric_confidence)
+        if self.executor is None:
+            self._blocks.append(parse_block(*args))
+        else:
+            self._blocks.append(asyncio.get_running_loop().run_in_executor(self.executor, parse_block, *args))
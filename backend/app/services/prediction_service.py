@@ -1,7 +1,48 @@
+import asyncio
 import math
 from typing import Optional
-from ..models import Balloon, BalloonPosition, WindData
+import numpy as np
+from ..models import Balloon, BalloonPosition, BalloonForecast, ForecastPoint
+from ..utils.cache import cache_with_ttl
+from .balloon_service import get_balloon_service
+from .balloon_snapshot import BalloonSnapshot
+from .trajectory import advect, ensemble_perturbations, ensemble_spread, integration_cost
 from .weather_service import get_weather_service
+from .wind_field import WindVolume, altitude_to_pressure
+
+# Ensemble perturbations (see trajectory.ensemble_perturbations)
+ENSEMBLE_SPEED_SPREAD = 0.15    # Relative wind speed error
+ENSEMBLE_WIND_NOISE_MS = 2.0    # Additive u/v error (m/s)
+ENSEMBLE_PRESSURE_SPREAD = 0.1  # Log-pressure (altitude) uncertainty
+
+# Uncertainty cone radius: this percentile of member distances from the ensemble mean
+CONE_PERCENTILE = 90
+
+DEFAULT_FORECAST_HOURS = [6, 12, 24]
+MAX_FORECAST_HOURS = 72
+MAX_ENSEMBLE_MEMBERS = 200
+
+# Most wind samples (balloons x members x substeps x stages) one forecast request
+# may integrate: about 2 s of CPU, so no request can monopolize a worker
+MAX_FORECAST_WIND_SAMPLES = 10_000_000
+
+# Ensemble size for the precomputed whole-fleet forecast
+FLEET_FORECAST_MEMBERS = 20
+
+
+def forecast_cost(balloons: int, members: int, hours_ahead: list[float], step_minutes: float, method: str) -> int:
+    """Wind samples an ensemble forecast integrates (compare with MAX_FORECAST_WIND_SAMPLES)."""
+    return integration_cost(balloons * members, hours_ahead, step_minutes, method)
+
+
+def parse_forecast_hours(hours: str) -> list[float]:
+    """Parse comma-separated forecast horizons, keeping those in (0, MAX_FORECAST_HOURS]."""
+    try:
+        parsed = [float(h.strip()) for h in hours.split(",") if h.strip()]
+    except ValueError:
+        return list(DEFAULT_FORECAST_HOURS)
+    parsed = [h for h in parsed if 0 < h <= MAX_FORECAST_HOURS]
+    return parsed or list(DEFAULT_FORECAST_HOURS)
 
 
 class PredictionService:
@@ -17,10 +58,170 @@ class PredictionService:
         Predict future balloon positions using trajectory momentum and wind data.
         Uses 60% trajectory momentum + 40% wind influence.
         """
-        positions = balloon.positions
-        if len(positions) < 2:
+        return (await self.predict_many([balloon], hours_ahead))[0]
+
+    async def predict_many(
+        self,
+        balloons: list[Balloon],
+        hours_ahead: list[int] = [5, 10]
+    ) -> list[list[BalloonPosition]]:
+        """
+        Predict future positions for many balloons at once.
+        
+        Wind at every balloon's current position and altitude is sampled in one
+        vectorized call from the in-memory wind volume (built once per wind
+        window), so no per-balloon weather requests are made.
+        Returns one list of predicted positions per balloon, in input order.
+        """
+        predictable = [i for i, balloon in enumerate(balloons) if len(balloon.positions) >= 2]
+        forecasts: list[list[BalloonPosition]] = [[] for _ in balloons]
+        if not predictable:
+            return forecasts
+        
+        winds = await self._get_winds_at_positions(
+            [balloons[i].current.lat for i in predictable],
+            [balloons[i].current.lng for i in predictable],
+            [balloons[i].current.altitude for i in predictable],
+        )
+        
+        for i, wind in zip(predictable, winds):
+            forecasts[i] = self._forecast(balloons[i], wind, hours_ahead)
+        
+        return forecasts
+
+    async def forecast_ensemble(
+        self,
+        balloons: list[Balloon],
+        hours_ahead: list[float],
+        members: int = 50,
+        step_minutes: float = 30,
+        method: str = "rk2",
+        include_members: bool = False,
+    ) -> list[BalloonForecast]:
+        """
+        Forecast tracks with uncertainty cones by advecting an ensemble through
+        the wind volume.
+        
+        Every balloon x member parcel is integrated together (see trajectory.advect)
+        from its current position at its current altitude. Member 0 is the
+        unperturbed control run; the rest perturb wind and altitude. Perturbations
+        are seeded from the wind data's timestamp, so repeated requests within a
+        wind refresh return the same cones. The integration runs in a worker
+        thread so it does not block the event loop.
+        """
+        if not balloons:
             return []
         
+        volume = await self.weather_service.get_wind_volume()
+        return await asyncio.to_thread(
+            self._forecast_ensemble,
+            volume,
+            [b.id for b in balloons],
+            np.array([b.current.lat for b in balloons]),
+            np.array([b.current.lng for b in balloons]),
+            np.array([np.nan if b.current.altitude is None else b.current.altitude for b in balloons]),
+            hours_ahead, members, step_minutes, method, include_members,
+        )
+
+    async def get_fleet_forecast(
+        self, snapshot: BalloonSnapshot, hours_ahead: list[float]
+    ) -> list[BalloonForecast]:
+        """
+        Forecast every balloon with a current position in a snapshot.
+        
+        The result is a per-snapshot artifact: it is computed once per snapshot
+        version, wind refresh and horizon set, then served from the "forecasts"
+        cache. Horizons are deduplicated and sorted, so "12,6" and "6,12" share
+        one artifact.
+        """
+        volume = await self.weather_service.get_wind_volume()
+        return await self._forecast_fleet(snapshot, volume, tuple(sorted(set(hours_ahead))))
+
+    async def warm_fleet_forecast(self) -> None:
+        """Compute the default fleet forecast for the current snapshot ahead of requests."""
+        snapshot = await get_balloon_service().fetch_all_balloon_data()
+        await self.get_fleet_forecast(snapshot, DEFAULT_FORECAST_HOURS)
+
+    @cache_with_ttl("forecasts")
+    async def _forecast_fleet(
+        self, snapshot: BalloonSnapshot, volume: WindVolume, hours_ahead: tuple[float, ...]
+    ) -> list[BalloonForecast]:
+        ids = snapshot.current_indices()
+        return await asyncio.to_thread(
+            self._forecast_ensemble,
+            volume, ids.tolist(), snapshot.lat[0, ids], snapshot.lng[0, ids], snapshot.alt[0, ids],
+            list(hours_ahead), FLEET_FORECAST_MEMBERS, 30, "rk2", False,
+        )
+
+    def _forecast_ensemble(
+        self,
+        volume: WindVolume,
+        ids: list[int],
+        lat: np.ndarray,
+        lng: np.ndarray,
+        altitude: np.ndarray,
+        hours_ahead: list[float],
+        members: int,
+        step_minutes: float,
+        method: str,
+        include_members: bool,
+    ) -> list[BalloonForecast]:
+        """Run the ensemble for balloons given as arrays (altitude in km, NaN if unknown)."""
+        if not ids:
+            return []
+        
+        rng = np.random.default_rng(volume.timestamp)
+        perturbations = ensemble_perturbations(
+            members, len(ids), rng,
+            ENSEMBLE_SPEED_SPREAD, ENSEMBLE_WIND_NOISE_MS, ENSEMBLE_PRESSURE_SPREAD,
+        )
+        
+        # Shapes: (horizons, members, balloons)
+        member_lat, member_lng = advect(
+            volume, lat, lng, self._pressures(altitude) * perturbations["pressure_factor"],
+            hours_ahead, step_minutes=step_minutes, method=method,
+            wind_scale=perturbations["wind_scale"],
+            wind_bias_u=perturbations["wind_bias_u"],
+            wind_bias_v=perturbations["wind_bias_v"],
+        )
+        mean_lat, mean_lng, radius = ensemble_spread(member_lat, member_lng, CONE_PERCENTILE)
+        
+        mean_lat, mean_lng, radius = (np.round(a, 4).tolist() for a in (mean_lat, mean_lng, radius))
+        if include_members:
+            # (balloons, members, horizons, 2)
+            member_tracks = np.round(np.stack([member_lat, member_lng], axis=-1).transpose(2, 1, 0, 3), 4).tolist()
+        
+        forecasts = []
+        for b, balloon_id in enumerate(ids):
+            track = [
+                ForecastPoint.model_construct(
+                    hours_ahead=hours, lat=mean_lat[h][b], lng=mean_lng[h][b], radius_km=radius[h][b]
+                )
+                for h, hours in enumerate(hours_ahead)
+            ]
+            forecasts.append(BalloonForecast.model_construct(
+                id=balloon_id,
+                track=track,
+                members=member_tracks[b] if include_members else None,
+            ))
+        return forecasts
+
+    def _pressures(self, altitudes) -> np.ndarray:
+        """Pressure (hPa) at each altitude (km); missing altitudes (None/NaN) use the 2D field's level."""
+        altitudes = np.array([np.nan if a is None else a for a in altitudes], dtype=np.float64)
+        return np.where(
+            np.isnan(altitudes), self.weather_service.wind_level, altitude_to_pressure(np.nan_to_num(altitudes))
+        )
+
+    def _forecast(
+        self,
+        balloon: Balloon,
+        wind: Optional[tuple[float, float]],
+        hours_ahead: list[int]
+    ) -> list[BalloonPosition]:
+        """Blend trajectory extrapolation (60%) with wind drift (40%) for each horizon."""
+        positions = balloon.positions
+        
         # Calculate average velocity from recent positions (last 6 hours or available)
         recent_positions = [p for p in positions if p.hours_ago <= 6]
         if len(recent_positions) < 2:
@@ -45,10 +246,7 @@ class PredictionService:
             lat_velocity = 0
             lng_velocity = 0
         
-        # Get wind data at current position
         current = balloon.current
-        wind = await self._get_wind_at_position(current.lat, current.lng)
-        
         future_positions = []
         
         for hours in hours_ahead:
@@ -59,7 +257,7 @@ class PredictionService:
             # Calculate wind-based displacement
             if wind:
                 wind_lat_disp, wind_lng_disp = self._wind_to_displacement(
-                    wind.speed, wind.direction, hours, current.lat
+                    wind[0], wind[1], hours, current.lat
                 )
             else:
                 wind_lat_disp = 0
@@ -82,40 +280,41 @@ class PredictionService:
         
         return future_positions
 
-    async def _get_wind_at_position(self, lat: float, lng: float) -> Optional[WindData]:
-        """Get wind data at a specific position."""
-        weather = await self.weather_service.get_weather_at_location(lat, lng)
-        if weather:
-            return WindData(
-                lat=lat,
-                lng=lng,
-                speed=weather.wind_speed,
-                direction=weather.wind_direction,
-            )
-        return None
+    async def _get_winds_at_positions(
+        self, lats: list[float], lngs: list[float], altitudes: list[Optional[float]]
+    ) -> list[Optional[tuple[float, float]]]:
+        """
+        Get (u, v) wind components at many positions and altitudes (km), or None
+        where unavailable. Positions without an altitude use the 2D field's level.
+        """
+        try:
+            volume = await self.weather_service.get_wind_volume()
+        except Exception as e:
+            print(f"Error loading wind field: {e}")
+            return [None] * len(lats)
+        
+        u, v = volume.sample(lats, lngs, self._pressures(altitudes))
+        return [
+            (eastward, northward) if math.isfinite(eastward) and math.isfinite(northward) else None
+            for eastward, northward in zip(u.tolist(), v.tolist())
+        ]
 
     def _wind_to_displacement(
         self, 
-        speed_ms: float, 
-        direction_deg: float, 
+        u_ms: float, 
+        v_ms: float, 
         hours: float,
         lat: float
     ) -> tuple[float, float]:
         """
-        Convert wind speed and direction to lat/lng displacement.
-        Wind direction is where wind is coming FROM (meteorological convention).
+        Convert eastward (u) and northward (v) wind components in m/s to
+        lat/lng displacement in degrees.
         """
-        # Convert to radians and adjust for "coming from" to "going to"
-        direction_rad = math.radians((direction_deg + 180) % 360)
-        
-        # Distance traveled in km
-        distance_km = speed_ms * 3.6 * hours  # m/s to km/h, then multiply by hours
-        
-        # Convert to degrees
         # 1 degree latitude ≈ 111 km
         # 1 degree longitude ≈ 111 km * cos(latitude)
-        lat_displacement = (distance_km * math.cos(direction_rad)) / 111
-        lng_displacement = (distance_km * math.sin(direction_rad)) / (111 * math.cos(math.radians(lat)))
+        km_per_ms = 3.6 * hours  # m/s to km/h, then multiply by hours
+        lat_displacement = (v_ms * km_per_ms) / 111
+        lng_displacement = (u_ms * km_per_ms) / (111 * math.cos(math.radians(lat)))
         
         return lat_displacement, lng_displacement
 
@@ -1,7 +1,10 @@
 import httpx
 from typing import Optional
+import numpy as np
 from ..models import Storm, StormData
 from ..utils.cache import cache_with_ttl
+from ..utils.conditional import ConditionalFetcher
+from ..utils.geo import haversine_km, points_in_polygon
 
 # NOAA National Weather Service API (no key required)
 NOAA_ALERTS_URL = "https://api.weather.gov/alerts/active"
@@ -10,6 +13,7 @@ NOAA_ALERTS_URL = "https://api.weather.gov/alerts/active"
 class StormService:
     def __init__(self):
         self.client = httpx.AsyncClient(timeout=30.0)
+        self.fetcher = ConditionalFetcher(self.client)
 
     async def close(self):
         await self.client.aclose()
@@ -20,10 +24,10 @@ class StormService:
         
         Note: NOAA only provides US data. Only storms with valid geometry are included
         for accurate map display.
-        """
-        storms = []
-        regions: dict[str, int] = {}
         
+        The request is revalidated with ETag / If-Modified-Since, so an unchanged
+        alert feed (304) reuses the previously parsed StormData.
+        """
         try:
             headers = {
                 "User-Agent": "SkyDrift Balloon Tracker (contact@example.com)",
@@ -37,22 +41,30 @@ class StormService:
                 "severity": "Severe,Extreme",
             }
             
-            response = await self.client.get(NOAA_ALERTS_URL, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                features = data.get("features", [])
-                
-                for feature in features:
-                    storm = self._parse_storm_feature(feature)
-                    # Only include storms with valid location data
-                    if storm and (storm.lat != 0 or storm.lng != 0):
-                        storms.append(storm)
-                        # Group by event type
-                        event_type = feature.get("properties", {}).get("event", "Unknown")
-                        regions[event_type] = regions.get(event_type, 0) + 1
+            storm_data, _ = await self.fetcher.get(
+                NOAA_ALERTS_URL, self._parse_alerts_response, params=params, headers=headers
+            )
+            return storm_data
         except Exception:
-            pass
+            return StormData(storms=[], count=0, regions={})
+
+    def _parse_alerts_response(self, response: httpx.Response) -> StormData:
+        """Parse a NOAA alerts response into StormData."""
+        storms = []
+        regions: dict[str, int] = {}
+        
+        if response.status_code == 200:
+            data = response.json()
+            features = data.get("features", [])
+            
+            for feature in features:
+                storm = self._parse_storm_feature(feature)
+                # Only include storms with valid location data
+                if storm and (storm.lat != 0 or storm.lng != 0):
+                    storms.append(storm)
+                    # Group by event type
+                    event_type = feature.get("properties", {}).get("event", "Unknown")
+                    regions[event_type] = regions.get(event_type, 0) + 1
         
         return StormData(storms=storms, count=len(storms), regions=regions)
 
@@ -130,6 +142,29 @@ class StormService:
         
         return None
 
+    def storms_at(self, lats: np.ndarray, lngs: np.ndarray, storms: list[Storm], radius_km: float = 100) -> np.ndarray:
+        """
+        is_balloon_in_storm for many points at once: the index in `storms` of
+        the first storm containing each point (-1 for none). Each polygon is
+        only tested against the points in its bounding box; the radius check
+        uses great-circle distance.
+        """
+        found = np.full(len(lats), -1)
+        for i, storm in enumerate(storms):
+            unmatched = found < 0
+            if storm.polygon:
+                ring = np.asarray(storm.polygon, dtype=np.float64)
+                in_box = np.flatnonzero(
+                    unmatched
+                    & (lats >= ring[:, 1].min()) & (lats <= ring[:, 1].max())
+                    & (lngs >= ring[:, 0].min()) & (lngs <= ring[:, 0].max())
+                )
+                hits = in_box[points_in_polygon(lats[in_box], lngs[in_box], storm.polygon)]
+            else:
+                hits = np.flatnonzero(unmatched & (haversine_km(lats, lngs, storm.lat, storm.lng) <= radius_km))
+            found[hits] = i
+        return found
+
     def _point_in_polygon(self, lat: float, lng: float, polygon: list[list[float]]) -> bool:
         """Check if a point is inside a polygon using ray casting algorithm."""
         n = len(polygon)
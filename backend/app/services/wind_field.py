@@ -0,0 +1,214 @@
+import math
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+
+
+def wind_to_uv(speed, direction) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert wind speed (m/s) and meteorological direction (degrees the wind blows
+    FROM) into eastward (u) and northward (v) components.
+    """
+    direction_rad = np.radians(direction)
+    return -np.multiply(speed, np.sin(direction_rad)), -np.multiply(speed, np.cos(direction_rad))
+
+
+def uv_to_wind(u, v) -> tuple[np.ndarray, np.ndarray]:
+    """Convert u/v components back to speed (m/s) and meteorological direction (degrees)."""
+    speed = np.hypot(u, v)
+    direction = (np.degrees(np.arctan2(-np.asarray(u), -np.asarray(v))) + 360) % 360
+    return speed, direction
+
+
+def altitude_to_pressure(altitude_km) -> np.ndarray:
+    """
+    Pressure (hPa) at an altitude (km, as reported by Windborne) in the
+    International Standard Atmosphere, valid up to ~32 km.
+    """
+    h = np.asarray(altitude_km, dtype=np.float64) * 1000
+    troposphere = 1013.25 * np.power(1 - 2.25577e-5 * np.minimum(h, 11000), 5.25588)
+    tropopause = 226.321 * np.exp(-(np.clip(h, 11000, 20000) - 11000) / 6341.62)
+    stratosphere = 54.7489 * np.power(1 + (np.maximum(h, 20000) - 20000) / 216650, -34.1632)
+    return np.select([h <= 11000, h <= 20000], [troposphere, tropopause], default=stratosphere)
+
+
+def _wraps(lngs: np.ndarray) -> bool:
+    """Whether an evenly spaced longitude axis covers the full circle."""
+    if len(lngs) < 2:
+        return False
+    step = lngs[1] - lngs[0]
+    return math.isclose(len(lngs) * step, 360)
+
+
+def _axis_weights(x: np.ndarray, axis: np.ndarray, wrap: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lower/upper grid indices and the interpolation weight along one evenly spaced axis."""
+    n = len(axis)
+    if n == 1:
+        zeros = np.zeros(x.shape, dtype=np.intp)
+        return zeros, zeros, np.zeros(x.shape)
+
+    step = axis[1] - axis[0]
+    position = (x - axis[0]) / step
+    if wrap:
+        position = np.mod(position, n)
+    else:
+        position = np.clip(position, 0, n - 1)
+
+    lower = np.floor(position).astype(np.intp)
+    weight = position - lower
+    if wrap:
+        lower %= n
+        upper = (lower + 1) % n
+    else:
+        lower = np.minimum(lower, n - 1)
+        upper = np.minimum(lower + 1, n - 1)
+    return lower, upper, weight
+
+
+@dataclass(frozen=True)
+class WindField:
+    """
+    Wind on a regular lat/lng grid, as u/v components in m/s.
+
+    `lats` and `lngs` are ascending and evenly spaced; `u` and `v` are shaped
+    (len(lats), len(lngs)). If the longitudes span the full circle, sampling
+    wraps across the antimeridian. Latitudes outside the grid are clamped to
+    its edge rows.
+    """
+    lats: np.ndarray
+    lngs: np.ndarray
+    u: np.ndarray
+    v: np.ndarray
+    timestamp: int
+
+    @property
+    def wraps(self) -> bool:
+        """Whether the longitude axis covers the full circle."""
+        return _wraps(self.lngs)
+
+    def sample(self, lat, lng) -> tuple[np.ndarray, np.ndarray]:
+        """Bilinearly interpolate u/v at arbitrary points (array-like, any shape)."""
+        lat = np.asarray(lat, dtype=np.float64)
+        lng = np.asarray(lng, dtype=np.float64)
+
+        i0, i1, wi = _axis_weights(lat, self.lats, wrap=False)
+        j0, j1, wj = _axis_weights(lng, self.lngs, wrap=self.wraps)
+
+        def interpolate(values: np.ndarray) -> np.ndarray:
+            top = values[i0, j0] * (1 - wj) + values[i0, j1] * wj
+            bottom = values[i1, j0] * (1 - wj) + values[i1, j1] * wj
+            return top * (1 - wi) + bottom * wi
+
+        return interpolate(self.u), interpolate(self.v)
+
+    def downsampled(self) -> "WindField":
+        """
+        Halve the resolution by averaging 2x2 blocks, so the coarse field still
+        covers the full grid. A trailing odd row or column is paired with a
+        copy of itself, one step further out; an even longitude count keeps
+        the full-circle wrap.
+        """
+        pad_rows, pad_cols = len(self.lats) % 2, len(self.lngs) % 2
+
+        def extend(axis: np.ndarray, pad: int) -> np.ndarray:
+            if not pad:
+                return axis
+            step = axis[1] - axis[0] if len(axis) > 1 else 0.0
+            return np.append(axis, axis[-1] + step)
+
+        def pool(values: np.ndarray) -> np.ndarray:
+            values = np.pad(values, ((0, pad_rows), (0, pad_cols)), mode="edge")
+            rows, cols = values.shape
+            return values.reshape(rows // 2, 2, cols // 2, 2).mean(axis=(1, 3))
+
+        return WindField(
+            lats=extend(self.lats, pad_rows).reshape(-1, 2).mean(axis=1),
+            lngs=extend(self.lngs, pad_cols).reshape(-1, 2).mean(axis=1),
+            u=pool(self.u),
+            v=pool(self.v),
+            timestamp=self.timestamp,
+        )
+
+
+@dataclass(frozen=True)
+class WindVolume:
+    """
+    Wind on pressure levels over a regular lat/lng grid, as u/v in m/s.
+
+    `u` and `v` are shaped (len(levels), len(lats), len(lngs)); `levels` are
+    pressures in hPa in any strictly monotonic order. Vertical interpolation
+    is linear in log-pressure (roughly linear in height); pressures outside
+    the stored levels are clamped to the nearest one.
+    """
+    levels: np.ndarray
+    lats: np.ndarray
+    lngs: np.ndarray
+    u: np.ndarray
+    v: np.ndarray
+    timestamp: int
+
+    def __repr__(self) -> str:
+        # Compact and unique per wind refresh, so cache_with_ttl can key on it
+        return f"WindVolume(timestamp={self.timestamp}, shape={self.u.shape})"
+
+    def level_field(self, level_hpa: float) -> WindField:
+        """The 2D field at the stored level closest to `level_hpa`."""
+        index = int(np.argmin(np.abs(self.levels - level_hpa))) if len(self.levels) > 1 else 0
+        return WindField(
+            lats=self.lats, lngs=self.lngs, u=self.u[index], v=self.v[index], timestamp=self.timestamp
+        )
+
+    def sample(self, lat, lng, pressure) -> tuple[np.ndarray, np.ndarray]:
+        """Trilinearly interpolate u/v at arbitrary points and pressures (hPa)."""
+        return self.level_sampler(pressure)(lat, lng)
+
+    def level_sampler(self, pressure) -> Callable[..., tuple[np.ndarray, np.ndarray]]:
+        """
+        Build a sampler `(lat, lng) -> (u, v)` for points held at fixed pressures.
+
+        The vertical weights are computed once, so repeatedly sampling moving
+        points (e.g. advected balloons) only pays for the horizontal part.
+        `lat`/`lng` must broadcast against `pressure`.
+        """
+        pressure = np.asarray(pressure, dtype=np.float64)
+        k0, k1, wk = self._level_weights(pressure)
+        n_lat, n_lng = len(self.lats), len(self.lngs)
+        # Gather from flat views with precomputed level offsets (much faster than 3D fancy indexing)
+        base0, base1 = k0 * (n_lat * n_lng), k1 * (n_lat * n_lng)
+        u_flat, v_flat = self.u.reshape(-1), self.v.reshape(-1)
+        wraps = _wraps(self.lngs)
+
+        def sample(lat, lng) -> tuple[np.ndarray, np.ndarray]:
+            i0, i1, wi = _axis_weights(np.asarray(lat, dtype=np.float64), self.lats, wrap=False)
+            j0, j1, wj = _axis_weights(np.asarray(lng, dtype=np.float64), self.lngs, wrap=wraps)
+            row0, row1 = i0 * n_lng, i1 * n_lng
+            corners = (row0 + j0, row0 + j1, row1 + j0, row1 + j1)
+            top, bottom = 1 - wi, wi
+            corner_weights = (top * (1 - wj), top * wj, bottom * (1 - wj), bottom * wj)
+
+            # The 8 surrounding grid points and their trilinear weights, shared by u and v
+            indices = [base + corner for base in (base0, base1) for corner in corners]
+            weights = [weight * level for level in (1 - wk, wk) for weight in corner_weights]
+
+            def interpolate(flat: np.ndarray) -> np.ndarray:
+                total = flat.take(indices[0]) * weights[0]
+                for index, weight in zip(indices[1:], weights[1:]):
+                    total += flat.take(index) * weight
+                return total
+
+            return interpolate(u_flat), interpolate(v_flat)
+
+        return sample
+
+    def _level_weights(self, pressure: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Lower/upper level indices and weight in log-pressure for each point."""
+        n = len(self.levels)
+        if n == 1:
+            zeros = np.zeros(pressure.shape, dtype=np.intp)
+            return zeros, zeros, np.zeros(pressure.shape)
+
+        order = np.argsort(self.levels)
+        position = np.interp(np.log(pressure), np.log(self.levels[order]), np.arange(n))
+        lower = np.minimum(np.floor(position).astype(np.intp), n - 1)
+        upper = np.minimum(lower + 1, n - 1)
+        return order[lower], order[upper], position - lower
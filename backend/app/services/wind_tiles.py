@@ -0,0 +1,102 @@
+import math
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+from cachetools import LRUCache
+from ..models import WindTile
+from .wind_field import WindField
+
+# Samples per tile edge (each tile is WIND_TILE_SIZE x WIND_TILE_SIZE points)
+WIND_TILE_SIZE = 16
+
+# Beyond this zoom the samples are far finer than any wind grid we build
+MAX_WIND_TILE_ZOOM = 8
+
+# Binary tile encodings: format name -> little-endian dtype
+WIND_TILE_DTYPES = {"f16": "<f2", "f32": "<f4"}
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """(west, south, east, north) in degrees of a web-mercator (slippy map) tile."""
+    n = 2 ** z
+    west = x / n * 360 - 180
+    east = (x + 1) / n * 360 - 180
+    north = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    south = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return west, south, east, north
+
+
+def pack_wind_tile(tile: WindTile, fmt: str) -> bytes:
+    """Pack a tile's u then v arrays (row-major, north row first) as little-endian floats."""
+    dtype = WIND_TILE_DTYPES[fmt]
+    return np.asarray(tile.u, dtype=dtype).tobytes() + np.asarray(tile.v, dtype=dtype).tobytes()
+
+
+@dataclass(frozen=True)
+class WindPyramid:
+    """
+    A wind field at successively halved resolutions (finest first), built once
+    per wind-field refresh. Each tile samples the coarsest level that is still
+    at least as fine as the tile's sample spacing, so low zooms read a smoothed
+    field instead of aliasing the full-resolution one.
+    """
+    levels: tuple[WindField, ...]
+    tile_size: int = WIND_TILE_SIZE
+    _tiles: LRUCache = field(default_factory=lambda: LRUCache(maxsize=4096), repr=False, compare=False)
+
+    @classmethod
+    def from_field(cls, wind_field: WindField, tile_size: int = WIND_TILE_SIZE) -> "WindPyramid":
+        levels = [wind_field]
+        # Keep halving while the coarser level still wraps and has cells to interpolate
+        while len(levels[-1].lats) >= 4 and len(levels[-1].lngs) >= 4 and len(levels[-1].lngs) % 2 == 0:
+            levels.append(levels[-1].downsampled())
+        return cls(levels=tuple(levels), tile_size=tile_size)
+
+    @property
+    def timestamp(self) -> int:
+        return self.levels[0].timestamp
+
+    def level_for(self, spacing: float) -> WindField:
+        """The coarsest level whose longitude step is no larger than `spacing` degrees."""
+        chosen = self.levels[0]
+        for level in self.levels[1:]:
+            if level.lngs[1] - level.lngs[0] > spacing:
+                break
+            chosen = level
+        return chosen
+
+    def tile(self, z: int, x: int, y: int) -> Optional[WindTile]:
+        """Sample one tile, or None if z/x/y is outside the tile scheme."""
+        n = 2 ** z
+        if not (0 <= z <= MAX_WIND_TILE_ZOOM and 0 <= x < n and 0 <= y < n):
+            return None
+
+        key = (z, x, y)
+        if key not in self._tiles:
+            self._tiles[key] = self._sample_tile(z, x, y)
+        return self._tiles[key]
+
+    def _sample_tile(self, z: int, x: int, y: int) -> WindTile:
+        west, south, east, north = tile_bounds(z, x, y)
+        size = self.tile_size
+        level = self.level_for((east - west) / size)
+
+        # Sample at cell centers, evenly spaced in mercator y so rows match map pixels
+        offsets = (np.arange(size) + 0.5) / size
+        lngs = west + offsets * (east - west)
+        lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + offsets) / 2 ** z))))
+
+        u, v = level.sample(lats[:, np.newaxis], lngs[np.newaxis, :])
+        return WindTile(
+            z=z,
+            x=x,
+            y=y,
+            size=size,
+            west=west,
+            south=south,
+            east=east,
+            north=north,
+            timestamp=level.timestamp,
+            u=np.round(u, 2).tolist(),
+            v=np.round(v, 2).tolist(),
+        )
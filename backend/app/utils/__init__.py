@@ -1,4 +1,13 @@
-from .cache import cache_with_ttl, get_cache, clear_cache
-
-__all__ = ["cache_with_ttl", "get_cache", "clear_cache"]
+from .cache import cache_with_ttl, get_cache, clear_cache, get_cache_stats
+from .geo import haversine_km, FarthestPointSampler
+from .conditional import ConditionalFetcher
 
+__all__ = [
+    "cache_with_ttl",
+    "get_cache",
+    "clear_cache",
+    "get_cache_stats",
+    "haversine_km",
+    "FarthestPointSampler",
+    "ConditionalFetcher",
+]
@@ -0,0 +1,25 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Sequence
+from .cache import refresh_cached
+
+
+async def refresh_periodically(
+    name: str,
+    method: Callable[..., Awaitable[Any]],
+    interval: float,
+    then: Sequence[Callable[[], Awaitable[Any]]] = (),
+) -> None:
+    """
+    Refresh the cache entry behind a @cache_with_ttl method now, then every
+    `interval` seconds until cancelled. The `then` callables run in order after
+    each successful refresh (e.g. to rebuild artifacts derived from the new
+    data). Failures are logged and retried next round.
+    """
+    while True:
+        try:
+            await refresh_cached(method)
+            for follow_up in then:
+                await follow_up()
+        except Exception as e:
+            print(f"Background refresh of {name} failed: {str(e)}")
+        await asyncio.sleep(interval)
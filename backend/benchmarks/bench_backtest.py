@@ -0,0 +1,219 @@
+"""
+Backtest balloon prediction strategies against recorded 24h histories.
+
+A fixture is one recorded balloon snapshot plus the wind volume in use when
+it was recorded (a single .npz). Each recorded hour o is treated as "now":
+its history is hours o..23, and every strategy predicts hour o - h for each
+horizon h. The error is the great-circle distance (km) to where the balloon
+was actually reported. Throughput is predicted balloons per second.
+
+Everything runs offline from the fixture files, so strategies and
+performance changes can be compared on exactly the same data. The repo ships
+benchmarks/fixtures/synthetic.npz (250 balloons through the simulated wind of
+a fixed window), which --synthetic regenerates with identical contents.
+
+Run from the backend directory:
+    python -m benchmarks.bench_backtest
+    python -m benchmarks.bench_backtest --record benchmarks/fixtures/live.npz
+    python -m benchmarks.bench_backtest --synthetic benchmarks/fixtures/synthetic.npz --balloons 250
+    python -m benchmarks.bench_backtest benchmarks/fixtures/*.npz --horizons 1 3 6 12
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.models import Balloon
+from app.services.balloon_service import BalloonService
+from app.services.balloon_snapshot import HOURS, BalloonSnapshot
+from app.services.prediction_service import PredictionService
+from app.services.weather_service import DEFAULT_WIND_LEVEL_HPA, WeatherService
+from app.services.wind_field import WindVolume
+from app.utils.geo import haversine_km
+from benchmarks.synthetic import synthetic_fixture
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+# Synthetic fixtures use the simulated wind of this fixed window, so they are reproducible
+SYNTHETIC_WIND_BUCKET = 2_000_000
+
+
+def save_fixture(path: Path, snapshot: BalloonSnapshot, volume: WindVolume) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        lat=snapshot.lat, lng=snapshot.lng, alt=snapshot.alt, valid=snapshot.valid,
+        total_count=snapshot.total_count, fetched_at=snapshot.fetched_at,
+        wind_levels=volume.levels, wind_lats=volume.lats, wind_lngs=volume.lngs,
+        wind_u=np.asarray(volume.u, dtype=np.float32), wind_v=np.asarray(volume.v, dtype=np.float32),
+        wind_timestamp=volume.timestamp,
+    )
+
+
+def load_fixture(path: Path) -> tuple[BalloonSnapshot, WindVolume]:
+    data = np.load(path)
+    snapshot = BalloonSnapshot(
+        lat=data["lat"], lng=data["lng"], alt=data["alt"], valid=data["valid"],
+        total_count=int(data["total_count"]), version=0, fetched_at=float(data["fetched_at"]),
+    )
+    volume = WindVolume(
+        levels=data["wind_levels"], lats=data["wind_lats"], lngs=data["wind_lngs"],
+        u=data["wind_u"], v=data["wind_v"], timestamp=int(data["wind_timestamp"]),
+    )
+    return snapshot, volume
+
+
+async def record_fixture(path: Path) -> None:
+    """Record the live 24h window and the current wind volume."""
+    balloon_service = BalloonService(rolling_ingest=False)
+    weather_service = WeatherService()
+    snapshot = await balloon_service.fetch_all_balloon_data()
+    volume = await weather_service.get_wind_volume()
+    save_fixture(path, snapshot, volume)
+    await balloon_service.close()
+    await weather_service.close()
+    print(f"recorded {snapshot.total_count} balloons to {path}")
+
+
+class FixtureWeather:
+    """Serves a fixture's wind volume in place of WeatherService."""
+
+    def __init__(self, volume: WindVolume):
+        self.volume = volume
+        self.wind_level = DEFAULT_WIND_LEVEL_HPA
+
+    async def get_wind_volume(self) -> WindVolume:
+        return self.volume
+
+
+def history_at(snapshot: BalloonSnapshot, origin: int) -> BalloonSnapshot:
+    """The snapshot as it would have looked `origin` hours ago (hour `origin` becomes hour 0)."""
+    def shift(array: np.ndarray, fill) -> np.ndarray:
+        pad = np.full((origin, array.shape[1]), fill, dtype=array.dtype)
+        return np.concatenate([array[origin:], pad])
+
+    return BalloonSnapshot(
+        lat=shift(snapshot.lat, np.nan), lng=shift(snapshot.lng, np.nan),
+        alt=shift(snapshot.alt, np.nan), valid=shift(snapshot.valid, False),
+        total_count=snapshot.total_count, version=0, fetched_at=snapshot.fetched_at,
+    )
+
+
+# Strategies return predicted (lat, lng) arrays shaped (horizons, balloons); NaN where no prediction
+
+async def persistence(service: PredictionService, balloons: list[Balloon], horizons: list[int]):
+    lat = np.array([b.current.lat for b in balloons])
+    lng = np.array([b.current.lng for b in balloons])
+    return np.tile(lat, (len(horizons), 1)), np.tile(lng, (len(horizons), 1))
+
+
+async def blend(service: PredictionService, balloons: list[Balloon], horizons: list[int]):
+    lat = np.full((len(horizons), len(balloons)), np.nan)
+    lng = np.full((len(horizons), len(balloons)), np.nan)
+    for b, predictions in enumerate(await service.predict_many(balloons, horizons)):
+        for h, position in enumerate(predictions):
+            lat[h, b], lng[h, b] = position.lat, position.lng
+    return lat, lng
+
+
+async def advect_control(service: PredictionService, balloons: list[Balloon], horizons: list[int]):
+    forecasts = await service.forecast_ensemble(balloons, horizons, members=1)
+    return (
+        np.array([[f.track[h].lat for f in forecasts] for h in range(len(horizons))]),
+        np.array([[f.track[h].lng for f in forecasts] for h in range(len(horizons))]),
+    )
+
+
+async def ensemble_mean(service: PredictionService, balloons: list[Balloon], horizons: list[int]):
+    forecasts = await service.forecast_ensemble(balloons, horizons, members=20)
+    return (
+        np.array([[f.track[h].lat for f in forecasts] for h in range(len(horizons))]),
+        np.array([[f.track[h].lng for f in forecasts] for h in range(len(horizons))]),
+    )
+
+
+STRATEGIES = {
+    "persistence": persistence,
+    "blend-60/40": blend,
+    "advect-rk2": advect_control,
+    "ensemble-20": ensemble_mean,
+}
+
+
+async def backtest(paths: list[Path], horizons: list[int], strategies: list[str]) -> None:
+    errors = {(name, h): [] for name in strategies for h in horizons}
+    timings = {name: [0.0, 0] for name in strategies}
+
+    for path in paths:
+        snapshot, volume = load_fixture(path)
+        service = PredictionService()
+        service.weather_service = FixtureWeather(volume)
+
+        for origin in range(max(horizons), HOURS - 1):
+            past = history_at(snapshot, origin)
+            ids = past.current_indices()
+            balloons = [past.balloon(int(i), "#FF6B6B") for i in ids]
+
+            for name in strategies:
+                start = time.perf_counter()
+                lat, lng = await STRATEGIES[name](service, balloons, horizons)
+                timings[name][0] += time.perf_counter() - start
+                timings[name][1] += len(balloons)
+
+                for h, hours in enumerate(horizons):
+                    target = origin - hours
+                    seen = snapshot.valid[target, ids] & ~np.isnan(lat[h])
+                    errors[name, hours].append(haversine_km(
+                        lat[h, seen], lng[h, seen], snapshot.lat[target, ids[seen]], snapshot.lng[target, ids[seen]],
+                    ))
+
+    print(f"{len(paths)} fixture(s), origins {max(horizons)}..{HOURS - 2} h ago\n")
+    print(f"{'strategy':>13} {'horizon':>8} {'n':>9} {'mean km':>9} {'median km':>10} {'p90 km':>9}")
+    for name in strategies:
+        for hours in horizons:
+            err = np.concatenate(errors[name, hours]) if errors[name, hours] else np.array([])
+            if len(err):
+                print(
+                    f"{name:>13} {hours:>7}h {len(err):>9,} {err.mean():>9.1f} "
+                    f"{np.median(err):>10.1f} {np.percentile(err, 90):>9.1f}"
+                )
+            else:
+                print(f"{name:>13} {hours:>7}h {0:>9} {'-':>9} {'-':>10} {'-':>9}")
+
+    print(f"\n{'strategy':>13} {'balloons/s':>12}")
+    for name in strategies:
+        elapsed, count = timings[name]
+        print(f"{name:>13} {count / elapsed if elapsed else 0:>12,.0f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", type=Path, nargs="*", help=f"Fixture files (default: {FIXTURE_DIR}/*.npz)")
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 3, 6, 12])
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--record", type=Path, help="Record the live window and wind to this fixture and exit")
+    parser.add_argument("--synthetic", type=Path, help="Write a synthetic fixture to this path and exit")
+    parser.add_argument("--balloons", type=int, default=1_000, help="Balloons in a synthetic fixture")
+    args = parser.parse_args()
+
+    if args.record:
+        await record_fixture(args.record)
+        return
+    if args.synthetic:
+        volume = await WeatherService(observed_wind=False)._get_wind_volume(SYNTHETIC_WIND_BUCKET)
+        save_fixture(args.synthetic, *synthetic_fixture(args.balloons, volume))
+        print(f"wrote synthetic fixture with {args.balloons} balloons to {args.synthetic}")
+        return
+
+    paths = args.fixtures or sorted(FIXTURE_DIR.glob("*.npz"))
+    if not paths:
+        parser.error("no fixtures found; create one with --record or --synthetic")
+    if max(args.horizons) >= HOURS - 2:
+        parser.error(f"horizons must be below {HOURS - 2} hours")
+    await backtest(paths, sorted(args.horizons), args.strategies)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Measure what conditional requests (ETag / If-None-Match) save on upstream refreshes.
+
+A local stand-in upstream serves synthetic Windborne, FIRMS and NOAA payloads
+with ETags and answers 304 when the client's validator still matches. Each
+service is refreshed twice with the TTL cache cleared in between: the first
+refresh downloads and parses the body, the second revalidates.
+
+Run from the backend directory:
+    python -m benchmarks.bench_conditional
+    python -m benchmarks.bench_conditional --fires 500000
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+
+import httpx
+
+from app.services.balloon_service import BalloonService
+from app.services.fire_service import FireService
+from app.services.storm_service import StormService
+from app.utils.cache import clear_cache
+from benchmarks.synthetic import synthetic_alerts, synthetic_firms_csv, synthetic_hour
+
+
+class StandInUpstream:
+    """An in-process HTTP upstream that serves fixed bodies with ETag revalidation."""
+
+    def __init__(self, routes: dict[str, bytes]):
+        # Routes are matched on the end of the URL path
+        self.routes = {suffix: (body, f'"{hashlib.sha1(body).hexdigest()}"') for suffix, body in routes.items()}
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        for suffix, (body, etag) in self.routes.items():
+            if request.url.path.endswith(suffix):
+                if request.headers.get("If-None-Match") == etag:
+                    self.not_modified += 1
+                    return httpx.Response(304, headers={"ETag": etag})
+                self.bytes_sent += len(body)
+                return httpx.Response(200, content=body, headers={"ETag": etag})
+        return httpx.Response(404)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def use_client(service, client: httpx.AsyncClient):
+    service.client = client
+    service.fetcher.client = client
+    return service
+
+
+async def refresh_twice(upstream: StandInUpstream, name: str, cache_name: str, refresh) -> None:
+    for label in ("initial", "revalidate"):
+        clear_cache(cache_name)
+        requests, not_modified, sent = upstream.requests, upstream.not_modified, upstream.bytes_sent
+        start = time.perf_counter()
+        await refresh()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:>10} {label:>11} {upstream.requests - requests:>9} "
+            f"{upstream.not_modified - not_modified:>6} {upstream.bytes_sent - sent:>14,} "
+            f"{elapsed * 1000:>10.1f}"
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--balloons", type=int, default=1_000)
+    parser.add_argument("--fires", type=int, default=200_000)
+    parser.add_argument("--alerts", type=int, default=300)
+    args = parser.parse_args()
+
+    routes = {f"/{hour:02d}.json": json.dumps(synthetic_hour(args.balloons, seed=hour)).encode() for hour in range(24)}
+    routes["/world/1"] = synthetic_firms_csv(args.fires).encode()
+    routes["/alerts/active"] = json.dumps(synthetic_alerts(args.alerts)).encode()
+    upstream = StandInUpstream(routes)
+    client = upstream.client()
+
+    balloons = use_client(BalloonService(), client)
+    fires = use_client(FireService(), client)
+    storms = use_client(StormService(), client)
+
+    print(f"{'service':>10} {'refresh':>11} {'requests':>9} {'304s':>6} {'bytes sent':>14} {'time (ms)':>10}")
+    await refresh_twice(upstream, "balloons", "balloons", balloons.fetch_all_balloon_data)
+    await refresh_twice(upstream, "fires", "fires", fires.get_active_fires)
+    await refresh_twice(upstream, "storms", "storms", storms.get_active_storms)
+
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
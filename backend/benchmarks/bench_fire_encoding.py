@@ -0,0 +1,59 @@
+"""
+Compare /api/fires encodings: size, encode time, and the cost of a repeat request.
+
+- legacy: json.dumps(fire_data.model_dump()) on every request
+  (what the endpoints did before encodings were cached)
+- json / columnar / packed: encode_fires once per refresh; a repeat
+  request is a cached bytes lookup (FireService.get_encoded_fires)
+
+Run from the backend directory:
+    python -m benchmarks.bench_fire_encoding
+    python -m benchmarks.bench_fire_encoding --fires 1000000
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import time
+
+from app.services.fire_encoding import FIRE_FORMATS, encode_fires
+from app.services.fire_service import FireService
+from app.services.firms_parser import FirmsCsvParser
+from benchmarks.synthetic import synthetic_firms_csv
+
+
+def timed(fn, repeat: int = 5) -> tuple[float, bytes]:
+    best, result = float("inf"), b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fires", type=int, default=500_000, help="Rows in the synthetic CSV (before filtering)")
+    args = parser.parse_args()
+
+    csv_parser = FirmsCsvParser()
+    csv_parser.feed(synthetic_firms_csv(args.fires).encode())
+    fire_data = asyncio.run(csv_parser.finish())
+    service = FireService()
+
+    print(f"{fire_data.count:,} fires\n")
+    print(f"{'format':>9} {'MB':>7} {'gzip MB':>8} {'encode ms':>10} {'repeat ms':>10}")
+    legacy_s, body = timed(lambda: json.dumps(fire_data.model_dump()).encode())
+    print(f"{'legacy':>9} {len(body) / 1e6:>7.2f} {len(gzip.compress(body)) / 1e6:>8.2f} {legacy_s * 1000:>10.1f} {legacy_s * 1000:>10.1f}")
+    for fmt in FIRE_FORMATS:
+        encode_s, body = timed(lambda: encode_fires(fire_data, fmt))
+        service.get_encoded_fires(fire_data, fmt)
+        repeat_s, _ = timed(lambda: service.get_encoded_fires(fire_data, fmt))
+        print(
+            f"{fmt:>9} {len(body) / 1e6:>7.2f} {len(gzip.compress(body)) / 1e6:>8.2f} "
+            f"{encode_s * 1000:>10.1f} {repeat_s * 1000:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare fire proximity checks: the previous linear scan vs the grid index.
+
+Builds FireData from a synthetic FIRMS CSV, then answers the same random
+/api/fires/check queries with both. Also counts queries whose answers differ:
+the linear scan's flat distance approximation misses fires across the
+antimeridian, and the grid index uses great-circle distance.
+
+Run from the backend directory:
+    python -m benchmarks.bench_fire_index
+    python -m benchmarks.bench_fire_index --fires 500000 --queries 2000
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+
+from app.models import Fire
+from app.services.fire_service import FireService
+from app.services.firms_parser import FirmsCsvParser
+from benchmarks.synthetic import synthetic_firms_csv
+
+
+def legacy_is_over_fire(lat: float, lng: float, fires: list[Fire], radius_km: float) -> bool:
+    for fire in fires:
+        lat_diff = abs(lat - fire.lat)
+        lng_diff = abs(lng - fire.lng)
+        dist_km = math.sqrt((lat_diff * 111) ** 2 + (lng_diff * 111 * math.cos(math.radians(lat))) ** 2)
+        if dist_km <= radius_km:
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fires", type=int, default=200_000, help="Rows in the synthetic CSV (before filtering)")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--radius", type=float, default=50)
+    args = parser.parse_args()
+
+    csv_parser = FirmsCsvParser()
+    csv_parser.feed(synthetic_firms_csv(args.fires).encode())
+    fire_data = asyncio.run(csv_parser.finish())
+    service = FireService()
+
+    rng = random.Random(1)
+    # Half the queries near fires, so both hits and misses are timed
+    queries = [
+        (fire.lat + rng.gauss(0, 1), fire.lng + rng.gauss(0, 1))
+        for fire in rng.sample(fire_data.fires, args.queries // 2)
+    ] + [(rng.uniform(-80, 80), rng.uniform(-180, 180)) for _ in range(args.queries - args.queries // 2)]
+    queries = [(max(-90, min(90, lat)), ((lng + 180) % 360) - 180) for lat, lng in queries]
+
+    start = time.perf_counter()
+    service.get_fire_index(fire_data)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    legacy = [legacy_is_over_fire(lat, lng, fire_data.fires, args.radius) for lat, lng in queries]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [service.is_balloon_over_fire(lat, lng, fire_data, args.radius) for lat, lng in queries]
+    indexed_s = time.perf_counter() - start
+
+    print(f"{fire_data.count:,} fires, {len(queries)} queries, radius {args.radius:g} km")
+    print(f"index build: {build_ms:.1f} ms\n")
+    print(f"{'method':>8} {'per query ms':>13} {'hits':>6}")
+    print(f"{'linear':>8} {legacy_s / len(queries) * 1000:>13.3f} {sum(legacy):>6}")
+    print(f"{'grid':>8} {indexed_s / len(queries) * 1000:>13.3f} {sum(indexed):>6}")
+    print(f"\nspeedup {legacy_s / indexed_s:.0f}x, {sum(a != b for a, b in zip(legacy, indexed))} answers differ")
+
+
+if __name__ == "__main__":
+    main()
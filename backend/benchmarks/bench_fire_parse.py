@@ -0,0 +1,147 @@
+"""
+Compare the streaming FIRMS CSV parser with the previous whole-body parser.
+
+A synthetic VIIRS CSV is written to a temporary file and served through a
+stand-in upstream that streams it in 64 KiB chunks. Each parser runs in its
+own process so peak RSS (ru_maxrss) is measured independently:
+
+- legacy: response.text -> split("\\n") -> per-line parse -> Fire per survivor
+  (the parser FireService used before streaming)
+- stream: FireService._parse_fires_response over client.stream() chunks,
+  parsing in the event loop (FIRMS_PARSE_WORKERS=0)
+
+Run from the backend directory:
+    python -m benchmarks.bench_fire_parse
+    python -m benchmarks.bench_fire_parse --fires 1000000
+"""
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from app.models import Fire, FireData
+from app.services.fire_service import FireService
+from app.services.firms_parser import fire_data_from_rows
+from benchmarks.synthetic import synthetic_firms_csv
+
+CHUNK_BYTES = 64 * 1024
+
+
+def legacy_parse_fire_line(line: str) -> Optional[Fire]:
+    try:
+        parts = line.split(",")
+        if len(parts) < 13:
+            return None
+        lat = float(parts[0])
+        lng = float(parts[1])
+        brightness = float(parts[2])
+        confidence = parts[9]
+        frp = float(parts[12]) if parts[12] else 0
+        if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
+            return None
+        if confidence.lower() not in ('high', 'h', 'nominal', 'n') or frp < 10:
+            return None
+        return Fire(
+            lat=lat, lng=lng, brightness=brightness, confidence=confidence,
+            acq_date=parts[5], acq_time=parts[6], frp=frp,
+        )
+    except (ValueError, IndexError):
+        return None
+
+
+def legacy_parse(response: httpx.Response) -> FireData:
+    fires = []
+    regions: dict[str, int] = {}
+    lines = response.text.strip().split("\n")
+    for line in lines[1:]:
+        fire = legacy_parse_fire_line(line)
+        if fire:
+            fires.append(fire)
+            region_key = f"{int(fire.lat / 10) * 10},{int(fire.lng / 10) * 10}"
+            regions[region_key] = regions.get(region_key, 0) + 1
+    return FireData(fires=fires, count=len(fires), regions=regions)
+
+
+def file_transport(path: Path) -> httpx.MockTransport:
+    async def body():
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_BYTES):
+                yield chunk
+
+    return httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+async def run_parser(name: str, path: Path) -> dict:
+    baseline = max_rss_mb()
+    service = FireService()
+    service.parse_workers = 0
+    async with httpx.AsyncClient(transport=file_transport(path)) as client:
+        start = time.perf_counter()
+        if name == "legacy":
+            response = await client.get("https://firms.test/world/1")
+            data = legacy_parse(response)
+        else:
+            async with client.stream("GET", "https://firms.test/world/1") as response:
+                rows, _, _ = await service._parse_fires_response(response)
+                data = fire_data_from_rows(rows)
+        elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "peak_rss_mb": max_rss_mb(),
+        "baseline_rss_mb": baseline,
+        "count": data.count,
+        "regions": len(data.regions),
+        "first": data.fires[0].model_dump() if data.fires else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fires", type=int, default=500_000, help="Rows in the synthetic CSV")
+    parser.add_argument("--run", choices=["legacy", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--csv", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        # Child process: parse once and report as JSON
+        print(json.dumps(asyncio.run(run_parser(args.run, args.csv))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "firms.csv"
+        path.write_text(synthetic_firms_csv(args.fires))
+        size_mb = path.stat().st_size / 1e6
+        print(f"{args.fires:,} rows, {size_mb:.1f} MB CSV\n")
+        print(f"{'parser':>8} {'parse s':>9} {'peak RSS MB':>12} {'+ over base':>12} {'fires':>9} {'regions':>8}")
+
+        results = {}
+        for name in ("legacy", "stream"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_fire_parse", "--run", name, "--csv", str(path)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            results[name] = result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{name:>8} {result['seconds']:>9.2f} {result['peak_rss_mb']:>12.0f} "
+                f"{result['peak_rss_mb'] - result['baseline_rss_mb']:>12.0f} {result['count']:>9,} {result['regions']:>8}"
+            )
+
+    legacy, stream = results["legacy"], results["stream"]
+    same = (legacy["count"], legacy["regions"], legacy["first"]) == (stream["count"], stream["regions"], stream["first"])
+    print(f"\nspeedup {legacy['seconds'] / stream['seconds']:.1f}x, outputs {'match' if same else 'DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
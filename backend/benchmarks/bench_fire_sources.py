@@ -0,0 +1,104 @@
+"""
+Measure concurrent multi-sensor FIRMS ingestion and cross-sensor deduplication.
+
+A stand-in upstream serves one synthetic CSV per FIRMS product (VIIRS on
+three satellites plus MODIS, observing the same fires at different
+overpass times) at a simulated bandwidth. The products are fetched one
+after another and then concurrently through FireService, with CSV blocks
+parsed in the worker pool. Per-source timings come from
+FireService.source_stats.
+
+Run from the backend directory:
+    python -m benchmarks.bench_fire_sources
+    python -m benchmarks.bench_fire_sources --fires 300000 --mbps 200 --workers 4
+
+Parsing is CPU-bound, so the concurrent gain beyond overlapping downloads
+depends on the cores available to the worker pool.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.services.fire_service import FireService
+from app.services.fire_store import RollingFireStore
+from app.utils.cache import clear_cache
+from app.utils.conditional import ConditionalFetcher
+from benchmarks.synthetic import synthetic_firms_sources
+
+CHUNK_BYTES = 64 * 1024
+
+
+def stand_in_transport(bodies: dict[str, bytes], mbps: float) -> httpx.MockTransport:
+    """Serve each product's CSV in chunks, sleeping to simulate the given bandwidth."""
+    async def stream(body: bytes):
+        for start in range(0, len(body), CHUNK_BYTES):
+            chunk = body[start:start + CHUNK_BYTES]
+            await asyncio.sleep(len(chunk) * 8 / (mbps * 1e6))
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        source = request.url.path.split("/")[-3]
+        return httpx.Response(200, content=stream(bodies[source]))
+
+    return httpx.MockTransport(handler)
+
+
+def service_for(bodies: dict[str, bytes], mbps: float, workers: int) -> FireService:
+    service = FireService()
+    service.api_key = "bench"
+    service.sources = list(bodies)
+    service.parse_workers = workers
+    service.client = httpx.AsyncClient(transport=stand_in_transport(bodies, mbps))
+    service.fetcher = ConditionalFetcher(service.client)
+    # Synthetic detections carry a fixed date, so never expire them
+    service.store = RollingFireStore(window_hours=float("inf"))
+    return service
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fires", type=int, default=150_000, help="Underlying fires (each product sees ~70%%)")
+    parser.add_argument("--mbps", type=float, default=50, help="Simulated download bandwidth per product")
+    parser.add_argument("--workers", type=int, default=4, help="Parse worker processes (0 = parse in the event loop)")
+    args = parser.parse_args()
+
+    bodies = {source: csv.encode() for source, csv in synthetic_firms_sources(args.fires).items()}
+    total_mb = sum(len(body) for body in bodies.values()) / 1e6
+    print(f"{len(bodies)} products, {total_mb:.1f} MB total, {args.mbps:g} Mbit/s, {args.workers} parse workers\n")
+
+    # One after another: each product on its own, like four single-source refreshes
+    sequential = 0.0
+    for source in bodies:
+        service = service_for({source: bodies[source]}, args.mbps, args.workers)
+        await service._fetch_source(source)  # Warm the worker pool
+        start = time.perf_counter()
+        await service._fetch_source(source)
+        sequential += time.perf_counter() - start
+        await service.close()
+
+    service = service_for(bodies, args.mbps, args.workers)
+    await service._fetch_source(next(iter(bodies)))  # Warm the worker pool
+    clear_cache("fires")
+    start = time.perf_counter()
+    fire_data = await service.get_active_fires()
+    concurrent = time.perf_counter() - start
+    stats = service.source_stats
+    await service.close()
+
+    print(f"{'source':>18} {'seconds':>8} {'MB':>7} {'lines':>9} {'kept':>8}")
+    for source in stats.sources:
+        print(
+            f"{source.source:>18} {source.seconds:>8.2f} {source.bytes / 1e6:>7.1f} "
+            f"{source.lines:>9,} {source.kept:>8,}{'  ' + source.error if source.error else ''}"
+        )
+    kept = sum(source.kept for source in stats.sources)
+    print(f"\nmerged {kept:,} detections -> {fire_data.count:,} fires ({stats.duplicates:,} duplicates) "
+          f"in {stats.merge_seconds:.2f} s")
+    fetch = concurrent - stats.merge_seconds
+    print(f"download + parse: sequential {sequential:.2f} s, concurrent {fetch:.2f} s ({sequential / fetch:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
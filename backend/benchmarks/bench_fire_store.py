@@ -0,0 +1,131 @@
+"""
+Compare refreshing the fire layers from scratch with the rolling fire store.
+
+Two days of synthetic VIIRS detections are replayed as 15-minute refreshes.
+Each refresh "downloads" every detection of the trailing 24 hours, as the
+FIRMS world/1 product does. Two approaches then bring FireData, the spatial
+index, the zones and every aggregate resolution up to date:
+
+- rebuild: FireData from all merged rows, then every layer built from it
+  (what FireService did before the store)
+- store: RollingFireStore.update, which touches only the new and expired
+  detections, then its views
+
+Timings cover the second day only, so the store is in steady state. The
+store's count is checked against the rebuild's at every timed refresh, and
+its fires, regions, zones and aggregates against a full rebuild at the end.
+
+Run from the backend directory:
+    python -m benchmarks.bench_fire_store
+    python -m benchmarks.bench_fire_store --fires 1000000 --step 5
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.models import FireZone
+from app.services.fire_store import RollingFireStore
+from app.services.fire_zones import FIRE_AGGREGATE_RESOLUTIONS, aggregate_fires, cluster_fires, fire_columns
+from app.services.firms_parser import FirmsCsvParser, acquisition_minutes, deduplicate, fire_data_from_rows
+from app.utils.geo import GridIndex
+from benchmarks.synthetic import synthetic_firms_csv
+
+
+def rebuild(rows: np.ndarray) -> int:
+    fire_data = fire_data_from_rows(rows)
+    lat, lng, frp = fire_columns(fire_data)
+    GridIndex(lat, lng)
+    cluster_fires(lat, lng, frp)
+    for resolution in FIRE_AGGREGATE_RESOLUTIONS:
+        aggregate_fires(lat, lng, frp, resolution)
+    return fire_data.count
+
+
+def zone_table(zones: list[FireZone]) -> np.ndarray:
+    """Zones as rows of (south, west, north, east, count, total_frp, lat, lng), in bounding-box order."""
+    table = np.array([[z.south, z.west, z.north, z.east, z.count, z.total_frp, z.lat, z.lng] for z in zones]).reshape(-1, 8)
+    return table[np.lexsort(table[:, 3::-1].T)]
+
+
+def check_matches_rebuild(store: RollingFireStore, rows: np.ndarray) -> None:
+    """Assert the store's views equal the layers built from scratch from the same window's rows."""
+    fire_data = fire_data_from_rows(rows)
+    stored = store.fire_data()
+    assert stored.count == fire_data.count
+    assert sorted(f.model_dump_json() for f in stored.fires) == sorted(f.model_dump_json() for f in fire_data.fires)
+    assert stored.regions == fire_data.regions
+
+    # Running FRP sums and zone centroids differ from a fresh sum only by float rounding
+    lat, lng, frp = fire_columns(fire_data)
+    rebuilt, incremental = zone_table(cluster_fires(lat, lng, frp)), zone_table(store.zones())
+    assert rebuilt.shape == incremental.shape
+    assert np.array_equal(rebuilt[:, :5], incremental[:, :5])
+    assert np.allclose(rebuilt[:, 5:], incremental[:, 5:], atol=0.01)
+    for resolution in FIRE_AGGREGATE_RESOLUTIONS:
+        cells = [(c.lat, c.lng, c.count) for c in aggregate_fires(lat, lng, frp, resolution).cells]
+        assert [(c.lat, c.lng, c.count) for c in store.aggregate(resolution).cells] == cells
+        assert np.allclose(
+            [c.total_frp for c in store.aggregate(resolution).cells],
+            [c.total_frp for c in aggregate_fires(lat, lng, frp, resolution).cells],
+            atol=0.01,
+        )
+
+
+def refresh_store(store: RollingFireStore, rows: np.ndarray, now: float) -> int:
+    store.update(rows, now)
+    store.zones()
+    for resolution in FIRE_AGGREGATE_RESOLUTIONS:
+        store.aggregate(resolution)
+    return store.fire_data().count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fires", type=int, default=300_000, help="Rows per synthetic day (before filtering)")
+    parser.add_argument("--step", type=int, default=15, help="Minutes between refreshes")
+    args = parser.parse_args()
+
+    csv_parser = FirmsCsvParser()
+    csv_parser.feed(synthetic_firms_csv(args.fires, seed=0).encode())
+    second_day = synthetic_firms_csv(args.fires, seed=1).replace("2026-10-17", "2026-10-18")
+    csv_parser.feed(second_day.split("\n", 1)[1].encode())
+    rows = asyncio.run(csv_parser.rows())
+    minutes = acquisition_minutes(rows)
+    rows, minutes = rows[np.argsort(minutes, kind="stable")], np.sort(minutes)
+
+    store = RollingFireStore()
+    start_of_day = np.floor(minutes[0] / 1440) * 1440
+    timings = {"rebuild": [], "store": []}
+    counts = []
+    for now in np.arange(start_of_day + args.step, start_of_day + 2880 + 1, args.step):
+        downloaded, _ = deduplicate([rows[(minutes > now - 1440) & (minutes <= now)]])
+        if now <= start_of_day + 1440:
+            store.update(downloaded, now)
+            continue
+
+        start = time.perf_counter()
+        count = rebuild(downloaded)
+        timings["rebuild"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        refresh_store(store, downloaded, now)
+        timings["store"].append(time.perf_counter() - start)
+        assert count == len(store), f"store has {len(store)} fires, rebuild {count}"
+        counts.append(count)
+
+    print(f"{len(rows):,} significant detections over 2 days, refresh every {args.step} min")
+    print(f"{len(counts)} timed refreshes, ~{np.mean(counts):,.0f} fires in the window\n")
+    print(f"{'method':>8} {'mean ms':>9} {'p90 ms':>9}")
+    for name, values in timings.items():
+        values = np.array(values) * 1000
+        print(f"{name:>8} {values.mean():>9.1f} {np.percentile(values, 90):>9.1f}")
+    print(f"\nspeedup {np.mean(timings['rebuild']) / np.mean(timings['store']):.1f}x")
+
+    check_matches_rebuild(store, downloaded)
+    print("store identical to a full rebuild of the final window")
+
+
+if __name__ == "__main__":
+    main()
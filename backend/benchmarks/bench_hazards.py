@@ -0,0 +1,83 @@
+"""
+Compare annotating every balloon with fire/storm hazards: per-balloon checks vs the batch stage.
+
+- legacy: for each balloon, the linear fire scan and StormService.is_balloon_in_storm
+  (what a client hitting /api/fires/check and /api/storms/check per balloon cost)
+- batch: HazardService._annotate over the whole snapshot (fire grid index
+  plus vectorized storm polygons), as run once after each refresh
+
+Run from the backend directory:
+    python -m benchmarks.bench_hazards
+    python -m benchmarks.bench_hazards --balloons 5000 --fires 500000 --storms 300
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.models import Storm, StormData
+from app.services.balloon_snapshot import BalloonSnapshot
+from app.services.fire_service import FireService
+from app.services.firms_parser import FirmsCsvParser
+from app.services.hazard_service import FIRE_HAZARD_RADIUS_KM, STORM_HAZARD_RADIUS_KM, HazardService
+from app.services.storm_service import StormService
+from benchmarks.bench_fire_index import legacy_is_over_fire
+from benchmarks.synthetic import synthetic_firms_csv, synthetic_hour
+
+
+def synthetic_storms(n: int, seed: int = 0) -> StormData:
+    """Alert polygons (every other storm) and point alerts scattered over North America."""
+    rng = random.Random(seed)
+    storms = []
+    for i in range(n):
+        lat, lng = rng.uniform(25, 50), rng.uniform(-125, -70)
+        polygon = [[lng + rng.uniform(-1.5, 1.5), lat + rng.uniform(-1.5, 1.5)] for _ in range(12)] if i % 2 else None
+        storms.append(Storm(
+            id=f"storm-{i}", name="Severe Thunderstorm Warning", lat=lat, lng=lng,
+            severity="Severe", description="", polygon=polygon,
+        ))
+    return StormData(storms=storms, count=n, regions={})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--balloons", type=int, default=1_000)
+    parser.add_argument("--fires", type=int, default=200_000, help="Rows in the synthetic CSV (before filtering)")
+    parser.add_argument("--storms", type=int, default=100)
+    args = parser.parse_args()
+
+    csv_parser = FirmsCsvParser()
+    csv_parser.feed(synthetic_firms_csv(args.fires).encode())
+    fire_data = asyncio.run(csv_parser.finish())
+    storm_data = synthetic_storms(args.storms)
+    snapshot = BalloonSnapshot.from_hourly_data([synthetic_hour(args.balloons, seed=h) for h in range(24)])
+
+    service = HazardService()
+    service.fire_service = FireService()
+    service.storm_service = StormService()
+    positions = snapshot.current_positions()
+
+    start = time.perf_counter()
+    legacy = [
+        (
+            legacy_is_over_fire(p.lat, p.lng, fire_data.fires, FIRE_HAZARD_RADIUS_KM),
+            service.storm_service.is_balloon_in_storm(p.lat, p.lng, storm_data.storms, STORM_HAZARD_RADIUS_KM) is not None,
+        )
+        for p in positions
+    ]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hazards = service._annotate(snapshot, fire_data, storm_data)
+    batch_s = time.perf_counter() - start
+
+    print(f"{len(positions):,} balloons, {fire_data.count:,} fires, {storm_data.count} storms\n")
+    print(f"{'method':>8} {'seconds':>9} {'over fire':>10} {'in storm':>9}")
+    print(f"{'legacy':>8} {legacy_s:>9.3f} {sum(f for f, _ in legacy):>10} {sum(s for _, s in legacy):>9}")
+    print(f"{'batch':>8} {batch_s:>9.3f} {hazards.over_fire:>10} {hazards.in_storm:>9}")
+    # The legacy checks use a flat distance approximation, so counts can differ slightly
+    print(f"\nspeedup {legacy_s / batch_s:.0f}x (index build included in batch)")
+
+
+if __name__ == "__main__":
+    main()
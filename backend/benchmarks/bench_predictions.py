@@ -0,0 +1,121 @@
+"""
+Benchmark per-balloon vs batched wind lookups for balloon predictions.
+
+A local mock OpenWeatherMap answers every request after a fixed round-trip
+delay (and counts them).
+
+- serial: one current-weather lookup per balloon, awaited in turn
+  (O(n) round-trips, what predictions did originally)
+- batched: the same lookups through WeatherService.get_weather_batch,
+  deduplicated by weather grid cell and run concurrently (O(1) round-trips
+  for a selection); checked to give forecasts identical to serial
+- volume: PredictionService.predict_many, which samples the in-memory wind
+  volume (built once per wind window) and makes no requests at all
+
+Run from the backend directory:
+    python -m benchmarks.bench_predictions
+    python -m benchmarks.bench_predictions --sizes 10 50 100 --rtt-ms 80
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+from app.models import Balloon, BalloonPosition, WeatherData
+from app.services.balloon_snapshot import BalloonSnapshot
+from app.services.prediction_service import PredictionService
+from app.services.weather_service import WeatherService
+from app.services.wind_field import wind_to_uv
+from app.utils.cache import clear_cache
+from benchmarks.synthetic import synthetic_hour
+
+# Concurrent lookups for the batched path (enough for a full selection in ~2 round-trips)
+BATCH_CONCURRENCY = 25
+
+
+class MockWeatherServer:
+    """Mock OpenWeatherMap current-weather endpoint with a fixed latency."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.requests = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.rtt)
+        return httpx.Response(200, json={
+            "name": "",
+            "main": {"temp": 12.0, "humidity": 60, "pressure": 1012},
+            "weather": [{"description": "clear sky"}],
+            "wind": {"speed": 8.5, "deg": 270},
+            "clouds": {"all": 10},
+        })
+
+
+def observed_forecast(
+    service: PredictionService, balloon: Balloon, weather: Optional[WeatherData]
+) -> list[BalloonPosition]:
+    wind = tuple(float(c) for c in wind_to_uv(weather.wind_speed, weather.wind_direction)) if weather else None
+    return service._forecast(balloon, wind, [5, 10])
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--rtt-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    server = MockWeatherServer(args.rtt_ms / 1000)
+    weather_service = WeatherService(observed_wind=False)
+    weather_service.client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+    prediction_service = PredictionService()
+    prediction_service.weather_service = weather_service
+    clear_cache("wind")
+    await weather_service.get_wind_volume()
+
+    print(
+        f"{'balloons':>9} {'serial (ms)':>12} {'requests':>9} {'batched (ms)':>13} {'requests':>9} "
+        f"{'speedup':>8} {'identical':>10} {'volume (ms)':>12} {'requests':>9}"
+    )
+    for n in args.sizes:
+        snapshot = BalloonSnapshot.from_hourly_data([synthetic_hour(n, seed=h) for h in range(7)])
+        balloons = [snapshot.balloon(i, "#FF6B6B") for i in range(n)]
+
+        clear_cache("weather")
+        server.requests = 0
+        start = time.perf_counter()
+        serial = [
+            observed_forecast(prediction_service, b, await weather_service.get_weather_at_location(b.current.lat, b.current.lng))
+            for b in balloons
+        ]
+        serial_s, serial_requests = time.perf_counter() - start, server.requests
+
+        clear_cache("weather")
+        server.requests = 0
+        start = time.perf_counter()
+        weather = await weather_service.get_weather_batch(
+            [(b.current.lat, b.current.lng) for b in balloons], max_concurrency=BATCH_CONCURRENCY
+        )
+        batched = [observed_forecast(prediction_service, b, w) for b, w in zip(balloons, weather)]
+        batched_s, batched_requests = time.perf_counter() - start, server.requests
+
+        assert serial == batched
+
+        server.requests = 0
+        start = time.perf_counter()
+        await prediction_service.predict_many(balloons)
+        volume_s, volume_requests = time.perf_counter() - start, server.requests
+
+        print(
+            f"{n:>9} {serial_s * 1000:>12.0f} {serial_requests:>9} "
+            f"{batched_s * 1000:>13.0f} {batched_requests:>9} {serial_s / batched_s:>7.1f}x {str(serial == batched):>10} "
+            f"{volume_s * 1000:>12.1f} {volume_requests:>9}"
+        )
+
+    await weather_service.client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
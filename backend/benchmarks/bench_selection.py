@@ -0,0 +1,117 @@
+"""
+Benchmark balloon selection (farthest-point sampling) on synthetic constellations.
+
+Compares the original scalar O(n*k^2) loop against the vectorized
+FarthestPointSampler used by BalloonService, and checks both pick the same
+balloons. Snapshots store float32 coordinates and the API rounds them to
+COORD_DECIMALS, so served positions are checked against the raw float64 input
+within COORD_TOLERANCE rather than for equality.
+
+Run from the backend directory:
+    python -m benchmarks.bench_selection
+    python -m benchmarks.bench_selection --sizes 1000 10000 100000 --count 50
+"""
+import argparse
+import math
+import time
+
+from app.services.balloon_service import BalloonService
+from app.services.balloon_snapshot import COORD_DECIMALS, BalloonSnapshot, parse_position
+from benchmarks.synthetic import synthetic_hour
+
+# float32 spacing near +-180 degrees is ~1.5e-5, so its rounding error is up to
+# ~7.6e-6 degrees, plus half the last kept decimal: ~1.3e-5 degrees (~1.5 m)
+COORD_TOLERANCE = 0.5 ** 17 + 0.5 * 10 ** -COORD_DECIMALS
+
+
+def legacy_haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lng = math.radians(lng2 - lng1)
+    a = math.sin(delta_lat / 2) ** 2 + \
+        math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng / 2) ** 2
+    return 6371 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def legacy_select(hourly_data: list, count: int) -> list[int]:
+    """The original scalar greedy farthest-point sampling, kept as a reference."""
+    valid_balloons = []
+    for idx, pos in enumerate(hourly_data[0]):
+        parsed = parse_position(pos)
+        if parsed:
+            valid_balloons.append((idx, parsed[0], parsed[1]))
+
+    if len(valid_balloons) <= count:
+        return [b[0] for b in valid_balloons]
+
+    selected = []
+    remaining = valid_balloons.copy()
+    selected.append(remaining.pop(0))
+
+    while len(selected) < count and remaining:
+        max_min_dist = -1
+        best_idx = 0
+        for i, (idx, lat, lng) in enumerate(remaining):
+            min_dist = float('inf')
+            for sel_idx, sel_lat, sel_lng in selected:
+                dist = legacy_haversine(lat, lng, sel_lat, sel_lng)
+                min_dist = min(min_dist, dist)
+            if min_dist > max_min_dist:
+                max_min_dist = min_dist
+                best_idx = i
+        selected.append(remaining.pop(best_idx))
+
+    return [b[0] for b in selected]
+
+
+def max_coord_error(hourly_data: list, snapshot: BalloonSnapshot) -> float:
+    """Largest lat/lng difference between the raw feed and the positions the API serves."""
+    raw = [parse_position(pos) for pos in hourly_data[0]]
+    served = snapshot.current_positions()
+    expected = [p for p in raw if p]
+    assert len(served) == len(expected)
+    return max(
+        max(abs(pos.lat - p[0]), abs(pos.lng - p[1]))
+        for pos, p in zip(served, expected)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument(
+        "--legacy-max", type=int, default=100_000,
+        help="Skip the (slow) scalar reference above this many balloons",
+    )
+    args = parser.parse_args()
+
+    service = BalloonService()
+    print(f"coordinate tolerance {COORD_TOLERANCE:.2e} degrees\n")
+    print(
+        f"{'balloons':>10} {'legacy (s)':>12} {'numpy (s)':>12} {'speedup':>10} "
+        f"{'identical':>10} {'max err':>9} {'in tol':>7}"
+    )
+
+    for n in args.sizes:
+        hourly_data = [synthetic_hour(n, seed=n)]
+        snapshot = BalloonSnapshot.from_hourly_data(hourly_data)
+
+        start = time.perf_counter()
+        new = service._select_distributed_balloons(snapshot, args.count)
+        new_s = time.perf_counter() - start
+        error = max_coord_error(hourly_data, snapshot)
+        coords = f"{error:>9.2e} {str(error <= COORD_TOLERANCE):>7}"
+
+        if n <= args.legacy_max:
+            start = time.perf_counter()
+            old = legacy_select(hourly_data, args.count)
+            old_s = time.perf_counter() - start
+            print(f"{n:>10} {old_s:>12.3f} {new_s:>12.3f} {old_s / new_s:>9.1f}x {str(old == new):>10} {coords}")
+        else:
+            print(f"{n:>10} {'skipped':>12} {new_s:>12.3f} {'-':>10} {'-':>10} {coords}")
+
+
+if __name__ == "__main__":
+    main()
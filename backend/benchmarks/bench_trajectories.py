@@ -0,0 +1,57 @@
+"""
+Benchmark ensemble trajectory forecasts over a synthetic constellation.
+
+Times PredictionService.forecast_ensemble (every balloon x member parcel
+integrated together through the simulated wind volume) for several constellation
+sizes, ensemble sizes and integration schemes.
+
+Run from the backend directory:
+    python -m benchmarks.bench_trajectories
+    python -m benchmarks.bench_trajectories --balloons 1000 --members 1 10 100 --hours 6 12 24 48
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.balloon_snapshot import BalloonSnapshot
+from app.services.prediction_service import PredictionService
+from app.services.weather_service import WeatherService
+from benchmarks.synthetic import synthetic_hour
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--balloons", type=int, nargs="+", default=[100, 1_000])
+    parser.add_argument("--members", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--hours", type=float, nargs="+", default=[6, 12, 24])
+    parser.add_argument("--step-minutes", type=float, default=30)
+    parser.add_argument("--methods", nargs="+", default=["rk2", "rk4"])
+    args = parser.parse_args()
+
+    service = PredictionService()
+    service.weather_service = WeatherService(observed_wind=False)
+    await service.weather_service.get_wind_volume()
+
+    print(f"horizons {args.hours} h, {args.step_minutes:g} min steps\n")
+    print(f"{'balloons':>9} {'members':>8} {'parcels':>9} {'method':>7} {'time (ms)':>10} {'parcel-steps/s':>15}")
+    for n in args.balloons:
+        snapshot = BalloonSnapshot.from_hourly_data([synthetic_hour(n, seed=h) for h in range(2)])
+        balloons = [snapshot.balloon(i, "#FF6B6B") for i in range(n)]
+        steps = max(args.hours) * 60 / args.step_minutes
+
+        for members in args.members:
+            for method in args.methods:
+                start = time.perf_counter()
+                await service.forecast_ensemble(
+                    balloons, args.hours, members=members, step_minutes=args.step_minutes, method=method
+                )
+                elapsed = time.perf_counter() - start
+                parcels = n * members
+                print(
+                    f"{n:>9} {members:>8} {parcels:>9,} {method:>7} {elapsed * 1000:>10.0f} "
+                    f"{parcels * steps / elapsed:>15,.0f}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
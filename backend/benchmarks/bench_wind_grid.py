@@ -0,0 +1,53 @@
+"""
+Benchmark simulated wind grid generation at increasing resolutions.
+
+Reports the cold build time of the wind field and the WindGrid served by
+/api/weather/wind/grid, the cached lookup time, and checks that rebuilding
+within the same time window gives an identical grid.
+
+Run from the backend directory:
+    python -m benchmarks.bench_wind_grid
+    python -m benchmarks.bench_wind_grid --resolutions 5 2 1
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.weather_service import WeatherService
+from app.utils.cache import clear_cache
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resolutions", type=float, nargs="+", default=[0, 5, 2, 1])
+    args = parser.parse_args()
+
+    print(f"{'resolution':>10} {'points':>8} {'field (ms)':>11} {'grid (ms)':>10} {'cached (us)':>12} {'stable':>7}")
+    for resolution in args.resolutions:
+        # 0 means the default 15° x 20° layout
+        service = WeatherService(wind_resolution=resolution or None, observed_wind=False)
+        label = f"{resolution:g}°" if resolution else "default"
+
+        clear_cache("wind")
+        start = time.perf_counter()
+        await service.get_wind_field()
+        field_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        grid = await service.get_wind_grid()
+        grid_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await service.get_wind_grid()
+        cached_s = time.perf_counter() - start
+
+        clear_cache("wind")
+        stable = (await service.get_wind_grid()) == grid
+        print(
+            f"{label:>10} {len(grid.winds):>8} {field_s * 1000:>11.1f} {grid_s * 1000:>10.1f} "
+            f"{cached_s * 1e6:>12.1f} {str(stable):>7}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
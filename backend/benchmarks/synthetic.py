@@ -0,0 +1,153 @@
+"""Synthetic upstream payloads shared by the benchmarks."""
+import math
+import random
+
+import numpy as np
+
+FIRMS_HEADER = (
+    "latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,"
+    "instrument,confidence,version,bright_ti5,frp,daynight"
+)
+
+MODIS_HEADER = (
+    "latitude,longitude,brightness,scan,track,acq_date,acq_time,satellite,"
+    "instrument,confidence,version,bright_t31,frp,daynight"
+)
+
+# Minutes after the first overpass at which each product sees the same fires
+FIRMS_SOURCE_OFFSETS = {
+    "VIIRS_SNPP_NRT": 50,
+    "VIIRS_NOAA20_NRT": 0,
+    "VIIRS_NOAA21_NRT": 25,
+    "MODIS_NRT": 110,
+}
+
+
+def synthetic_hour(n: int, seed: int = 0) -> list[list[float]]:
+    """
+    Uniformly scattered balloons on the sphere, Windborne [lat, lng, alt] format.
+
+    Coordinates are full float64 like the real feed, so comparisons against the
+    float32 BalloonSnapshot see its rounding.
+    """
+    rng = random.Random(seed)
+    hour = []
+    for _ in range(n):
+        # Sample uniformly on the sphere so the poles are not over-represented
+        lat = math.degrees(math.asin(rng.uniform(-1, 1)))
+        lng = rng.uniform(-180, 180)
+        hour.append([lat, lng, rng.uniform(5, 20)])
+    return hour
+
+
+def synthetic_firms_csv(n: int, seed: int = 0) -> str:
+    """A VIIRS-format FIRMS CSV with `n` detections clustered around fire hotspots."""
+    rng = random.Random(seed)
+    hotspots = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(200)]
+    confidences = ["h", "n", "l"]
+    lines = [FIRMS_HEADER]
+    for _ in range(n):
+        lat, lng = rng.choice(hotspots)
+        lat = max(-90, min(90, lat + rng.gauss(0, 0.5)))
+        lng = ((lng + rng.gauss(0, 0.5) + 180) % 360) - 180
+        lines.append(
+            f"{lat:.5f},{lng:.5f},{rng.uniform(295, 367):.2f},0.39,0.36,2026-10-17,"
+            f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d},N,VIIRS,{rng.choice(confidences)},"
+            f"2.0NRT,{rng.uniform(270, 300):.2f},{rng.expovariate(1 / 8):.2f},D"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_firms_sources(n: int, seed: int = 0, seen: float = 0.7) -> dict[str, str]:
+    """
+    FIRMS CSVs for each product in FIRMS_SOURCE_OFFSETS observing one set of
+    `n` fires: each product sees a fraction `seen` of them, ~100 m off and at
+    its own overpass time, so the products overlap like real multi-sensor data.
+    """
+    rng = random.Random(seed)
+    hotspots = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(200)]
+    fires = []
+    for _ in range(n):
+        lat, lng = rng.choice(hotspots)
+        fires.append((
+            max(-90, min(90, lat + rng.gauss(0, 0.5))),
+            ((lng + rng.gauss(0, 0.5) + 180) % 360) - 180,
+            rng.randint(0, 22 * 60),
+            rng.expovariate(1 / 12),
+        ))
+
+    sources = {}
+    for source, offset in FIRMS_SOURCE_OFFSETS.items():
+        modis = source.startswith("MODIS")
+        lines = [MODIS_HEADER if modis else FIRMS_HEADER]
+        for lat, lng, minute, frp in fires:
+            if rng.random() > seen:
+                continue
+            minute = min(minute + offset, 23 * 60 + 59)
+            confidence = str(rng.randint(30, 100)) if modis else rng.choice(["h", "n", "l"])
+            lines.append(
+                f"{lat + rng.gauss(0, 0.001):.5f},{lng + rng.gauss(0, 0.001):.5f},{rng.uniform(295, 367):.2f},"
+                f"0.39,0.36,2026-10-17,{minute // 60:02d}{minute % 60:02d},N,{'MODIS' if modis else 'VIIRS'},"
+                f"{confidence},2.0NRT,{rng.uniform(270, 300):.2f},{frp * rng.uniform(0.8, 1.2):.2f},D"
+            )
+        sources[source] = "\n".join(lines) + "\n"
+    return sources
+
+
+def synthetic_alerts(n: int, seed: int = 0) -> dict:
+    """A NOAA alerts GeoJSON feature collection with `n` polygon alerts."""
+    rng = random.Random(seed)
+    features = []
+    for i in range(n):
+        lat, lng = rng.uniform(25, 48), rng.uniform(-124, -67)
+        polygon = [
+            [lng - 0.5, lat - 0.5], [lng + 0.5, lat - 0.5],
+            [lng + 0.5, lat + 0.5], [lng - 0.5, lat + 0.5], [lng - 0.5, lat - 0.5],
+        ]
+        features.append({
+            "geometry": {"type": "Polygon", "coordinates": [polygon]},
+            "properties": {
+                "id": f"alert-{i}",
+                "event": rng.choice(["Severe Thunderstorm Warning", "Tornado Warning", "Flood Warning"]),
+                "severity": "Severe",
+                "headline": f"Synthetic alert {i}",
+                "effective": "2026-10-17T00:00:00Z",
+                "expires": "2026-10-17T06:00:00Z",
+            },
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def synthetic_fixture(n: int, volume, seed: int = 0, dropout: float = 0.05):
+    """
+    A backtest fixture: `n` balloons drifting for 24 hours through `volume`.
+
+    Each balloon keeps its own wind error (speed scale and u/v bias), so the
+    "true" tracks differ from what the volume alone predicts. A fraction
+    `dropout` of the hourly reports is missing. Returns (snapshot, volume).
+    """
+    from app.services.balloon_snapshot import HOURS, BalloonSnapshot
+    from app.services.trajectory import advect, ensemble_perturbations
+    from app.services.wind_field import altitude_to_pressure
+
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lng = rng.uniform(-180, 180, n)
+    alt = rng.uniform(5, 20, n)
+    truth = ensemble_perturbations(2, n, rng, speed_spread=0.2, wind_noise_ms=3.0, pressure_spread=0.0)
+
+    # Oldest report first: hour 23 is the start, hour 0 is 23 hours later
+    lats, lngs = advect(
+        volume, lat, lng, altitude_to_pressure(alt), list(range(1, HOURS)),
+        wind_scale=truth["wind_scale"][1], wind_bias_u=truth["wind_bias_u"][1], wind_bias_v=truth["wind_bias_v"][1],
+    )
+    lats = np.concatenate([lats[::-1], lat[np.newaxis]]).astype(np.float32)
+    lngs = np.concatenate([lngs[::-1], lng[np.newaxis]]).astype(np.float32)
+    alts = np.tile(alt, (HOURS, 1)).astype(np.float32)
+    valid = rng.random((HOURS, n)) >= dropout
+
+    lats[~valid] = lngs[~valid] = alts[~valid] = np.nan
+    return BalloonSnapshot(
+        lat=lats, lng=lngs, alt=alts, valid=valid,
+        total_count=n, version=0, fetched_at=float(volume.timestamp),
+    ), volume
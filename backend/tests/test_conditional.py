@@ -0,0 +1,147 @@
+"""
+ConditionalFetcher against a stand-in upstream (httpx.MockTransport).
+
+Run from the backend directory:
+    python -m pytest tests
+"""
+import asyncio
+import json
+
+import httpx
+
+from app.utils.conditional import ConditionalFetcher
+
+URL = "https://upstream.test/feed.json"
+ETAG = '"v1"'
+LAST_MODIFIED = "Sat, 17 Oct 2026 00:00:00 GMT"
+
+
+class Upstream:
+    """Serves a JSON body with validators; answers 304 when the client's validators still match."""
+
+    def __init__(self, body: dict, etag: str = ETAG, last_modified: str = LAST_MODIFIED):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {}
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        if not self.etag and self.last_modified and request.headers.get("If-Modified-Since") == self.last_modified:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, content=json.dumps(self.body).encode())
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, response: httpx.Response) -> dict:
+        self.calls += 1
+        return response.json()
+
+
+def fetch_twice(upstream: Upstream, between=None, **kwargs) -> tuple[list, CountingParser, ConditionalFetcher]:
+    """Fetch URL twice through one ConditionalFetcher, calling `between()` in between."""
+    parse = CountingParser()
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as client:
+            fetcher = ConditionalFetcher(client)
+            first = await fetcher.get(URL, parse, **kwargs)
+            if between:
+                between()
+            second = await fetcher.get(URL, parse, **kwargs)
+            return [first, second], fetcher
+
+    results, fetcher = asyncio.run(run())
+    return results, parse, fetcher
+
+
+def test_first_request_is_unconditional_and_stores_validators():
+    upstream = Upstream({"fires": 1})
+    (first, _), parse, fetcher = fetch_twice(upstream)
+
+    assert first == ({"fires": 1}, True)
+    assert "If-None-Match" not in upstream.requests[0].headers
+    assert "If-Modified-Since" not in upstream.requests[0].headers
+
+    entry = fetcher._entries[URL]
+    assert (entry.etag, entry.last_modified, entry.payload) == (ETAG, LAST_MODIFIED, {"fires": 1})
+
+
+def test_revalidation_sends_stored_validators():
+    upstream = Upstream({"fires": 1})
+    fetch_twice(upstream)
+
+    revalidation = upstream.requests[1].headers
+    assert revalidation["If-None-Match"] == ETAG
+    assert revalidation["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_not_modified_reuses_cached_parse():
+    upstream = Upstream({"fires": 1})
+    (first, second), parse, fetcher = fetch_twice(upstream)
+
+    assert second == ({"fires": 1}, False)
+    assert second[0] is first[0]
+    assert parse.calls == 1
+    assert fetcher.stats == {"requests": 2, "not_modified": 1, "bytes_received": len(b'{"fires": 1}')}
+
+
+def test_not_modified_by_last_modified_only():
+    upstream = Upstream({"fires": 1}, etag=None)
+    (_, second), parse, _ = fetch_twice(upstream)
+
+    assert "If-None-Match" not in upstream.requests[1].headers
+    assert second == ({"fires": 1}, False)
+    assert parse.calls == 1
+
+
+def test_changed_upstream_is_reparsed():
+    upstream = Upstream({"fires": 1})
+
+    def change():
+        upstream.body = {"fires": 2}
+        upstream.etag = '"v2"'
+
+    (_, second), parse, fetcher = fetch_twice(upstream, between=change)
+
+    assert second == ({"fires": 2}, True)
+    assert parse.calls == 2
+    assert fetcher._entries[URL].etag == '"v2"'
+    assert fetcher._entries[URL].payload == {"fires": 2}
+
+
+def test_streamed_response_reuses_cached_parse():
+    upstream = Upstream({"fires": 1})
+
+    async def parse_stream(response: httpx.Response) -> dict:
+        return json.loads(b"".join([chunk async for chunk in response.aiter_bytes()]))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as client:
+            fetcher = ConditionalFetcher(client)
+            return [await fetcher.get(URL, parse_stream, stream=True) for _ in range(2)]
+
+    first, second = asyncio.run(run())
+    assert first == ({"fires": 1}, True)
+    assert second == ({"fires": 1}, False)
+
+
+def test_response_without_validators_is_not_cached():
+    upstream = Upstream({"fires": 1}, etag=None, last_modified=None)
+    (_, second), parse, fetcher = fetch_twice(upstream)
+
+    assert "If-None-Match" not in upstream.requests[1].headers
+    assert second == ({"fires": 1}, True)
+    assert parse.calls == 2
+    assert URL not in fetcher._entries
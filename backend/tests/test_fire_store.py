@@ -0,0 +1,64 @@
+"""
+RollingFireStore against deduplicating the whole window from scratch.
+
+Run from the backend directory:
+    python -m pytest tests
+"""
+import numpy as np
+
+from app.services.fire_store import RollingFireStore
+from app.services.firms_parser import ROW_DTYPE, acquisition_minutes, deduplicate
+
+
+def detections(times: list[str], lat: float = 35.001, lng: float = -120.001) -> np.ndarray:
+    rows = np.zeros(len(times), dtype=ROW_DTYPE)
+    rows["lat"], rows["lng"], rows["frp"] = lat, lng, 20.0
+    rows["acq_date"], rows["acq_time"] = "2026-10-17", times
+    return rows
+
+
+def test_repeat_detection_returns_when_the_first_expires():
+    rows = detections(["0000", "0030"])
+    minutes = acquisition_minutes(rows)
+    store = RollingFireStore(window_hours=24)
+
+    assert store.update(rows, now=minutes[1]) == (1, 0)
+    assert [f.acq_time for f in store.fire_data().fires] == ["0000"]
+
+    # The first detection leaves the window; the repeat it hid takes its place
+    assert store.update(rows, now=minutes[0] + 24 * 60) == (1, 1)
+    assert [f.acq_time for f in store.fire_data().fires] == ["0030"]
+    assert len(store.index) == 1
+
+    assert store.update(now=minutes[1] + 24 * 60) == (0, 1)
+    assert len(store) == 0 and store.aggregate(1.0).cells == []
+
+
+def test_replay_matches_full_deduplication():
+    rng = np.random.default_rng(1)
+    n = 3000
+    rows = np.zeros(n, dtype=ROW_DTYPE)
+    # A few hundred dedupe cells, so repeats are common
+    rows["lat"] = 35 + rng.integers(0, 20, n) * 0.01 + 0.005
+    rows["lng"] = -120 + rng.integers(0, 20, n) * 0.01 + 0.005
+    rows["frp"] = rng.uniform(10, 50, n)
+    rows["acq_date"] = np.where(rng.random(n) < 0.5, "2026-10-17", "2026-10-18")
+    rows["acq_time"] = [f"{h:02d}{m:02d}" for h, m in zip(rng.integers(0, 24, n), rng.integers(0, 60, n))]
+    minutes = acquisition_minutes(rows)
+    order = np.argsort(minutes, kind="stable")
+    rows, minutes = rows[order], minutes[order]
+
+    store = RollingFireStore(window_hours=6)
+    for now in np.arange(minutes[0], minutes[-1] + 12 * 60, 45):
+        window = rows[(minutes > now - 6 * 60) & (minutes <= now)]
+        # Some detections only arrive in a later download of the same window
+        store.update(window[rng.random(len(window)) < 0.8], now - 20)
+        store.update(window, now)
+        expected, _ = deduplicate([window])
+        fires = store.fire_data().fires
+        assert len(store) == len(expected) == len(fires)
+        assert sorted((f.acq_date, f.acq_time, f.lat, f.lng) for f in fires) == sorted(
+            zip(expected["acq_date"].tolist(), expected["acq_time"].tolist(), expected["lat"].tolist(), expected["lng"].tolist())
+        )
+        assert len(store.index) == len(expected)
+        assert sum(c.count for c in store.aggregate(1.0).cells) == len(expected)
@@ -0,0 +1,104 @@
+"""
+FirmsCsvParser chunk handling and multi-source deduplication.
+
+Run from the backend directory:
+    python -m pytest tests
+"""
+import asyncio
+
+import numpy as np
+
+from app.services.firms_parser import PARSE_BLOCK_BYTES, ROW_DTYPE, FirmsCsvParser, deduplicate
+from benchmarks.synthetic import synthetic_firms_csv
+
+# Two full parse blocks plus a partial one
+CSV = synthetic_firms_csv(30_000, seed=3).encode()
+
+
+def parse(chunks: list[bytes]) -> np.ndarray:
+    parser = FirmsCsvParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return asyncio.run(parser.rows())
+
+
+def split_every(body: bytes, size: int) -> list[bytes]:
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def test_csv_spans_several_parse_blocks():
+    assert len(CSV) > 2 * PARSE_BLOCK_BYTES
+
+
+def test_chunk_boundaries_do_not_change_rows():
+    whole = parse([CSV])
+    assert len(whole) > 0
+    # Odd sizes split lines (and the header) at every offset, across block boundaries
+    for size in (7, 4093, PARSE_BLOCK_BYTES - 1, PARSE_BLOCK_BYTES + 1):
+        rows = parse(split_every(CSV, size))
+        assert len(rows) == len(whole)
+        assert (rows == whole).all()
+
+
+def test_split_at_line_ends_and_single_bytes():
+    lines = CSV[:20_000].splitlines(keepends=True)
+    small = b"".join(lines[:-1])
+    expected = parse([small])
+    assert (parse(lines[:-1]) == expected).all()
+    assert (parse(split_every(small, 1)) == expected).all()
+
+
+def test_last_line_without_newline_is_parsed():
+    body = CSV[:20_000]
+    body = body[:body.rfind(b"\n")]
+    rows = parse([body])
+    assert (rows == parse([body + b"\n"])).all()
+
+
+def test_header_without_body():
+    parser = FirmsCsvParser()
+    parser.feed(CSV[:CSV.find(b"\n")])
+    rows = asyncio.run(parser.rows())
+    assert len(rows) == 0
+    assert parser.columns is not None
+
+
+def detections(*rows: tuple[float, float, str, float]) -> np.ndarray:
+    """Rows of (lat, lng, acq_time, frp) on one day."""
+    out = np.zeros(len(rows), dtype=ROW_DTYPE)
+    for i, (lat, lng, acq_time, frp) in enumerate(rows):
+        out[i]["lat"], out[i]["lng"], out[i]["frp"] = lat, lng, frp
+        out[i]["acq_date"], out[i]["acq_time"] = "2026-10-17", acq_time
+    return out
+
+
+def test_deduplicate_prefers_earlier_sources():
+    viirs = detections((35.001, -120.001, "1030", 20.0))
+    # MODIS saw the same fire first, a few hundred metres off
+    modis = detections((35.003, -120.004, "1005", 40.0))
+    rows, dropped = deduplicate([viirs, modis])
+    assert dropped == 1
+    assert (rows == viirs).all()
+
+    rows, dropped = deduplicate([modis, viirs])
+    assert (rows == modis).all()
+
+
+def test_deduplicate_keeps_earliest_within_a_source():
+    rows, dropped = deduplicate([detections((35.001, -120.001, "1030", 20.0), (35.002, -120.002, "1000", 15.0))])
+    assert dropped == 1
+    assert rows["acq_time"].tolist() == ["1000"]
+
+
+def test_deduplicate_keeps_separate_cells_and_times():
+    far_apart = detections((35.001, -120.001, "1000", 20.0), (35.051, -120.001, "1000", 20.0))
+    assert deduplicate([far_apart])[1] == 0
+
+    hours_apart = detections((35.001, -120.001, "0100", 20.0), (35.001, -120.001, "0400", 20.0))
+    assert deduplicate([hours_apart])[1] == 0
+
+
+def test_deduplicate_never_merges_unknown_times():
+    rows = detections((35.001, -120.001, "1000", 20.0), (35.001, -120.001, "1000", 20.0))
+    rows["acq_date"] = ""
+    assert deduplicate([rows])[1] == 0
@@ -0,0 +1,119 @@
+"""
+GridIndex radius queries (antimeridian, poles, in-place updates) and
+FarthestPointSampler against the original scalar selection.
+
+Run from the backend directory:
+    python -m pytest tests
+"""
+import numpy as np
+
+from app.services.balloon_snapshot import BalloonSnapshot
+from app.utils.geo import FarthestPointSampler, GridIndex, haversine_km
+from benchmarks.bench_selection import legacy_select
+from benchmarks.synthetic import synthetic_hour
+
+RNG = np.random.default_rng(7)
+
+# Queries straddling the antimeridian, reaching over the poles, and ordinary ones
+QUERIES = [
+    (0.0, 179.9, 300.0),
+    (-45.0, -179.95, 800.0),
+    (60.0, 180.0, 1500.0),
+    (89.5, 10.0, 200.0),
+    (-88.0, -120.0, 500.0),
+    (80.0, 170.0, 2500.0),
+    (35.0, -120.0, 50.0),
+    (10.0, 20.0, 20_000.0),
+]
+
+
+def clustered_points(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Points crowded around the antimeridian and the poles, plus a uniform background."""
+    lat = np.concatenate([
+        RNG.uniform(-90, 90, n),
+        RNG.uniform(-60, 60, n),
+        RNG.uniform(85, 90, n),
+        RNG.uniform(-90, -85, n),
+    ])
+    lng = np.concatenate([
+        RNG.uniform(-180, 180, n),
+        (RNG.uniform(170, 190, n) + 180) % 360 - 180,
+        RNG.uniform(-180, 180, n),
+        RNG.uniform(-180, 180, n),
+    ])
+    return lat, lng
+
+
+def brute_force(lat: np.ndarray, lng: np.ndarray, ids: np.ndarray, query: tuple[float, float, float]) -> set[int]:
+    q_lat, q_lng, radius = query
+    return set(ids[haversine_km(q_lat, q_lng, lat[ids], lng[ids]) <= radius].tolist())
+
+
+def test_within_matches_brute_force_across_antimeridian_and_poles():
+    lat, lng = clustered_points(2_000)
+    for cell_degrees in (1.0, 5.0, 7.0):
+        index = GridIndex(lat, lng, cell_degrees)
+        for query in QUERIES:
+            assert set(index.within(*query).tolist()) == brute_force(lat, lng, np.arange(len(lat)), query)
+
+
+def test_nearest_and_any_within():
+    lat, lng = clustered_points(500)
+    index = GridIndex(lat, lng)
+    for q_lat, q_lng, radius in QUERIES:
+        distances = haversine_km(q_lat, q_lng, lat, lng)
+        closest, distance = index.nearest(q_lat, q_lng, radius)
+        if distances.min() <= radius:
+            assert distance == distances.min()
+            assert distances[closest] == distance
+        else:
+            assert (closest, distance) == (-1, float("inf"))
+        assert index.any_within(q_lat, q_lng, radius) == (distances.min() <= radius)
+
+
+def test_add_remove_and_insert():
+    lat, lng = clustered_points(500)
+    index = GridIndex(lat[:1000], lng[:1000])
+    ids = index.add(lat[1000:], lng[1000:])
+    assert ids.tolist() == list(range(1000, len(lat)))
+    assert len(index) == len(lat)
+
+    removed = RNG.choice(len(lat), 600, replace=False)
+    index.remove(removed)
+    live = np.setdiff1d(np.arange(len(lat)), removed)
+    assert len(index) == len(live)
+    for query in QUERIES:
+        assert set(index.within(*query).tolist()) == brute_force(lat, lng, live, query)
+
+    index.insert(removed[:300])
+    live = np.union1d(live, removed[:300])
+    for query in QUERIES:
+        assert set(index.within(*query).tolist()) == brute_force(lat, lng, live, query)
+
+
+def test_empty_and_negative_radius():
+    assert len(GridIndex(np.empty(0), np.empty(0)).within(0.0, 0.0, 100.0)) == 0
+
+    index = GridIndex([0.0, 10.0], [0.0, 10.0])
+    assert len(index.within(0.0, 0.0, -1.0)) == 0
+    assert index.nearest(0.0, 0.0, -1.0) == (-1, float("inf"))
+    assert not index.any_within(0.0, 0.0, -1.0)
+    assert index.within(0.0, 0.0, 0.0).tolist() == [0]
+
+
+def test_farthest_point_sampler_matches_scalar_selection():
+    hour = synthetic_hour(400, seed=5)
+    # Sample the float32 positions the snapshot serves, so both see the same coordinates
+    snapshot = BalloonSnapshot.from_hourly_data([hour])
+    positions = [[float(snapshot.lat[0, i]), float(snapshot.lng[0, i]), alt] for i, (_, _, alt) in enumerate(hour)]
+    sampler = FarthestPointSampler(snapshot.lat[0], snapshot.lng[0])
+    assert sampler.extend_to(50) == legacy_select([positions], 50)
+
+
+def test_farthest_point_sampler_is_prefix_stable():
+    lat, lng = clustered_points(100)
+    sampler = FarthestPointSampler(lat, lng)
+    first = sampler.extend_to(20)
+    assert sampler.extend_to(60)[:20] == first
+    assert FarthestPointSampler(lat, lng).extend_to(60) == sampler.extend_to(60)
+    assert sampler.extend_to(10_000) == sampler.order and len(sampler) == len(lat)
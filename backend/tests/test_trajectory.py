@@ -0,0 +1,109 @@
+"""
+advect (RK2/RK4) against trajectories with a closed-form solution.
+
+Run from the backend directory:
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+from app.services.trajectory import KM_PER_DEGREE, KMH_PER_MS, advect, integration_cost
+from app.services.wind_field import WindVolume
+
+LATS = np.arange(-90.0, 91.0, 1.0)
+LNGS = np.arange(-180.0, 180.0, 1.0)
+
+
+def volume(u, v) -> WindVolume:
+    """A single-level volume; `u`/`v` are constants or functions of the grid latitude."""
+    lat = LATS[:, np.newaxis] * np.ones(len(LNGS))
+    u = u(lat) if callable(u) else np.full(lat.shape, float(u))
+    v = v(lat) if callable(v) else np.full(lat.shape, float(v))
+    return WindVolume(
+        levels=np.array([250.0]), lats=LATS, lngs=LNGS, u=u[np.newaxis], v=v[np.newaxis], timestamp=0
+    )
+
+
+class CountingVolume:
+    """Wraps a volume and counts how many parcel positions advect samples."""
+
+    def __init__(self, volume: WindVolume):
+        self.volume = volume
+        self.samples = 0
+
+    def level_sampler(self, pressure):
+        sample = self.volume.level_sampler(pressure)
+
+        def counted(lat, lng):
+            self.samples += np.size(lat)
+            return sample(lat, lng)
+
+        return counted
+
+
+@pytest.mark.parametrize("method", ["rk2", "rk4"])
+def test_uniform_wind(method):
+    east = volume(u=10.0, v=0.0)
+    lat, lng = advect(east, [0.0], [170.0], [250.0], [1.0], method=method)
+    assert lat[0, 0] == pytest.approx(0.0)
+    assert lng[0, 0] == pytest.approx(170.0 + 10 * KMH_PER_MS / KM_PER_DEGREE)
+
+    # Wraps across the antimeridian
+    lat, lng = advect(east, [0.0], [179.9], [250.0], [1.0], method=method)
+    assert lng[0, 0] == pytest.approx(179.9 + 10 * KMH_PER_MS / KM_PER_DEGREE - 360)
+
+    south = volume(u=0.0, v=-10.0)
+    lat, lng = advect(south, [45.0], [-30.0], [250.0], [2.0], method=method)
+    assert lat[0, 0] == pytest.approx(45.0 - 2 * 10 * KMH_PER_MS / KM_PER_DEGREE)
+    assert lng[0, 0] == pytest.approx(-30.0)
+
+
+@pytest.mark.parametrize("method", ["rk2", "rk4"])
+def test_crossing_the_pole_folds_back(method):
+    # One step, so the parcel is not carried back over the pole by the same northward wind
+    lat, lng = advect(volume(u=0.0, v=10.0), [89.9], [20.0], [250.0], [1.0], step_minutes=60, method=method)
+    assert lat[0, 0] == pytest.approx(180 - (89.9 + 10 * KMH_PER_MS / KM_PER_DEGREE))
+    assert lng[0, 0] == pytest.approx(-160.0)
+
+
+def test_rk4_is_more_accurate_than_rk2():
+    # v proportional to latitude: lat(t) = lat0 * exp(rate * t)
+    rate = 0.2
+    field = volume(u=0.0, v=lambda lat: lat * rate * KM_PER_DEGREE / KMH_PER_MS)
+    exact = 10.0 * np.exp(rate * 6)
+
+    def error(method: str, step_minutes: float) -> float:
+        lat, _ = advect(field, [10.0], [0.0], [250.0], [6.0], step_minutes=step_minutes, method=method)
+        return abs(lat[0, 0] - exact)
+
+    assert error("rk4", 30) < 1e-3
+    assert error("rk4", 30) * 100 < error("rk2", 30)
+    # Halving the step cuts the error ~4x for RK2 and ~16x for RK4
+    assert error("rk2", 15) < error("rk2", 30) / 3
+    assert error("rk4", 15) < error("rk4", 30) / 10
+
+
+def test_horizons_keep_request_order_and_parcel_shape():
+    field = volume(u=5.0, v=2.0)
+    lat = np.array([[0.0, 10.0, 20.0], [30.0, 40.0, 50.0]])
+    lng = np.zeros((2, 3))
+    out_lat, out_lng = advect(field, lat, lng, 300.0, [6.0, 0.0, 3.0], method="rk4")
+    assert out_lat.shape == out_lng.shape == (3, 2, 3)
+    assert np.array_equal(out_lat[1], lat)
+    assert np.all(out_lat[0] > out_lat[2]) and np.all(out_lat[2] > out_lat[1])
+
+    sorted_lat, _ = advect(field, lat, lng, 300.0, [0.0, 3.0, 6.0], method="rk4")
+    assert np.allclose(out_lat[[1, 2, 0]], sorted_lat)
+
+
+@pytest.mark.parametrize("method", ["rk2", "rk4"])
+def test_integration_cost_counts_wind_samples(method):
+    counting = CountingVolume(volume(u=5.0, v=2.0))
+    hours = [1.0, 6.0, 2.5]
+    advect(counting, np.zeros((4, 5)), np.zeros((4, 5)), 250.0, hours, step_minutes=20, method=method)
+    assert counting.samples == integration_cost(20, hours, step_minutes=20, method=method)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        advect(volume(u=0.0, v=0.0), [0.0], [0.0], [250.0], [1.0], method="euler")